@@ -3,6 +3,9 @@
 
 import adsk.core, adsk.fusion, adsk.cam, traceback
 from .airfoil_points import AirfoilPoints
+from .panel import read_panel_csv, place_section
+from .fusion_connection import FusionComponent
+from .sketch_builder import SketchBuilder
 
 section_data = {
     "buddita_wing_centre": ("naca2411-il", 200, 3), 
@@ -17,6 +20,11 @@ section_data = {
 
 app = adsk.core.Application.get()
 
+def load_section_airfoils(sections=section_data):
+    """Airfoil for every section, with all names fetched in one concurrent batch."""
+    airfoils = AirfoilPoints.from_airfoiltools_many([sec[0] for sec in sections.values()])
+    return {key: airfoils[sec[0]] for key, sec in sections.items()}
+
 def object_collection_from_list(values):
     coll = adsk.core.ObjectCollection.create()
     for value in values:
@@ -67,37 +75,27 @@ def create_new_airfoil_doc(afpoints):
     doc, comp = create_document(afpoints.name)
     sketch = create_new_airfoil_sketch(comp, comp.xYConstructionPlane, afpoints.name)
 
-def create_new_panel_doc(panelcsv, affile):
+def create_new_panel_doc(panelcsv, affile, fit_points=None, fit_tolerance=None):
+    """fit_points or fit_tolerance (in chord fractions) repanel the airfoil
+    once before it is placed, to bound the spline fit points per section."""
     afpoints = AirfoilPoints.from_file(affile)
+    if fit_points or fit_tolerance:
+        afpoints = afpoints.repanel(fit_points, tolerance=fit_tolerance)
 
     doc, comp = create_document('paneltest')
-    secs=[]
-    with open(panelcsv) as f:
-        cols=f.readline().split(',')
-        for line in f.readlines():
-            secs.append(
-                {col.strip(): float(val.strip()) for col,val in zip(cols, line.split(','))}
-            )
-    
-    for id, sec in enumerate(secs):
-        sketch = create_new_airfoil_sketch(
-            comp, 
-            create_xy_plane(comp, 0.1 * sec['zoff']), 
-            afpoints.set_chord(
-                sec['chord']
-            ).set_thickness(
-                sec['thickness']
-            ).set_te_thickness(
-                sec['te_thickness']
-            ).set_twist(
-                sec['twist']
-            ).offset_y(
-                sec['yoff']
-            ).offset_x(
-                sec['xoff']
-            )
-        )
+    secs = read_panel_csv(panelcsv)
+
+    # all sections in one pass, each sketch solved once, as one timeline group
+    builder = SketchBuilder(FusionComponent(comp), 'panel sections')
+    for sec in secs:
+        builder.sketch(
+            "base_section",
+            builder.offset_plane(0.1 * sec['zoff'])
+        ).add_airfoil(place_section(afpoints, sec))
+
+    for id, sketch in enumerate(builder.build()):
         sketch.saveAsDXF('C://Users//td6834//projects//bird//' + 'section_' + str(id) + '.dxf')
+    return builder
 
 
 
@@ -0,0 +1,323 @@
+import atexit
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
+import http.client
+import json
+import os
+import threading
+import time
+import urllib.request
+from urllib.parse import urljoin, urlsplit
+
+AIRFOILTOOLS_URL = "http://airfoiltools.com/airfoil/seligdatfile?airfoil="
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".airfoiltools_cache")
+REDIRECT_STATUSES = (301, 302, 303, 307, 308)
+MAX_REDIRECTS = 5
+
+
+class DownloadError(Exception):
+    pass
+
+class OfflineCacheMiss(DownloadError):
+    pass
+
+
+class CacheStats(object):
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self.evictions = 0
+
+    def __str__(self):
+        return "hits=" + str(self.hits) + " misses=" + str(self.misses) + \
+            " revalidations=" + str(self.revalidations) + " evictions=" + str(self.evictions)
+
+
+class ConnectionPool(object):
+    """Keep-alive HTTP connections, one per host for each thread, so a worker
+    fetching many files pays for a single connection setup. Requests go
+    through the environment http proxy like urllib would."""
+    def __init__(self):
+        self._local = threading.local()
+
+    def _connection(self, scheme, host, timeout):
+        connections = self._local.__dict__.setdefault("connections", {})
+        key = (scheme, host)
+        if key not in connections:
+            if scheme == "https":
+                connections[key] = http.client.HTTPSConnection(host, timeout=timeout)
+            else:
+                connections[key] = http.client.HTTPConnection(host, timeout=timeout)
+        return connections[key]
+
+    def _drop(self, scheme, host):
+        connection = self._local.__dict__.get("connections", {}).pop((scheme, host), None)
+        if connection is not None:
+            connection.close()
+
+    def request(self, url, headers, timeout=30):
+        """GET url, following up to MAX_REDIRECTS redirects as urllib would,
+        returning (status, body, headers). Raises DownloadError for network
+        failures and any final status other than 200 or 304."""
+        for _ in range(MAX_REDIRECTS + 1):
+            status, body, response_headers = self._get(url, headers, timeout)
+            if status in (200, 304):
+                return status, body, response_headers
+            location = response_headers.get("Location")
+            if status not in REDIRECT_STATUSES or not location:
+                raise DownloadError("Error downloading " + url + ": HTTP " + str(status))
+            url = urljoin(url, location)
+            if urlsplit(url).scheme not in ("http", "https"):
+                raise DownloadError("Error downloading: redirected to " + url)
+        raise DownloadError("Error downloading " + url + ": too many redirects")
+
+    def _get(self, url, headers, timeout):
+        parts = urlsplit(url)
+        scheme, host, path = parts.scheme, parts.netloc, parts.path + ("?" + parts.query if parts.query else "")
+        proxy = urllib.request.getproxies().get(scheme)
+        if proxy and scheme == "http" and not urllib.request.proxy_bypass(parts.hostname):
+            host, path = urlsplit(proxy).netloc, url
+        for attempt in range(2):
+            connection = self._connection(scheme, host, timeout)
+            try:
+                connection.request("GET", path, headers=headers)
+                response = connection.getresponse()
+                body = response.read()
+            except (http.client.HTTPException, OSError) as ex:
+                self._drop(scheme, host)
+                # A kept-alive connection may have been closed by the server
+                if attempt == 0 and isinstance(ex, (http.client.RemoteDisconnected, ConnectionError)):
+                    continue
+                raise DownloadError("Error downloading " + url + ": " + str(ex))
+            if response.will_close:
+                self._drop(scheme, host)
+            return response.status, body, response.msg
+
+    def close(self):
+        for connection in self._local.__dict__.get("connections", {}).values():
+            connection.close()
+        self._local.__dict__["connections"] = {}
+
+
+class AirfoilCache(object):
+    """Local cache of downloaded .dat files.
+
+    Files are stored once per content hash under objects/, and index.json maps
+    airfoil names to a hash plus the ETag/Last-Modified validators. The least
+    recently used names are evicted when the stored size exceeds max_bytes.
+    With a ttl (seconds) older entries are revalidated with a conditional
+    request; in offline mode the network is never touched. Hits only update
+    the recency in memory; the index is written when files are stored or
+    evicted, after get_many, and by flush() or close()."""
+    def __init__(self, directory=DEFAULT_CACHE_DIR, max_bytes=50 * 2**20, ttl=None,
+                 offline=False, base_url=AIRFOILTOOLS_URL, timeout=30):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.offline = offline
+        self.base_url = base_url
+        self.timeout = timeout
+        self.stats = CacheStats()
+        self._lock = threading.RLock()
+        self._connections = ConnectionPool()
+        os.makedirs(self._objects_dir, exist_ok=True)
+        self._index = self._load_index()
+        self._dirty = False
+
+    @property
+    def _objects_dir(self):
+        return os.path.join(self.directory, "objects")
+
+    @property
+    def _index_file(self):
+        return os.path.join(self.directory, "index.json")
+
+    def _object_file(self, digest):
+        return os.path.join(self._objects_dir, digest + ".dat")
+
+    def _load_index(self):
+        try:
+            with open(self._index_file) as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            index = {}
+        index.setdefault("sequence", 0)
+        index.setdefault("entries", {})
+        return index
+
+    def _save_index(self):
+        tmp_file = self._index_file + ".tmp"
+        with open(tmp_file, "w") as f:
+            json.dump(self._index, f)
+        os.replace(tmp_file, self._index_file)
+        self._dirty = False
+
+    def flush(self):
+        """Write the index if hits have changed it since it was last written."""
+        with self._lock:
+            if self._dirty:
+                self._save_index()
+
+    def close(self):
+        self.flush()
+        self._connections.close()
+
+    @property
+    def _entries(self):
+        return self._index["entries"]
+
+    def _touch(self, entry):
+        self._index["sequence"] += 1
+        entry["accessed"] = self._index["sequence"]
+        self._dirty = True
+
+    def __contains__(self, name):
+        with self._lock:
+            entry = self._entries.get(name)
+            return entry is not None and os.path.exists(self._object_file(entry["hash"]))
+
+    @property
+    def size(self):
+        """Bytes held in distinct cached files."""
+        with self._lock:
+            return sum({entry["hash"]: entry["size"] for entry in self._entries.values()}.values())
+
+    def url(self, name):
+        return self.base_url + name
+
+    def get(self, name):
+        """Contents of the .dat file for an airfoiltools.com name."""
+        with self._lock:
+            entry = self._entries.get(name)
+            cached = entry is not None and os.path.exists(self._object_file(entry["hash"]))
+            if cached and (self.offline or self.ttl is None or time.time() - entry["fetched"] < self.ttl):
+                self.stats.hits += 1
+                self._touch(entry)
+                return self._read_object(entry["hash"])
+            if self.offline:
+                self.stats.misses += 1
+                raise OfflineCacheMiss("Airfoil " + name + " is not cached and the cache is offline")
+            headers = {}
+            if cached:
+                if entry.get("etag"):
+                    headers["If-None-Match"] = entry["etag"]
+                if entry.get("last_modified"):
+                    headers["If-Modified-Since"] = entry["last_modified"]
+
+        try:
+            status, data, response_headers = self._request(self.url(name), headers)
+        except DownloadError:
+            with self._lock:
+                if not cached:
+                    self.stats.misses += 1
+                    raise
+                # Serve the stale copy when the server cannot be reached
+                self.stats.hits += 1
+                return self._read_object(entry["hash"])
+
+        with self._lock:
+            if cached and status == 304:
+                self.stats.hits += 1
+                self.stats.revalidations += 1
+                entry["fetched"] = time.time()
+                self._touch(entry)
+                self._save_index()
+                return self._read_object(entry["hash"])
+            self.stats.misses += 1
+            self._store(name, data, response_headers)
+            return data
+
+    def _request(self, url, headers):
+        return self._connections.request(url, headers, self.timeout)
+
+    def get_many(self, names, max_workers=8):
+        """Fetch several names concurrently. Repeated names are fetched once.
+        Returns a dict of name to file contents, or to the DownloadError
+        raised for that name."""
+        unique_names = list(dict.fromkeys(names))
+
+        def _get(name):
+            try:
+                return self.get(name)
+            except DownloadError as ex:
+                return ex
+
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(unique_names)))) as pool:
+            results = dict(zip(unique_names, pool.map(_get, unique_names)))
+        self.flush()
+        return results
+
+    def _read_object(self, digest):
+        with open(self._object_file(digest), "rb") as f:
+            return f.read()
+
+    def _store(self, name, data, headers):
+        digest = hashlib.sha256(data).hexdigest()
+        object_file = self._object_file(digest)
+        if not os.path.exists(object_file):
+            tmp_file = object_file + ".tmp"
+            with open(tmp_file, "wb") as f:
+                f.write(data)
+            os.replace(tmp_file, object_file)
+        old_entry = self._entries.get(name)
+        entry = {
+            "hash": digest,
+            "size": len(data),
+            "etag": headers.get("ETag"),
+            "last_modified": headers.get("Last-Modified"),
+            "fetched": time.time(),
+        }
+        self._entries[name] = entry
+        self._touch(entry)
+        if old_entry is not None and old_entry["hash"] != digest:
+            self._remove_unreferenced(old_entry["hash"])
+        self._evict(keep=name)
+        self._save_index()
+
+    def _remove_unreferenced(self, digest):
+        if not any(entry["hash"] == digest for entry in self._entries.values()):
+            try:
+                os.remove(self._object_file(digest))
+            except OSError:
+                pass
+
+    def _evict(self, keep=None):
+        sizes = {}
+        references = {}
+        for entry in self._entries.values():
+            sizes[entry["hash"]] = entry["size"]
+            references[entry["hash"]] = references.get(entry["hash"], 0) + 1
+        total = sum(sizes.values())
+        by_age = sorted(self._entries.items(), key=lambda item: item[1]["accessed"])
+        for name, entry in by_age:
+            if total <= self.max_bytes:
+                break
+            if name == keep:
+                continue
+            del self._entries[name]
+            references[entry["hash"]] -= 1
+            if not references[entry["hash"]]:
+                total -= entry["size"]
+                self._remove_unreferenced(entry["hash"])
+            self.stats.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            for entry in list(self._entries.values()):
+                try:
+                    os.remove(self._object_file(entry["hash"]))
+                except OSError:
+                    pass
+            self._entries.clear()
+            self._save_index()
+
+
+_default_cache = None
+
+def default_cache():
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = AirfoilCache()
+        atexit.register(_default_cache.close)
+    return _default_cache
@@ -0,0 +1,180 @@
+import mmap
+import os
+import stat
+import tempfile
+import zlib
+import numpy as np
+
+# Library layout, little endian:
+#   header   magic, airfoil count, slot count, slot table offset
+#   slots    open addressing hash table on crc32(name), linear probing
+#   data     per airfoil: x float64[n], y float64[n], surfaces int8[n] padded to 8 bytes
+#   names    utf-8 names referenced from the slots
+# A slot with data_offset 0 is empty; data never starts at offset 0.
+LIBRARY_MAGIC = b"AIRFLIB1"
+
+_HEADER = np.dtype([
+    ("magic", "S8"),
+    ("count", "<u8"),
+    ("slots", "<u8"),
+    ("table_offset", "<u8"),
+])
+
+_SLOT = np.dtype([
+    ("hash", "<u4"),
+    ("name_length", "<u4"),
+    ("name_offset", "<u8"),
+    ("data_offset", "<u8"),
+    ("points", "<u8"),
+])
+
+
+def _name_hash(name_bytes):
+    return zlib.crc32(name_bytes) & 0xffffffff
+
+
+def _padded(size):
+    return (size + 7) & ~7
+
+
+def _file_mode(path):
+    """Permission bits of the file at path, or of a new file if there is none."""
+    try:
+        return stat.S_IMODE(os.stat(path).st_mode)
+    except OSError:
+        umask = os.umask(0)
+        os.umask(umask)
+        return 0o666 & ~umask
+
+
+def write_library(path, airfoils):
+    """Pack airfoils (anything with name, x, y and surfaces) into a library file."""
+    entries = []
+    names = set()
+    for airfoil in airfoils:
+        if airfoil.name in names:
+            raise ValueError("Duplicate airfoil name in library: " + airfoil.name)
+        names.add(airfoil.name)
+        entries.append((
+            airfoil.name.encode("utf-8"),
+            np.ascontiguousarray(airfoil.x, dtype="<f8"),
+            np.ascontiguousarray(airfoil.y, dtype="<f8"),
+            np.ascontiguousarray(airfoil.surfaces, dtype=np.int8),
+        ))
+
+    n_slots = 8
+    while n_slots < 2 * len(entries):
+        n_slots *= 2
+    table = np.zeros(n_slots, dtype=_SLOT)
+    offset = _HEADER.itemsize + table.nbytes
+    data_offsets = []
+    for _, x, _, _ in entries:
+        data_offsets.append(offset)
+        offset += 16 * len(x) + _padded(len(x))
+    name_offset = offset
+
+    for (name, x, _, _), data_offset in zip(entries, data_offsets):
+        name_hash = _name_hash(name)
+        slot = name_hash & (n_slots - 1)
+        while table[slot]["data_offset"]:
+            slot = (slot + 1) & (n_slots - 1)
+        table[slot] = (name_hash, len(name), name_offset, data_offset, len(x))
+        name_offset += len(name)
+
+    header = np.array([(LIBRARY_MAGIC, len(entries), n_slots, _HEADER.itemsize)], dtype=_HEADER)
+    # written beside path and moved over it, so maps of the old file stay
+    # valid; truncating a mapped file in place kills the process with SIGBUS
+    path = os.path.abspath(path)
+    handle, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    try:
+        with os.fdopen(handle, "wb") as f:
+            f.write(header.tobytes())
+            f.write(table.tobytes())
+            for _, x, y, surfaces in entries:
+                f.write(x.tobytes())
+                f.write(y.tobytes())
+                f.write(surfaces.tobytes())
+                f.write(b"\0" * (_padded(len(x)) - len(x)))
+            for name, _, _, _ in entries:
+                f.write(name)
+        # mkstemp makes the file private; give it the mode the old file had,
+        # or that of a new file, so other users can still read the library
+        os.chmod(temp_path, _file_mode(path))
+        # the shared library for path maps the old file; the next
+        # open_library maps the new one
+        _open_libraries.pop(path, None)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.remove(temp_path)
+        raise
+
+
+class AirfoilLibrary(object):
+    """Read-only view of a library file. Opening maps the file and reads the
+    fixed size header; lookups probe the on-disk hash table, so neither
+    depends on the number of airfoils. Arrays are views into the shared map."""
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            self._buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        header = np.frombuffer(self._buffer, dtype=_HEADER, count=1)[0]
+        if header["magic"] != LIBRARY_MAGIC:
+            raise ValueError("Not an airfoil library: " + str(path))
+        self._count = int(header["count"])
+        self._table = np.frombuffer(
+            self._buffer, dtype=_SLOT, count=int(header["slots"]), offset=int(header["table_offset"])
+        )
+
+    def __len__(self):
+        return self._count
+
+    def _slot(self, name):
+        name_bytes = name.encode("utf-8")
+        name_hash = _name_hash(name_bytes)
+        mask = len(self._table) - 1
+        slot = name_hash & mask
+        while True:
+            entry = self._table[slot]
+            if not entry["data_offset"]:
+                raise KeyError(name)
+            if entry["hash"] == name_hash and entry["name_length"] == len(name_bytes):
+                start = int(entry["name_offset"])
+                if self._buffer[start:start + len(name_bytes)] == name_bytes:
+                    return entry
+            slot = (slot + 1) & mask
+
+    def __contains__(self, name):
+        try:
+            self._slot(name)
+        except KeyError:
+            return False
+        return True
+
+    def arrays(self, name):
+        """(x, y, surfaces) arrays for name, without copying. Raises KeyError."""
+        entry = self._slot(name)
+        n = int(entry["points"])
+        offset = int(entry["data_offset"])
+        return (
+            np.frombuffer(self._buffer, dtype="<f8", count=n, offset=offset),
+            np.frombuffer(self._buffer, dtype="<f8", count=n, offset=offset + 8 * n),
+            np.frombuffer(self._buffer, dtype=np.int8, count=n, offset=offset + 16 * n),
+        )
+
+    @property
+    def names(self):
+        used = self._table[self._table["data_offset"] != 0]
+        return sorted(
+            self._buffer[int(entry["name_offset"]):int(entry["name_offset"] + entry["name_length"])].decode("utf-8")
+            for entry in used
+        )
+
+
+_open_libraries = {}
+
+def open_library(path):
+    """Shared AirfoilLibrary for path, mapped once per process."""
+    path = os.path.abspath(path)
+    if path not in _open_libraries:
+        _open_libraries[path] = AirfoilLibrary(path)
+    return _open_libraries[path]
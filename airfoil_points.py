@@ -1,10 +1,18 @@
 from enum import Enum
 import io
+import mmap
+import re
 import unittest
-import urllib.request
-from urllib.error import HTTPError
 import numbers
 from math import sin, cos, radians
+import numpy as np
+
+try:
+    from .airfoil_cache import default_cache, DownloadError
+    from .airfoil_library import open_library
+except ImportError:
+    from airfoil_cache import default_cache, DownloadError
+    from airfoil_library import open_library
 
 class DatFileFormats(Enum):
     SELIG=0
@@ -48,115 +56,639 @@ class AirfoilPoint():
     def __str__(self):
         return "point x=" + str(self.x) + " y=" + str(self.y) + " surface=" + str(self.surface)
 
+class SectionTransform(object):
+    """Pending transform of an airfoil section, kept as
+        p' = M p + t + s (S p + w)
+    where s is +1 on the top surface and -1 elsewhere. Scales, rotations and
+    translations are affine; the trailing edge thickness change is the
+    surface dependent shear. Any chain of them composes into this one form,
+    so it can be applied to the coordinate arrays in a single pass."""
+    def __init__(self, matrix=(1.0, 0.0, 0.0, 1.0), translation=(0.0, 0.0),
+                 surface_matrix=(0.0, 0.0, 0.0, 0.0), surface_translation=(0.0, 0.0)):
+        self.matrix = matrix
+        self.translation = translation
+        self.surface_matrix = surface_matrix
+        self.surface_translation = surface_translation
+
+    @property
+    def is_identity(self):
+        return self.matrix == (1.0, 0.0, 0.0, 1.0) and self.translation == (0.0, 0.0) \
+            and not self.has_surface_term
+
+    @property
+    def has_surface_term(self):
+        return self.surface_matrix != (0.0, 0.0, 0.0, 0.0) or self.surface_translation != (0.0, 0.0)
+
+    @property
+    def preserves_y_order(self):
+        """True when y' depends on y alone, so y extremes map to y' extremes."""
+        return self.matrix[2] == 0 and not self.has_surface_term
+
+    def then_affine(self, matrix, translation=(0.0, 0.0)):
+        """Follow this transform with p'' = A p' + u."""
+        a, b, c, d = matrix
+        return SectionTransform(
+            _mat_mul(matrix, self.matrix),
+            (a * self.translation[0] + b * self.translation[1] + translation[0],
+             c * self.translation[0] + d * self.translation[1] + translation[1]),
+            _mat_mul(matrix, self.surface_matrix),
+            (a * self.surface_translation[0] + b * self.surface_translation[1],
+             c * self.surface_translation[0] + d * self.surface_translation[1])
+        )
+
+    def then_surface_shear(self, factor):
+        """Follow this transform with y'' = y' + s * factor * x'."""
+        m, t, sm, st = self.matrix, self.translation, self.surface_matrix, self.surface_translation
+        return SectionTransform(
+            (m[0], m[1], m[2] + factor * sm[0], m[3] + factor * sm[1]),
+            (t[0], t[1] + factor * st[0]),
+            (sm[0], sm[1], sm[2] + factor * m[0], sm[3] + factor * m[1]),
+            (st[0], st[1] + factor * t[0])
+        )
+
+    def apply(self, x, y, sign):
+        """Apply to scalars or arrays; sign is +1 on the top surface, -1 elsewhere."""
+        a, b, c, d = self.matrix
+        x_out = a * x + b * y + self.translation[0]
+        y_out = c * x + d * y + self.translation[1]
+        if self.has_surface_term:
+            e, f, g, h = self.surface_matrix
+            x_out = x_out + sign * (e * x + f * y + self.surface_translation[0])
+            y_out = y_out + sign * (g * x + h * y + self.surface_translation[1])
+        return x_out, y_out
+
+
+def _mat_mul(m1, m2):
+    return (
+        m1[0] * m2[0] + m1[1] * m2[2], m1[0] * m2[1] + m1[1] * m2[3],
+        m1[2] * m2[0] + m1[3] * m2[2], m1[2] * m2[1] + m1[3] * m2[3]
+    )
+
+
+
+# A line whose first visible character cannot start a number is an airfoil name
+_NAME_LINE = re.compile(rb'^[ \t]*[^\s0-9.+\-].*$', re.M)
+
+
+def detect_dat_format(values):
+    """Selig files hold coordinates from the start. Lednicer files open with
+    the upper and lower point counts, which are whole numbers above 1."""
+    if len(values) >= 2 and values[0] > 1 and values[1] > 1 \
+            and values[0] == int(values[0]) and values[1] == int(values[1]) \
+            and len(values) == 2 + 2 * int(values[0] + values[1]):
+        return DatFileFormats.LEDNICER
+    return DatFileFormats.SELIG
+
+
+def _block_coordinates(values, dat_format=None):
+    """Coordinates of one airfoil block as an (n, 2) array in Selig order,
+    trailing edge over the top surface to the leading edge and back."""
+    if dat_format is None:
+        dat_format = detect_dat_format(values)
+    if dat_format == DatFileFormats.LEDNICER:
+        n_top = int(values[0])
+        top = values[2:2 + 2 * n_top].reshape(-1, 2)[::-1]
+        btm = values[2 + 2 * n_top:].reshape(-1, 2)
+        if len(btm) and (btm[0] == top[-1]).all():
+            btm = btm[1:]
+        return np.concatenate((top, btm))
+    if len(values) % 2:
+        raise LineReadError("Odd number of coordinate values in airfoil block")
+    return values.reshape(-1, 2)
+
+
+def _iter_dat_blocks(buffer, dat_format=None):
+    """Split a .dat buffer into (name, coordinates) blocks. The first line is
+    always a name; any later name line starts a new airfoil, so concatenated
+    files are read as a stream. Each block is converted in one call."""
+    first_end = buffer.find(b'\n')
+    if first_end < 0:
+        first_end = len(buffer)
+    starts = [(0, first_end)] + [
+        match.span() for match in _NAME_LINE.finditer(buffer, first_end)
+    ]
+    for i, (name_start, name_end) in enumerate(starts):
+        block_end = starts[i + 1][0] if i + 1 < len(starts) else len(buffer)
+        try:
+            values = np.array(buffer[name_end:block_end].split(), dtype=float)
+        except ValueError as ex:
+            raise LineReadError(str(ex))
+        if not len(values):
+            continue
+        name = bytes(buffer[name_start:name_end]).decode('utf-8', 'replace').strip()
+        yield name, _block_coordinates(values, dat_format)
+
+
+def _arc_length(x, y):
+    """Cumulative polyline length at each point."""
+    return np.concatenate(([0.0], np.cumsum(np.hypot(np.diff(x), np.diff(y)))))
+
+
+def _hermite_slopes(s, values):
+    """Node derivatives d(values)/ds for a C1 cubic through the nodes, from
+    the length weighted average of the neighbouring secant slopes."""
+    h = np.diff(s)
+    secant = np.diff(values, axis=-1) / h
+    slopes = np.empty_like(values)
+    slopes[..., 1:-1] = (h[1:] * secant[..., :-1] + h[:-1] * secant[..., 1:]) / (h[:-1] + h[1:])
+    slopes[..., 0] = secant[..., 0]
+    slopes[..., -1] = secant[..., -1]
+    return slopes
+
+
+def _hermite_eval(s, values, slopes, s_new):
+    """Evaluate the piecewise cubic through (s, values) at s_new. values may
+    stack several coordinates along the leading axes."""
+    i = np.clip(np.searchsorted(s, s_new, side='right') - 1, 0, len(s) - 2)
+    h = s[i + 1] - s[i]
+    t = (s_new - s[i]) / h
+    t2 = t * t
+    t3 = t2 * t
+    return (2 * t3 - 3 * t2 + 1) * values[..., i] + (t3 - 2 * t2 + t) * h * slopes[..., i] \
+        + (3 * t2 - 2 * t3) * values[..., i + 1] + (t3 - t2) * h * slopes[..., i + 1]
+
+
+def _polyline_distance(points, polyline, nearest, window=24):
+    """Distance from each (x, y) column of points to polyline, checking the
+    2 * window segments around the polyline index nearest to each point."""
+    offsets = np.arange(-window, window)
+    segments = np.clip(nearest[:, None] + offsets, 0, polyline.shape[1] - 2)
+    start = polyline[:, segments]
+    direction = polyline[:, segments + 1] - start
+    length2 = np.maximum((direction ** 2).sum(axis=0), 1e-300)
+    relative = points[:, :, None] - start
+    t = np.clip((relative * direction).sum(axis=0) / length2, 0, 1)
+    return np.sqrt(((relative - t * direction) ** 2).sum(axis=0)).min(axis=1)
+
+
+REPANEL_SPACINGS = ("cosine", "arc", "curvature")
+
+
 class AirfoilPoints(object):
-    def __init__(self, name, positions):
+    """Airfoil section stored as contiguous x and y coordinate arrays plus a
+    surface mask. Transforms are recorded lazily as a SectionTransform on
+    the source arrays and evaluated in one pass when coordinates are read."""
+    def __init__(self, name, positions=None):
+        positions = positions or []
+        self._init_source(
+            name,
+            np.array([pos.x for pos in positions], dtype=float),
+            np.array([pos.y for pos in positions], dtype=float),
+            np.array([pos.surface.value for pos in positions], dtype=np.int8)
+        )
+
+    def _init_source(self, name, x, y, surfaces):
         self.name = name
-        self.positions = positions
+        self._source_x = x
+        self._source_y = y
+        self._surfaces = surfaces
+        self._source_cache = {}
+        self._cache = {}
+        self._transform = SectionTransform()
+        self._x = x
+        self._y = y
+        self._positions = []
+
+    @staticmethod
+    def from_arrays(name, x, y, surfaces):
+        """Build from coordinate arrays and an array of Surfaces values.
+        The arrays are stored as given and never modified in place."""
+        afpoints = AirfoilPoints.__new__(AirfoilPoints)
+        afpoints._init_source(
+            name,
+            np.asarray(x, dtype=float),
+            np.asarray(y, dtype=float),
+            np.asarray(surfaces, dtype=np.int8)
+        )
+        return afpoints
 
     @staticmethod
     def from_list(name, data):
-        _positions = []
-        last_x = 1.1
-        for line in data:
-            _positions.append(AirfoilPoint(
-                line[0], 
-                line[1], 
-                Surfaces.TOP if line[0] < last_x else Surfaces.BTM
-                )) 
-            last_x = _positions[-1].x
-        return AirfoilPoints(name, _positions)
+        """Airfoil from rows of x, y in Selig order. Columns after the
+        second, such as a z coordinate, are ignored."""
+        data = np.asarray(data, dtype=float)
+        if data.ndim != 2 or data.shape[1] < 2:
+            raise ValueError("Airfoil coordinates must be rows of x, y, not shape " + str(data.shape))
+        data = data[:, :2]
+        x = data[:, 0]
+        last_x = np.concatenate(([1.1], x[:-1]))
+        surfaces = np.where(x < last_x, Surfaces.TOP.value, Surfaces.BTM.value)
+        return AirfoilPoints.from_arrays(name, x, data[:, 1], surfaces)
+
+    @staticmethod
+    def from_file(file, dat_format=None):
+        """First airfoil in a Selig or Lednicer .dat file. The format is
+        detected from the data unless given as a DatFileFormats value."""
+        for airfoil in AirfoilPoints.iter_file(file, dat_format):
+            return airfoil
+        raise LineReadError("No coordinates in airfoil file " + str(file))
 
     @staticmethod
-    def from_file(file):      
-        last_pos = 1.1
-        
-        with open(file) as f:
-            lines = f.readlines()
-    
-        data = []
-        for line in lines[1:]:
-            data.append(
-                ([float(val) for val in line.strip().split()])
-            )
-        
-        return AirfoilPoints.from_list(lines.pop(0).strip(), data)
+    def iter_file(file, dat_format=None):
+        """Every airfoil in a .dat file, read through a memory map."""
+        with open(file, 'rb') as f:
+            if not f.seek(0, io.SEEK_END):
+                raise LineReadError("Empty airfoil file " + str(file))
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                for airfoil in AirfoilPoints.iter_dat(buffer, dat_format):
+                    yield airfoil
 
     @staticmethod
-    def from_airfoiltools(airfoiltoolsname):
-        print("Downloading file from airfoiltools.com")
+    def iter_dat(buffer, dat_format=None):
+        """Every airfoil in a bytes-like .dat buffer."""
+        for name, coordinates in _iter_dat_blocks(buffer, dat_format):
+            yield AirfoilPoints.from_list(name, coordinates)
+
+    @staticmethod
+    def from_library(path, name):
+        """Airfoil from a packed library file (see airfoil_library). The file
+        is mapped once per process and the arrays are views into it."""
         try:
-            _file = urllib.request.urlretrieve("http://airfoiltools.com/airfoil/seligdatfile?airfoil=" + airfoiltoolsname)
-            print("Finished downloading file from airfoiltools.com")
-        except HTTPError as ex:
+            x, y, surfaces = open_library(path).arrays(name)
+        except KeyError:
+            raise AirfoilNotFound(name)
+        return AirfoilPoints.from_arrays(name, x, y, surfaces)
+
+    @staticmethod
+    def from_airfoiltools(airfoiltoolsname, cache=None):
+        """Selig file from airfoiltools.com, served from the local download
+        cache when possible (see airfoil_cache.AirfoilCache)."""
+        cache = cache or default_cache()
+        try:
+            data = cache.get(airfoiltoolsname)
+        except DownloadError as ex:
             print("Error downloading file from airfoiltools.com: " + str(ex))
-            raise AirfoilNotFound("")
-        return AirfoilPoints.from_file(_file[0])
+            raise AirfoilNotFound(airfoiltoolsname)
+        for airfoil in AirfoilPoints.iter_dat(data):
+            return airfoil
+        raise AirfoilNotFound(airfoiltoolsname)
+
+    @staticmethod
+    def from_airfoiltools_many(airfoiltoolsnames, cache=None, max_workers=8):
+        """Fetch several airfoiltools.com names concurrently over reused
+        connections. Returns a dict of name to AirfoilPoints, or to the
+        AirfoilNotFound error for names that could not be loaded."""
+        cache = cache or default_cache()
+        airfoils = {}
+        for name, data in cache.get_many(airfoiltoolsnames, max_workers).items():
+            if isinstance(data, Exception):
+                airfoils[name] = AirfoilNotFound(name + ": " + str(data))
+                continue
+            try:
+                airfoils[name] = next(AirfoilPoints.iter_dat(data))
+            except (StopIteration, LineReadError):
+                airfoils[name] = AirfoilNotFound(name)
+        return airfoils
+
+    def _with_transform(self, transform, cache=None):
+        afpoints = AirfoilPoints.__new__(AirfoilPoints)
+        afpoints.name = self.name
+        afpoints._source_x = self._source_x
+        afpoints._source_y = self._source_y
+        afpoints._surfaces = self._surfaces
+        afpoints._source_cache = self._source_cache
+        afpoints._cache = cache or {}
+        afpoints._transform = transform
+        afpoints._x = None
+        afpoints._y = None
+        afpoints._positions = []
+        return afpoints
+
+    def _with_affine(self, matrix, translation=(0.0, 0.0)):
+        """Apply p' = A p + u, carrying over the measurements it maps exactly:
+        area scales with det(A), and for a rotation with uniform scale the
+        section lengths scale and the chord fractions stay the same."""
+        a, b, c, d = matrix
+        cache = {}
+        if 'area' in self._cache:
+            cache['area'] = self._cache['area'] * abs(a * d - b * c)
+        if a == d and b == -c:
+            scale = (a * a + c * c) ** 0.5
+            for key in ('true_chord', 'max_thickness', 'max_camber', 'le_radius', 'source_deviation'):
+                if key in self._cache:
+                    cache[key] = self._cache[key] * scale
+            for key in ('max_thickness_position', 'max_camber_position'):
+                if key in self._cache:
+                    cache[key] = self._cache[key]
+        return self._with_transform(self._transform.then_affine(matrix, translation), cache)
+
+    def _cached(self, key, func):
+        if key not in self._cache:
+            self._cache[key] = func()
+        return self._cache[key]
+
+    def _source_value(self, key, func):
+        if key not in self._source_cache:
+            self._source_cache[key] = func()
+        return self._source_cache[key]
+
+    @property
+    def _sign(self):
+        return self._source_value('sign', lambda: np.where(self.top_mask, 1.0, -1.0))
+
+    def _materialise(self):
+        if self._x is None:
+            self._x, self._y = self._transform.apply(self._source_x, self._source_y, self._sign)
+
+    def _point(self, i):
+        """Single transformed point, without evaluating the whole section."""
+        if self._x is not None:
+            return self._x[i], self._y[i]
+        return self._transform.apply(
+            self._source_x[i], self._source_y[i], 1.0 if self._surfaces[i] == Surfaces.TOP.value else -1.0
+        )
+
+    def __len__(self):
+        return len(self._source_x)
+
+    @property
+    def transform(self):
+        return self._transform
+
+    @property
+    def x(self):
+        self._materialise()
+        return self._x
+
+    @property
+    def y(self):
+        self._materialise()
+        return self._y
+
+    @property
+    def surfaces(self):
+        return self._surfaces
+
+    @property
+    def top_mask(self):
+        return self._surfaces == Surfaces.TOP.value
+
+    @property
+    def positions(self):
+        """List of AirfoilPoint, built on first access for compatibility."""
+        if not self._positions:
+            self._positions = [
+                AirfoilPoint(x, y, Surfaces(surface))
+                for x, y, surface in zip(self.x.tolist(), self.y.tolist(), self._surfaces.tolist())
+            ]
+        return self._positions
 
     @property
     def chord(self):
-        return self.positions[0].x
+        return self._point(0)[0]
 
     @property
     def te_thickness(self):
-        return self.positions[0].y - self.positions[-1].y
+        return self._point(0)[1] - self._point(-1)[1]
 
     @property
     def thickness(self):
-        top=0
-        btm=0
-        for pos in self.positions:
-            if pos.y > top:
-                top = pos.y
-            if pos.y < btm:
-                btm = pos.y
-        return top - btm
+        if self._transform.preserves_y_order:
+            d = self._transform.matrix[3]
+            ty = self._transform.translation[1]
+            ymin = self._source_value('ymin', self._source_y.min)
+            ymax = self._source_value('ymax', self._source_y.max)
+            return max(d * ymax + ty, d * ymin + ty, 0) - min(d * ymax + ty, d * ymin + ty, 0)
+        return self._cached('thickness', lambda: max(self.y.max(), 0) - min(self.y.min(), 0))
+
+    def _chord_frame(self):
+        """Leading edge index, true chord and the points in chord line
+        coordinates: u from leading (0) to trailing edge (1), v normal to it,
+        both as fractions of the chord. The trailing edge is the midpoint of
+        the end points and the leading edge the point furthest from it."""
+        def _frame():
+            x, y = self.x, self.y
+            te_x = 0.5 * (x[0] + x[-1])
+            te_y = 0.5 * (y[0] + y[-1])
+            distance = np.hypot(x - te_x, y - te_y)
+            le = int(np.argmax(distance))
+            chord = distance[le]
+            c = (te_x - x[le]) / chord
+            s = (te_y - y[le]) / chord
+            dx = (x - x[le]) / chord
+            dy = (y - y[le]) / chord
+            return le, chord, dx * c + dy * s, dy * c - dx * s
+        return self._cached('chord_frame', _frame)
+
+    def _mean_line(self):
+        """Stations along the chord with the thickness and camber there."""
+        def _distribution():
+            le, _, u, v = self._chord_frame()
+            top_u, top_v = u[le::-1], v[le::-1]
+            btm_u, btm_v = u[le:], v[le:]
+            top_order = np.argsort(top_u)
+            btm_order = np.argsort(btm_u)
+            stations = np.union1d(top_u, btm_u)
+            stations = stations[(stations >= 0) & (stations <= 1)]
+            top = np.interp(stations, top_u[top_order], top_v[top_order])
+            btm = np.interp(stations, btm_u[btm_order], btm_v[btm_order])
+            return stations, top - btm, 0.5 * (top + btm)
+        return self._cached('mean_line', _distribution)
+
+    @property
+    def true_chord(self):
+        """Distance from the leading edge to the trailing edge midpoint."""
+        return self._cached('true_chord', lambda: self._chord_frame()[1])
+
+    @property
+    def max_thickness(self):
+        """Largest distance between the surfaces normal to the chord line."""
+        return self._cached('max_thickness', lambda: self._mean_line()[1].max() * self.true_chord)
+
+    @property
+    def max_thickness_position(self):
+        """Chord fraction of max_thickness."""
+        def _position():
+            stations, thickness, _ = self._mean_line()
+            return stations[np.argmax(thickness)]
+        return self._cached('max_thickness_position', _position)
+
+    @property
+    def max_camber(self):
+        """Largest offset of the mean line from the chord line."""
+        def _camber():
+            _, _, camber = self._mean_line()
+            return camber[np.argmax(np.abs(camber))] * self.true_chord
+        return self._cached('max_camber', _camber)
+
+    @property
+    def max_camber_position(self):
+        """Chord fraction of max_camber."""
+        def _position():
+            stations, _, camber = self._mean_line()
+            return stations[np.argmax(np.abs(camber))]
+        return self._cached('max_camber_position', _position)
+
+    @property
+    def le_radius(self):
+        """Radius of a least squares circle through the points within 0.1% chord
+        of the leading edge, and at least two points either side of it."""
+        def _radius():
+            le, chord, u, v = self._chord_frame()
+            near = u < 0.001
+            near[max(le - 2, 0):le + 3] = True
+            u, v = u[near], v[near]
+            a = np.column_stack((2 * u, 2 * v, np.ones_like(u)))
+            (cu, cv, k), _, _, _ = np.linalg.lstsq(a, u * u + v * v, rcond=None)
+            return np.sqrt(k + cu * cu + cv * cv) * chord
+        return self._cached('le_radius', _radius)
+
+    @property
+    def area(self):
+        """Enclosed area, closing the section across the trailing edge."""
+        def _area():
+            x, y = self.x, self.y
+            return 0.5 * abs(np.dot(x, np.roll(y, -1)) - np.dot(y, np.roll(x, -1)))
+        return self._cached('area', _area)
+
+    @property
+    def source_deviation(self):
+        """Largest distance from the airfoil this one was repaneled from, or
+        None if it was not created by repanel."""
+        return self._cache.get('source_deviation')
+
+    def _spline(self):
+        """Arc length parameters, coordinates and slopes of the C1 cubic
+        through the points."""
+        def _fit():
+            s = _arc_length(self.x, self.y)
+            values = np.vstack((self.x, self.y))
+            return s, values, _hermite_slopes(s, values)
+        return self._cached('spline', _fit)
+
+    def _spacing(self, n, spacing):
+        """n arc length parameters from trailing edge to trailing edge."""
+        s, values, slopes = self._spline()
+        if spacing == "arc":
+            return np.linspace(0, s[-1], n)
+        if spacing == "cosine":
+            # cluster at both ends of each surface, with the leading edge shared
+            s_le = s[self._chord_frame()[0]]
+            n_top = (n + 1) // 2
+            beta_top = np.linspace(0, np.pi, n_top)
+            beta_btm = np.linspace(0, np.pi, n - n_top + 1)[1:]
+            return np.concatenate((
+                s_le * 0.5 * (1 - np.cos(beta_top)),
+                s_le + (s[-1] - s_le) * 0.5 * (1 - np.cos(beta_btm))
+            ))
+        if spacing == "curvature":
+            # point density grows with the square root of the curvature
+            fine = np.linspace(0, s[-1], 16 * len(s))
+            i = np.clip(np.searchsorted(s, fine, side='right') - 1, 0, len(s) - 2)
+            h = s[i + 1] - s[i]
+            t = (fine - s[i]) / h
+            d1 = ((6 * t * t - 6 * t) * (values[:, i] - values[:, i + 1]) / h
+                  + (3 * t * t - 4 * t + 1) * slopes[:, i] + (3 * t * t - 2 * t) * slopes[:, i + 1])
+            d2 = ((12 * t - 6) * (values[:, i] - values[:, i + 1]) / h ** 2
+                  + (6 * t - 4) * slopes[:, i] / h + (6 * t - 2) * slopes[:, i + 1] / h)
+            speed = np.hypot(d1[0], d1[1])
+            curvature = np.abs(d1[0] * d2[1] - d1[1] * d2[0]) / np.maximum(speed, 1e-12) ** 3
+            density = np.sqrt(curvature) + 0.1 * np.sqrt(curvature).mean() + 1e-12
+            cumulative = np.concatenate(([0.0], np.cumsum(0.5 * (density[1:] + density[:-1]) * np.diff(fine))))
+            return np.interp(np.linspace(0, cumulative[-1], n), cumulative, fine)
+        raise ValueError("spacing must be one of " + ", ".join(REPANEL_SPACINGS))
+
+    def deviation_from(self, other):
+        """Largest distance from the points of other, and the midpoints of its
+        spline between them, to the spline through this airfoil's points.
+        Both are assumed to trace the same outline in the same direction."""
+        s, values, slopes = self._spline()
+        fine = np.linspace(0, s[-1], 8 * len(s))
+        curve = _hermite_eval(s, values, slopes, fine)
+        other_s, other_values, other_slopes = other._spline()
+        other_mid = 0.5 * (other_s[1:] + other_s[:-1])
+        points = np.hstack((other_values, _hermite_eval(other_s, other_values, other_slopes, other_mid)))
+        along = np.concatenate((other_s, other_mid)) / other_s[-1]
+        curve_along = _arc_length(curve[0], curve[1])
+        nearest = np.searchsorted(curve_along / curve_along[-1], along)
+        return _polyline_distance(points, curve, nearest).max()
+
+    def _repanel_with(self, n, spacing):
+        s, values, slopes = self._spline()
+        s_new = self._spacing(n, spacing)
+        x, y = _hermite_eval(s, values, slopes, s_new)
+        x[0], y[0], x[-1], y[-1] = self.x[0], self.y[0], self.x[-1], self.y[-1]
+        s_le = s[self._chord_frame()[0]]
+        surfaces = np.where(s_new <= s_le, Surfaces.TOP.value, Surfaces.BTM.value)
+        afpoints = AirfoilPoints.from_arrays(self.name, x, y, surfaces)
+        afpoints._cache['source_deviation'] = afpoints.deviation_from(self)
+        return afpoints
+
+    def repanel(self, n=None, spacing="cosine", tolerance=None):
+        """Resample onto n points along a cubic spline through the current
+        points. With a tolerance instead of n, the smallest n whose
+        source_deviation is within it is used. spacing is "cosine"
+        (clustered at the leading and trailing edge), "arc" (even arc
+        length) or "curvature" (denser where the surface curves)."""
+        if spacing not in REPANEL_SPACINGS:
+            raise ValueError("spacing must be one of " + ", ".join(REPANEL_SPACINGS))
+        if n is not None:
+            return self._repanel_with(max(int(n), 3), spacing)
+        if tolerance is None:
+            raise ValueError("repanel needs a point count or a tolerance")
+        limit = max(4 * len(self), 16)
+        high = 8
+        best = self._repanel_with(high, spacing)
+        while best.source_deviation > tolerance and high < limit:
+            low, high = high, min(2 * high, limit)
+            best = self._repanel_with(high, spacing)
+        if high == 8 or best.source_deviation > tolerance:
+            return best
+        while high - low > 1:
+            mid = (low + high) // 2
+            candidate = self._repanel_with(mid, spacing)
+            if candidate.source_deviation <= tolerance:
+                high, best = mid, candidate
+            else:
+                low = mid
+        return best
+
+    @staticmethod
+    def morph(root, tip, sections, n_points=None, spacing="cosine"):
+        """Blend two airfoils with any point counts into a stack of sections.
+        Both are repaneled onto the same n_points parameterisation, in which
+        point i sits at the same fraction of the same surface, and all
+        sections are interpolated in one array operation. sections is a
+        section count (root and tip included) or a sequence of blend
+        fractions, 0 at the root and 1 at the tip."""
+        if spacing not in ("cosine", "arc"):
+            raise ValueError("morph spacing must be cosine or arc")
+        n_points = n_points or max(len(root), len(tip))
+        fractions = np.linspace(0, 1, sections) if np.isscalar(sections) else np.asarray(sections, dtype=float)
+        root = root._repanel_with(n_points, spacing)
+        tip = tip._repanel_with(n_points, spacing)
+        weights = fractions[:, None]
+        x = (1 - weights) * root.x + weights * tip.x
+        y = (1 - weights) * root.y + weights * tip.y
+        name = root.name if root.name == tip.name else root.name + " to " + tip.name
+        return [
+            AirfoilPoints.from_arrays(name, x[i], y[i], root.surfaces)
+            for i in range(len(fractions))
+        ]
 
     def set_props(self, chord, thickness, te_thickness):
         return self.set_chord(chord).set_thickness(thickness).set_te_thickness(te_thickness)
 
     def set_chord(self, chord):
         x_factor = chord / self.chord
-        new_positions = [pos * [x_factor, 1] for pos in self.positions]
-        return AirfoilPoints(self.name, new_positions)
+        return self._with_affine((x_factor, 0.0, 0.0, 1.0))
 
     def set_thickness(self, thickness):
         y_factor = thickness / self.thickness
-        new_positions = [pos * [1, y_factor] for pos in self.positions]
-        return AirfoilPoints(self.name, new_positions) 
+        return self._with_affine((1.0, 0.0, 0.0, y_factor))
 
     def set_te_thickness(self, te_thickness):
         te_factor = 0.5 * (te_thickness - self.te_thickness) / self.chord
-
-        def _add_thick(pos):
-            if pos.surface == Surfaces.TOP:
-                return AirfoilPoint(pos.x, pos.y + pos.x * te_factor, pos.surface)
-            else:
-                return AirfoilPoint(pos.x, pos.y - pos.x * te_factor, pos.surface)
-            
-        new_positions = [_add_thick(pos) for pos in self.positions]
-        
-        return AirfoilPoints(self.name, new_positions)
+        return self._with_transform(self._transform.then_surface_shear(te_factor))
 
     def set_twist(self, twist):
         ang = radians(twist)
         s = sin(ang)
         c = cos(ang)
-        def _rotate(pos):
-            return AirfoilPoint(
-                pos.x * c - pos.y * s,
-                pos.x * s + pos.y * c,
-                pos.surface
-            )
-        return AirfoilPoints(self.name, [_rotate(pos) for pos in self.positions])
+        return self._with_affine((c, -s, s, c))
 
     def offset_y(self, yoff):
-        return AirfoilPoints(
-            self.name,
-            [pos + [0, yoff] for pos in self.positions]
-        )
+        return self._with_affine((1.0, 0.0, 0.0, 1.0), (0.0, yoff))
 
     def offset_x(self, xoff):
-        return AirfoilPoints(
-            self.name,
-            [pos + [xoff, 0] for pos in self.positions]
-        )
+        return self._with_affine((1.0, 0.0, 0.0, 1.0), (xoff, 0.0))
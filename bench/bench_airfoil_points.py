@@ -0,0 +1,160 @@
+"""Offline benchmarks for the airfoil_points pipeline.
+
+    python bench/bench_airfoil_points.py                 compare with bench/baseline.json
+    python bench/bench_airfoil_points.py --save          record a new baseline
+    python bench/bench_airfoil_points.py --quick         fewer repeats and sections
+
+Each case reports the best wall time over the repeats and the peak traced
+memory of one extra run. Cases slower than the baseline by more than
+--time-threshold, or using more memory than --memory-threshold, are flagged
+and the exit status is 1.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from airfoil_points import AirfoilPoints
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+TEST_AIRFOIL = os.path.join(os.path.dirname(BENCH_DIR), "test", "test_airfoil.dat")
+DEFAULT_BASELINE = os.path.join(BENCH_DIR, "baseline.json")
+
+
+def write_dense_airfoil(path, n):
+    """Selig file with n points, from the cosine spaced NACA 2414 thickness form."""
+    beta = np.linspace(0, np.pi, (n + 1) // 2)
+    x = 0.5 * (1 - np.cos(beta))
+    yt = 0.7 * (0.2969 * np.sqrt(x) - 0.126 * x - 0.3516 * x**2 + 0.2843 * x**3 - 0.1015 * x**4)
+    coords = np.concatenate((
+        np.column_stack((x, yt + 0.02))[::-1],
+        np.column_stack((x, -yt + 0.02))[1:]
+    ))
+    with open(path, "w") as f:
+        f.write("DENSE " + str(n) + "\n")
+        np.savetxt(f, coords, fmt="%10.6f")
+
+
+def panel_sections(n):
+    """create_new_panel_doc style section rows, varied so no two are alike."""
+    i = np.arange(n)
+    return [
+        {"chord": c, "thickness": t, "te_thickness": te, "twist": tw, "xoff": xo, "yoff": yo}
+        for c, t, te, tw, xo, yo in zip(
+            (240 - 0.01 * i).tolist(), (30 - 0.001 * i).tolist(), (0.5 + 0.0001 * i).tolist(),
+            (-5 + 0.001 * i).tolist(), (0.02 * i).tolist(), (0.01 * i).tolist()
+        )
+    ]
+
+
+def transform_chain(afpoints, sections):
+    for sec in sections:
+        afpoints.set_chord(sec["chord"]).set_thickness(sec["thickness"]) \
+            .set_te_thickness(sec["te_thickness"]).set_twist(sec["twist"]) \
+            .offset_y(sec["yoff"]).offset_x(sec["xoff"]).x
+
+
+def measurements(afpoints, repeats):
+    for i in range(repeats):
+        placed = afpoints.set_twist(i * 1e-3)
+        placed.thickness
+        placed.te_thickness
+
+
+def cases(tmp, quick):
+    large = os.path.join(tmp, "dense.dat")
+    write_dense_airfoil(large, 10000)
+    small_airfoil = AirfoilPoints.from_file(TEST_AIRFOIL)
+    large_airfoil = AirfoilPoints.from_file(large)
+    section_counts = (100, 1000) if quick else (100, 1000, 10000)
+    yield "from_file_small", lambda: AirfoilPoints.from_file(TEST_AIRFOIL)
+    yield "from_file_large", lambda: AirfoilPoints.from_file(large)
+    for n in section_counts:
+        sections = panel_sections(n)
+        yield "chain_" + str(n) + "_sections", lambda sections=sections: transform_chain(small_airfoil, sections)
+    large_sections = panel_sections(section_counts[0])
+    yield "chain_" + str(section_counts[0]) + "_sections_dense", lambda: transform_chain(large_airfoil, large_sections)
+    yield "thickness_te_thickness_small", lambda: measurements(small_airfoil, 1000)
+    yield "thickness_te_thickness_dense", lambda: measurements(large_airfoil, 100)
+
+
+def measure(func, repeats):
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"time": min(times), "peak_bytes": peak}
+
+
+def run(quick=False):
+    repeats = 3 if quick else 7
+    with tempfile.TemporaryDirectory() as tmp:
+        return {name: measure(func, repeats) for name, func in cases(tmp, quick)}
+
+
+def compare(results, baseline, time_threshold, memory_threshold):
+    """Names of the cases that regressed against baseline."""
+    regressions = []
+    for name, result in results.items():
+        reference = baseline.get(name)
+        if reference is None:
+            continue
+        if result["time"] > time_threshold * reference["time"] \
+                or result["peak_bytes"] > memory_threshold * reference["peak_bytes"]:
+            regressions.append(name)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the airfoil_points pipeline")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save", action="store_true", help="write the results as the new baseline")
+    parser.add_argument("--quick", action="store_true")
+    parser.add_argument("--time-threshold", type=float, default=1.5)
+    parser.add_argument("--memory-threshold", type=float, default=1.25)
+    args = parser.parse_args(argv)
+
+    results = run(args.quick)
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)["cases"]
+    regressions = compare(results, baseline, args.time_threshold, args.memory_threshold)
+
+    for name, result in results.items():
+        line = "{:36s} {:10.2f} ms {:10.1f} KiB".format(name, 1e3 * result["time"], result["peak_bytes"] / 1024)
+        if name in baseline:
+            line += "   x{:.2f} time  x{:.2f} memory".format(
+                result["time"] / baseline[name]["time"],
+                result["peak_bytes"] / max(baseline[name]["peak_bytes"], 1)
+            )
+        if name in regressions:
+            line += "   REGRESSION"
+        print(line)
+
+    if args.save:
+        with open(args.baseline, "w") as f:
+            json.dump({
+                "python": platform.python_version(),
+                "numpy": np.__version__,
+                "machine": platform.machine(),
+                "cases": results,
+            }, f, indent=2)
+        print("Saved baseline to " + args.baseline)
+    return 1 if regressions and not args.save else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,91 @@
+"""API call counts and times of the Fusion code paths, on the in-memory adsk
+stand-in in test/stubs.
+
+    python bench/bench_fusion_pipeline.py                  no latency
+    python bench/bench_fusion_pipeline.py --latency 0.0002 with 0.2 ms per API call
+    python bench/bench_fusion_pipeline.py --top 20         more of the busiest calls
+    python bench/bench_fusion_pipeline.py --sections 100   a longer wing
+
+Each case reports its wall time and API calls; with --latency the time
+includes that much per call, as an estimate of the time inside Fusion.
+"""
+import argparse
+import io
+import os
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, os.path.join(ROOT_DIR, "test", "stubs"))
+sys.path.insert(0, os.path.join(ROOT_DIR, "test"))
+
+from stub_package import load_module
+from adsk import _stub
+from gcode_cases import TEST_AIRFOIL, ROOT, TIP, core_component
+from airfoil_points import AirfoilPoints
+from panel import read_panel_csv, place_section
+
+def panel_one_by_one(fusion_connection, airfoil_spline, panelcsv, afpoints):
+    """create_new_panel_doc as it was before SketchBuilder, a section at a time."""
+    component = fusion_connection.fusion.new_document("panel").design.rootComponent
+    for sec in read_panel_csv(panelcsv):
+        airfoil_spline.create_new_airfoil_sketch(
+            component, airfoil_spline.create_xy_plane(component, 0.1 * sec["zoff"]), place_section(afpoints, sec)
+        )
+
+
+def run_case(name, func, top):
+    _stub.calls.clear()
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    print("{:32s} {:9.3f} s {:9d} calls".format(name, elapsed, _stub.total()))
+    for call, count in _stub.calls.most_common(top):
+        print("    {:36s} {:9d}".format(call, count))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time the Fusion code paths on the adsk stand-in")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds per API call")
+    parser.add_argument("--points", type=int, default=121, help="spline fit points per section")
+    parser.add_argument("--sections", type=int, default=50, help="wing sections in the panel document")
+    parser.add_argument("--top", type=int, default=8, help="busiest API calls listed per case")
+    args = parser.parse_args(argv)
+
+    fusion_connection = load_module("fusion_connection")
+    hot_wire_gcode = load_module("hot_wire_gcode")
+    airfoil_spline = load_module("ParametricAirfoilSpline")
+    afpoints = AirfoilPoints.from_file(TEST_AIRFOIL).repanel(args.points)
+    root, tip = place_section(afpoints, ROOT), place_section(afpoints, TIP)
+
+    handle, panelcsv = tempfile.mkstemp(suffix=".csv")
+    with os.fdopen(handle, "w") as f:
+        f.write(",".join(ROOT) + "\n")
+        for i in range(args.sections):
+            f.write(",".join(str(ROOT[key] + (TIP[key] - ROOT[key]) * i / args.sections) for key in ROOT) + "\n")
+    _stub.latency = args.latency
+    try:
+        component = []
+        builder = []
+        run_case("panel document, one by one", lambda: panel_one_by_one(
+            fusion_connection, airfoil_spline, panelcsv, afpoints
+        ), args.top)
+        run_case("panel document", lambda: builder.append(
+            airfoil_spline.create_new_panel_doc(panelcsv, TEST_AIRFOIL, args.points)
+        ), args.top)
+        print(builder[0])
+        run_case("core sketches", lambda: component.append(
+            core_component(root, tip, 40.0, 70.0)
+        ), args.top)
+        run_case("hot wire gcode", lambda: hot_wire_gcode.HotWireGcode(component[0]).create_gcode_file(io.StringIO()), args.top)
+        run_case("hot wire gcode, again", lambda: hot_wire_gcode.HotWireGcode(component[0]).create_gcode_file(io.StringIO()), args.top)
+    finally:
+        os.remove(panelcsv)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
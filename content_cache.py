@@ -0,0 +1,76 @@
+import hashlib
+from collections import Counter, OrderedDict
+import numpy as np
+
+MAX_ENTRIES = 4096
+
+
+def content_hash(*parts):
+    """Hex digest of parts: strings, numbers, arrays and (nested) tuples or
+    lists of them. Equal content gives equal digests across runs."""
+    digest = hashlib.sha1()
+
+    def update(part):
+        if isinstance(part, np.ndarray):
+            digest.update(str(part.shape).encode())
+            digest.update(np.ascontiguousarray(part, dtype=float).tobytes())
+        elif isinstance(part, (tuple, list)):
+            digest.update(b"(")
+            for item in part:
+                update(item)
+            digest.update(b")")
+        else:
+            digest.update(repr(part).encode())
+        digest.update(b",")
+
+    for part in parts:
+        update(part)
+    return digest.hexdigest()
+
+
+class ContentCache(object):
+    """Results keyed by the content they were computed from, such as a
+    curve's content_hash, rather than by object or revision. They stay
+    valid while the content is unchanged, across edits elsewhere and across
+    rebuilds of the wrappers, so regenerating after changing one curve only
+    recomputes that curve. The least recently used entries beyond
+    max_entries are dropped."""
+    def __init__(self, max_entries=MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.hits = Counter()
+        self.misses = Counter()
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def lookup(self, key, build):
+        """Value for key, a tuple whose first item names the kind of value,
+        from build() when not cached."""
+        name = key[0]
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            self.hits[name] += 1
+            return self._entries[key]
+        self.misses[name] += 1
+        value = build()
+        self._entries[key] = value
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return value
+
+    def clear(self):
+        self._entries.clear()
+
+    def reset_stats(self):
+        self.hits.clear()
+        self.misses.clear()
+
+    def __str__(self):
+        lines = ["{:24s} {:>8s} {:>8s}".format("content", "built", "reused")]
+        for name in sorted(set(self.hits) | set(self.misses)):
+            lines.append("{:24s} {:8d} {:8d}".format(name, self.misses[name], self.hits[name]))
+        return "\n".join(lines)
+
+
+content_cache = ContentCache()
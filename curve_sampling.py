@@ -0,0 +1,147 @@
+import numpy as np
+
+SAMPLE_TOLERANCE = 1e-3 # cm, chordal deviation
+PROBE_POINTS = 65
+MAX_PASSES = 8
+FRACTION_DECIMALS = 9
+
+
+class CurveSamples(object):
+    """Samples along one curve: parameters, (n, 3) positions, the evaluator's
+    own point objects, and each sample's fraction of the sampled length."""
+    def __init__(self, params, positions, points, fractions):
+        self.params = params
+        self.positions = positions
+        self.points = points
+        self.fractions = fractions
+
+    def __len__(self):
+        return len(self.params)
+
+    def subset(self, indices):
+        return CurveSamples(
+            self.params[indices], self.positions[indices],
+            [self.points[i] for i in indices], self.fractions[indices]
+        )
+
+    def simplified(self, tolerance):
+        """The samples a polyline needs to stay within tolerance of these."""
+        return self.subset(chordal_simplify(self.positions, tolerance))
+
+
+def evaluate_points(evaluator, params):
+    """(point objects, (n, 3) positions) at params, in one evaluator call."""
+    ok, points = evaluator.getPointsAtParameters(list(params))
+    if not ok:
+        raise RuntimeError("Curve evaluation failed")
+    points = list(points)
+    return points, np.array([(p.x, p.y, p.z) for p in points], dtype=float).reshape(-1, 3)
+
+
+def _length_fractions(positions):
+    lengths = np.concatenate(([0.0], np.cumsum(np.linalg.norm(np.diff(positions, axis=0), axis=1))))
+    return lengths / lengths[-1] if lengths[-1] > 0 else np.linspace(0, 1, len(positions))
+
+
+def _chord_deviation(starts, middles, ends):
+    """Distance of each middle position from the chord between its start
+    and end positions."""
+    chords = ends - starts
+    offsets = middles - starts
+    length2 = np.einsum("ij,ij->i", chords, chords)
+    f = np.einsum("ij,ij->i", offsets, chords) / np.where(length2 > 0, length2, 1)
+    return np.linalg.norm(offsets - np.clip(f, 0, 1)[:, None] * chords, axis=1)
+
+
+def sample_evaluator(evaluator, tolerance=SAMPLE_TOLERANCE, probe=PROBE_POINTS, max_passes=MAX_PASSES):
+    """Sample a curve densely enough that straight segments between samples
+    stay within tolerance of it. A uniform probe over the parameter range,
+    with the midpoint of each probe segment, is evaluated in one batched
+    call. A segment whose midpoint lies further than tolerance from its
+    chord is halved, and the midpoints of the halves evaluated in another
+    single call, for at most max_passes calls. Every point evaluated is
+    kept as a sample."""
+    ok, start, end = evaluator.getParameterExtents()
+    if not ok:
+        raise RuntimeError("Curve has no parameter range")
+    params = np.linspace(start, end, 2 * probe - 1)
+    points, positions = evaluate_points(evaluator, params)
+    all_params, all_points, all_positions = [params], points, [positions]
+    # each open segment is the start, middle and end index into the last pass
+    segments = np.arange(0, 2 * probe - 2, 2)[:, None] + np.arange(3)
+    for _ in range(max_passes - 1):
+        deviation = _chord_deviation(*(positions[segments[:, k]] for k in range(3)))
+        coarse = segments[deviation > tolerance]
+        if not len(coarse):
+            break
+        # halves as start, new middle, end: the quarter points fall between
+        # each coarse segment's start and middle, and middle and end
+        halves = np.concatenate((coarse[:, :2], coarse[:, 1:]))
+        new_params = params[halves].mean(axis=1)
+        new_points, new_positions = evaluate_points(evaluator, new_params)
+        params = np.concatenate((params[halves].ravel(), new_params))
+        positions = np.concatenate((positions[halves].reshape(-1, 3), new_positions))
+        n = len(halves)
+        segments = np.column_stack((2 * np.arange(n), 2 * n + np.arange(n), 2 * np.arange(n) + 1))
+        all_params.append(new_params)
+        all_points += new_points
+        all_positions.append(new_positions)
+    params = np.concatenate(all_params)
+    order = np.argsort(params, kind="stable")
+    positions = np.concatenate(all_positions)[order]
+    points = [all_points[i] for i in order.tolist()]
+    return CurveSamples(params[order], positions, points, _length_fractions(positions))
+
+
+def samples_at_fractions(evaluator, samples, fractions):
+    """Samples at the given length fractions of a curve already sampled densely.
+    Fractions the samples already hold are reused; the rest are placed by
+    interpolating parameter against length and evaluated in one call."""
+    fractions = np.asarray(fractions, dtype=float)
+    known = np.round(samples.fractions, FRACTION_DECIMALS)
+    wanted = np.round(fractions, FRACTION_DECIMALS)
+    found = np.searchsorted(known, wanted).clip(0, len(known) - 1)
+    reused = known[found] == wanted
+    params = np.where(reused, samples.params[found], np.interp(fractions, samples.fractions, samples.params))
+    positions = samples.positions[found].copy()
+    points = [samples.points[i] for i in found]
+    missing = np.flatnonzero(~reused)
+    if len(missing):
+        new_points, positions[missing] = evaluate_points(evaluator, params[missing])
+        for i, point in zip(missing, new_points):
+            points[i] = point
+    return CurveSamples(params, positions, points, fractions)
+
+
+def chordal_simplify(positions, tolerance):
+    """Indices of the points, ends included, that a polyline needs so that
+    every dropped point lies within tolerance of it (Douglas-Peucker)."""
+    positions = np.asarray(positions, dtype=float)
+    n = len(positions)
+    if n < 3:
+        return np.arange(n)
+    keep = np.zeros(n, dtype=bool)
+    keep[[0, -1]] = True
+    spans = [(0, n - 1)]
+    while spans:
+        i, k = spans.pop()
+        if k - i < 2:
+            continue
+        a = positions[i]
+        chord = positions[k] - a
+        p = positions[i + 1:k] - a
+        length2 = chord @ chord
+        f = np.clip(p @ chord / length2, 0, 1) if length2 > 0 else np.zeros(len(p))
+        distances = np.linalg.norm(p - f[:, None] * chord, axis=1)
+        j = int(np.argmax(distances))
+        if distances[j] > tolerance:
+            keep[i + 1 + j] = True
+            spans.append((i, i + 1 + j))
+            spans.append((i + 1 + j, k))
+    return np.flatnonzero(keep)
+
+
+def merge_fractions(*fraction_lists):
+    """Sorted union of length fractions, so paired curves on the two wire
+    ends can be sampled at the same fractions and stay in step."""
+    return np.unique(np.round(np.concatenate(fraction_lists), FRACTION_DECIMALS))
@@ -0,0 +1,64 @@
+"""Hot wire G-code for a foam core without Fusion.
+
+    python cut_gcode.py core.gcode --airfoil pw075.dat --root 240,30,0.5,0,0,0 --tip 200,25,0.5,-2,10,0 --width 300
+    python cut_gcode.py core.gcode --dxf section_0.dxf section_1.dxf --width 300
+
+Sections are chord,thickness,te_thickness,twist,xoff,yoff as in the panel
+CSV, in mm and degrees. The core's faces are --width mm apart, centred
+between the machine planes unless --offset places the first face.
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from airfoil_points import AirfoilPoints
+from panel import PANEL_COLUMNS, place_section
+from wire_cut import HOTWIRE_PARAMS, WireCut
+
+
+def parse_section(text):
+    values = [float(value) for value in text.split(",")]
+    if len(values) != 6:
+        raise argparse.ArgumentTypeError("expected chord,thickness,te_thickness,twist,xoff,yoff")
+    return dict(zip(PANEL_COLUMNS, values))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Write hot wire G-code for a foam core without Fusion")
+    parser.add_argument("output", help="G-code file to write")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--airfoil", help="airfoil .dat file, placed by --root and --tip")
+    source.add_argument("--dxf", nargs=2, metavar=("SIDE_1", "SIDE_2"), help="outline DXF for each face")
+    parser.add_argument("--root", type=parse_section, help="section on the first face")
+    parser.add_argument("--tip", type=parse_section, help="section on the second face")
+    parser.add_argument("--width", type=float, required=True, help="distance between the faces, mm")
+    parser.add_argument("--offset", type=float, help="first face from the XY machine plane, mm")
+    parser.add_argument("--sym", action="store_true", help="swap the wire ends for the other wing")
+    parser.add_argument("--tolerance", type=float, help="simplify to this deviation, mm")
+    parser.add_argument("--no-arcs", dest="arcs", action="store_false", help="simplify to G01 moves only")
+    parser.add_argument("--kerf", type=float, nargs=2, metavar=("SIDE_1", "SIDE_2"), help="kerf width, mm")
+    parser.add_argument("--precision", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    if args.kerf:
+        HOTWIRE_PARAMS["kerf"] = tuple(args.kerf)
+    offset = None if args.offset is None else 0.1 * args.offset
+    if args.airfoil:
+        if args.root is None or args.tip is None:
+            parser.error("--airfoil needs --root and --tip sections")
+        afpoints = AirfoilPoints.from_file(args.airfoil)
+        cut = WireCut.from_airfoils(
+            place_section(afpoints, args.root), place_section(afpoints, args.tip), 0.1 * args.width, offset
+        )
+    else:
+        cut = WireCut.from_dxf(args.dxf[0], args.dxf[1], 0.1 * args.width, offset)
+
+    plan = cut.create_gcode_file(args.output, args.sym, args.precision, args.tolerance, args.arcs)
+    print(args.output + ": " + str(plan))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
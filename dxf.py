@@ -0,0 +1,198 @@
+import io
+import numpy as np
+
+try:
+    from .outline_profile import PolylineCurve, NurbsCurve, OutlineProfile
+except ImportError:
+    from outline_profile import PolylineCurve, NurbsCurve, OutlineProfile
+
+# $INSUNITS codes to cm
+DXF_UNITS = {
+    1: 2.54, # inches
+    4: 0.1, # millimeters
+    5: 1.0, # centimeters
+    6: 100.0, # meters
+}
+DEFAULT_DXF_SCALE = 0.1 # unitless drawings are taken to be in mm
+
+
+def _group_pairs(f):
+    """(code, value) pairs of an ASCII DXF file."""
+    while True:
+        code = f.readline()
+        value = f.readline()
+        if not code or not value:
+            return
+        yield int(code), value.strip()
+
+
+def _entities(pairs):
+    """(header variables, [(entity type, [(code, value), ...]), ...])."""
+    header = {}
+    entities = []
+    section = None
+    variable = None
+    for code, value in pairs:
+        if code == 0:
+            if value == "SECTION":
+                section = None
+            elif value == "ENDSEC":
+                section = None
+            elif section == "ENTITIES":
+                entities.append((value, []))
+            continue
+        if code == 2 and section is None:
+            section = value
+        elif section == "HEADER":
+            if code == 9:
+                variable = value
+            elif variable is not None:
+                header.setdefault(variable, value)
+        elif section == "ENTITIES" and entities:
+            entities[-1][1].append((code, value))
+    return header, entities
+
+
+def _values(codes, code):
+    return [float(value) for c, value in codes if c == code]
+
+
+def _points(codes, x_code=10):
+    return list(zip(_values(codes, x_code), _values(codes, x_code + 10)))
+
+
+# entities that carry no outline geometry
+ANNOTATION_ENTITIES = {"POINT", "TEXT", "MTEXT", "DIMENSION", "LEADER", "MLEADER", "HATCH", "VIEWPORT"}
+
+
+def _value(codes, code, default=0.0):
+    values = _values(codes, code)
+    return values[0] if values else default
+
+
+def _mirrored(codes):
+    """Whether an entity's object coordinate system is the drawing's seen
+    from below, its extrusion pointing down, which mirrors x."""
+    return _value(codes, 230, 1.0) < 0
+
+
+def _bulge_arc(start, end, bulge):
+    """Arc from start to end for a polyline bulge, the tangent of a quarter
+    of its sweep, counter-clockwise when positive."""
+    start, end = np.asarray(start), np.asarray(end)
+    sweep = 4 * np.arctan(bulge)
+    chord = end - start
+    normal = np.array((-chord[1], chord[0]))
+    center = (start + end) / 2 + normal / (2 * np.tan(sweep / 2))
+    offset = start - center
+    return NurbsCurve.ellipse_arc(center, offset, 1, 0, sweep)
+
+
+def _polyline_curves(vertices, closed):
+    """Curves for polyline vertices, ((x, y), bulge) pairs: runs of straight
+    segments as one PolylineCurve, and an arc for each bulged segment."""
+    if closed:
+        vertices = vertices + [(vertices[0][0], 0.0)]
+    curves = []
+    run = [vertices[0][0]]
+    for (point, bulge), (next_point, _) in zip(vertices, vertices[1:]):
+        if bulge:
+            if len(run) > 1:
+                curves.append(PolylineCurve(run))
+            curves.append(_bulge_arc(point, next_point, bulge))
+            run = [next_point]
+        else:
+            run.append(next_point)
+    if len(run) > 1 or not curves:
+        curves.append(PolylineCurve(run))
+    return curves
+
+
+def _lwpolyline_vertices(codes, scale, mirror):
+    """((x, y), bulge) pairs of an LWPOLYLINE, whose vertices each start at
+    a 10 code and may be followed by a 42 bulge. mirror is -1 to mirror x."""
+    vertices = []
+    x = None
+    for code, value in codes:
+        if code == 10:
+            x = float(value)
+        elif code == 20 and x is not None:
+            vertices.append(((scale * mirror * x, scale * float(value)), 0.0))
+        elif code == 42 and vertices:
+            vertices[-1] = (vertices[-1][0], mirror * float(value))
+    return vertices
+
+
+def _curves(entities, scale):
+    """Curves for the LINE, ARC, CIRCLE, ELLIPSE, LWPOLYLINE, POLYLINE and
+    SPLINE entities, polyline bulges included. Annotations are skipped;
+    any other entity raises ValueError rather than leave a gap in the
+    outline."""
+    curves = []
+    polyline = None
+    for kind, codes in entities:
+        mirror = -1.0 if _mirrored(codes) else 1.0
+        if kind == "LINE":
+            curves.append(PolylineCurve([
+                (scale * _values(codes, 10)[0], scale * _values(codes, 20)[0]),
+                (scale * _values(codes, 11)[0], scale * _values(codes, 21)[0]),
+            ]))
+        elif kind in ("ARC", "CIRCLE"):
+            center = (scale * mirror * _value(codes, 10), scale * _value(codes, 20))
+            radius = scale * _value(codes, 40)
+            if kind == "CIRCLE":
+                start, sweep = 0.0, 2 * np.pi
+            else:
+                start = np.radians(_value(codes, 50))
+                sweep = (np.radians(_value(codes, 51)) - start) % (2 * np.pi) or 2 * np.pi
+                if mirror < 0:
+                    start, sweep = np.pi - start, -sweep
+            curves.append(NurbsCurve.ellipse_arc(center, (radius, 0), 1, start, sweep))
+        elif kind == "ELLIPSE":
+            start, end = _value(codes, 41), _value(codes, 42, 2 * np.pi)
+            curves.append(NurbsCurve.ellipse_arc(
+                (scale * _value(codes, 10), scale * _value(codes, 20)),
+                (scale * _value(codes, 11), scale * _value(codes, 21)),
+                _value(codes, 40, 1.0), start, (end - start) % (2 * np.pi) or 2 * np.pi
+            ))
+        elif kind == "LWPOLYLINE":
+            vertices = _lwpolyline_vertices(codes, scale, mirror)
+            curves.extend(_polyline_curves(vertices, int(dict(codes).get(70, 0)) & 1))
+        elif kind == "POLYLINE":
+            polyline = ([], int(dict(codes).get(70, 0)) & 1, mirror)
+        elif kind == "VERTEX" and polyline is not None:
+            polyline[0].append((
+                (scale * polyline[2] * _value(codes, 10), scale * _value(codes, 20)), polyline[2] * _value(codes, 42)
+            ))
+        elif kind == "SEQEND" and polyline is not None:
+            vertices, closed, _ = polyline
+            if vertices:
+                curves.extend(_polyline_curves(vertices, closed))
+            polyline = None
+        elif kind == "SPLINE":
+            control_points = [(scale * x, scale * y) for x, y in _points(codes)]
+            if control_points:
+                curves.append(NurbsCurve(
+                    int(dict(codes)[71]), _values(codes, 40), control_points, _values(codes, 41) or None
+                ))
+            else:
+                curves.append(PolylineCurve([(scale * x, scale * y) for x, y in _points(codes, 11)]))
+        elif kind not in ANNOTATION_ENTITIES:
+            raise ValueError("Unsupported DXF entity in outline: " + kind)
+    return curves
+
+
+def read_dxf_curves(file):
+    """Plane curves in cm from an ASCII DXF path or text file object."""
+    if isinstance(file, str):
+        with io.open(file, "r", errors="replace") as f:
+            header, entities = _entities(_group_pairs(f))
+    else:
+        header, entities = _entities(_group_pairs(file))
+    scale = DXF_UNITS.get(int(header.get("$INSUNITS", 0)), DEFAULT_DXF_SCALE)
+    return _curves(entities, scale)
+
+
+def read_dxf_profile(file, side_x, start=(0, 0)):
+    """OutlineProfile of the outline drawn in a DXF file, placed at side_x (cm)."""
+    return OutlineProfile.from_curves(read_dxf_curves(file), side_x, start)
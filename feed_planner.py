@@ -0,0 +1,114 @@
+import numpy as np
+
+
+class MotionPlan(object):
+    """Planned feeds and times for the moves between consecutive wire
+    positions. speeds are those of the controlling (further travelling) wire
+    end in mm/s: entry and exit speeds per move, and the peak each move
+    reaches under the acceleration limit. feeds are the G94 F words in
+    mm/min that make the controller run the combined 4-axis move at that
+    peak. The first position is where the cut starts, so there is one move
+    fewer than positions."""
+    def __init__(self, positions, feeds, times, lengths, entry_speeds, peak_speeds, exit_speeds, toolpath=None):
+        self.positions = positions
+        self.feeds = feeds
+        self.times = times
+        self.lengths = lengths
+        self.entry_speeds = entry_speeds
+        self.peak_speeds = peak_speeds
+        self.exit_speeds = exit_speeds
+        self.toolpath = toolpath
+
+    def __len__(self):
+        return len(self.feeds)
+
+    @property
+    def total_time(self):
+        """Estimated cut time in seconds."""
+        return float(self.times.sum())
+
+    @property
+    def controlling_side(self):
+        """0 where the XY (root) end leads a move, 1 where the ZA end does."""
+        return (self.lengths[:, 1] > self.lengths[:, 0]).astype(np.int8)
+
+    def __str__(self):
+        minutes, seconds = divmod(self.total_time, 60)
+        return "cut of " + str(len(self)) + " moves, " + str(int(minutes)) + " min " + \
+            str(round(seconds, 1)) + " s"
+
+
+def _junction_speeds(vectors, acceleration, junction_deviation):
+    """Largest speed through each junction between consecutive moves on
+    one wire end, by the junction deviation model of grbl style planners."""
+    lengths = np.linalg.norm(vectors, axis=1)
+    moving = lengths > 0
+    units = np.zeros_like(vectors)
+    units[moving] = vectors[moving] / lengths[moving, None]
+    cos_theta = -(units[:-1] * units[1:]).sum(axis=1)
+    sin_half = np.sqrt(np.clip(0.5 * (1 - cos_theta), 0, 1))
+    with np.errstate(divide="ignore"):
+        speeds = np.sqrt(acceleration * junction_deviation * sin_half / (1 - sin_half))
+    # an end that stands still on either side of a junction sets no limit
+    speeds[~(moving[:-1] & moving[1:])] = np.inf
+    return speeds
+
+
+def _reachable(limits, distances, acceleration):
+    """Largest speeds, no more than the limit at each point, that accelerating
+    from earlier points can reach; distances[j] leads up to point j. Since
+    v[j]^2 <= v[k]^2 + 2 a (s[j] - s[k]) for every earlier k, the bound is a
+    running minimum."""
+    travelled = 2 * acceleration * np.cumsum(distances)
+    return np.sqrt(travelled + np.minimum.accumulate(limits ** 2 - travelled))
+
+
+def plan_motion(positions, cut_rate, acceleration, junction_deviation=0.01, lengths=None, toolpath=None):
+    """Plan the moves through an (n, 4) array of (x, y, z, a) positions in
+    mm. The controlling wire end cuts at cut_rate (mm/min), speeding up and
+    slowing down at acceleration (mm/s^2), from and to a stop at the ends
+    and slowing for corners on either end. lengths may give the (n - 1, 2)
+    XY and ZA path lengths of each move where these are not straight, as
+    for arcs; corners are still judged from the chords."""
+    positions = np.asarray(positions, dtype=float).reshape(-1, 4)
+    if len(positions) < 2:
+        # nothing to move between, as for a path simplified or read down to a point
+        none = np.zeros(0)
+        return MotionPlan(positions, none, none, np.zeros((0, 2)), none, none, none, toolpath)
+    vectors = np.diff(positions, axis=0)
+    if lengths is None:
+        lengths = np.column_stack((
+            np.hypot(vectors[:, 0], vectors[:, 1]), np.hypot(vectors[:, 2], vectors[:, 3])
+        ))
+    controlling = lengths.max(axis=1)
+    cruise = cut_rate / 60.0
+
+    junctions = np.minimum.reduce((
+        np.full(len(vectors) - 1, cruise),
+        _junction_speeds(vectors[:, :2], acceleration, junction_deviation),
+        _junction_speeds(vectors[:, 2:], acceleration, junction_deviation),
+    ))
+    # from rest, through every junction, back to rest
+    limits = np.concatenate(([0.0], junctions, [0.0]))
+    forward = _reachable(limits, np.concatenate(([0.0], controlling)), acceleration)
+    backward = _reachable(limits[::-1], np.concatenate(([0.0], controlling[::-1])), acceleration)[::-1]
+    speeds = np.minimum(forward, backward)
+    entry, exits = speeds[:-1], speeds[1:]
+
+    # trapezoid, or triangle when the move is too short to reach cruise
+    peak = np.minimum(cruise, np.sqrt(acceleration * controlling + (entry ** 2 + exits ** 2) / 2))
+    ramps = (2 * peak ** 2 - entry ** 2 - exits ** 2) / (2 * acceleration)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cruising = np.where(peak > 0, np.maximum(controlling - ramps, 0) / peak, 0)
+        times = (2 * peak - entry - exits) / acceleration + cruising
+        combined = np.hypot(lengths[:, 0], lengths[:, 1])
+        feeds = np.where(controlling > 0, 60 * peak * combined / controlling, cut_rate)
+    return MotionPlan(positions, feeds, times, lengths, entry, peak, exits, toolpath)
+
+
+def plan_toolpath(toolpath, cut_rate, acceleration, junction_deviation=0.01):
+    """plan_motion over a toolpath.Toolpath, measuring arcs along the arc.
+    The plan's moves are the toolpath's moves after the first."""
+    return plan_motion(
+        toolpath.ends, cut_rate, acceleration, junction_deviation, toolpath.side_lengths()[1:], toolpath
+    )
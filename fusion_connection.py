@@ -1,5 +1,10 @@
 import adsk.core, adsk.fusion, adsk.cam, traceback
 from .geometry import Point, Plane
+from .spatial_index import EndpointIndex
+from .curve_sampling import SAMPLE_TOLERANCE, sample_evaluator, samples_at_fractions
+from .proxy_cache import proxy_cache, cached_property
+from .content_cache import content_cache, content_hash
+import numpy as np
 
 class Fusion(object):
     def __init__(self):
@@ -30,16 +35,17 @@ fusion = Fusion()
 class FusionDocument(object):
     def __init__(self, doc):
         self._document = doc
+        self._cached = {}
         
-    @property
+    @cached_property("root_component")
     def root_component(self):
         return self._document.design.rootComponent
 
-    @property
+    @cached_property("active_component")
     def active_component(self):
         return self._document.design.activeComponent
 
-    @property
+    @cached_property("sketches")
     def sketches(self):
         sketches = {}
         for sketch in self.root_component.sketches:
@@ -53,12 +59,13 @@ class FusionDocument(object):
 class FusionComponent(object):
     def __init__(self, component):
         self._component = component
+        self._cached = {}
 
     @property
     def component(self):
         return self._component
 
-    @property
+    @cached_property("sketches")
     def sketches(self):
         sketches = {}
         for sketch in self._component.sketches:
@@ -69,11 +76,46 @@ class FusionComponent(object):
     def active_component():
         return FusionComponent(FusionDocument.active_document().active_component)
 
+    @property
+    def revision_id(self):
+        return self._component.revisionId
+
+    def sync_cache(self):
+        """Drop cached lookups if the component changed since the last sync,
+        as when it was edited in the UI."""
+        proxy_cache.sync(self.revision_id)
+
     def create_sketch(self, name, plane):
+        proxy_cache.invalidate()
         sketch = self._component.sketches.add(plane)
         sketch.name = name
         return sketch
 
+    def create_offset_plane(self, offset, plane=None):
+        """Construction plane offset (cm) from plane, the XY plane by default."""
+        proxy_cache.invalidate()
+        planeinput = self._component.constructionPlanes.createInput()
+        planeinput.setByOffset(plane or self.xy_plane, adsk.core.ValueInput.createByReal(offset))
+        return self._component.constructionPlanes.add(planeinput)
+
+    @property
+    def timeline(self):
+        """The design's timeline, or None in a direct design, which has none."""
+        design = self._component.parentDesign
+        if design.designType != adsk.fusion.DesignTypes.ParametricDesignType:
+            return None
+        return design.timeline
+
+    def group_timeline(self, start, name):
+        """Group the timeline from start to its marker, so the features made
+        since undo, roll back and show as one item. None if there are none."""
+        timeline = self.timeline
+        if timeline is None or timeline.markerPosition <= start:
+            return None
+        group = timeline.timelineGroups.add(start, timeline.markerPosition - 1)
+        group.name = name
+        return group
+
     @property
     def xy_plane(self):
         return self._component.xYConstructionPlane
@@ -99,7 +141,7 @@ class FusionPlane(object):
 class FusionSketch(object):
     def __init__(self, sketch):
         self._sketch = sketch
-        self._profiles = []
+        self._cached = {}
 
     def create_point(self, location):
         if isinstance(location, list):
@@ -110,16 +152,19 @@ class FusionSketch(object):
             raise TypeError("Expected a Point or list[Point]")
     
     def create_sketch_point(self, fusion_point):
+        proxy_cache.invalidate()
         return self._sketch.sketchPoints.add(fusion_point.point)
 
     def create_spline(self, locations):
         point_collection = fusion.object_collection_from_list(self.create_point(locations))
+        proxy_cache.invalidate()
         return self._sketch.sketchCurves.sketchFittedSplines.add(point_collection)
 
     def create_line(self, start, end):
         if isinstance(start, Point) and isinstance(end, Point):
             return self.create_line(self.create_point(start), self.create_point(end))
         elif isinstance(start, adsk.fusion.SketchPoint) and isinstance(end, adsk.fusion.SketchPoint):
+            proxy_cache.invalidate()
             return self._sketch.sketchCurves.sketchLines.addByTwoPoints(start, end)
         else:
             raise TypeError("Expected two geometry.Point objects or two adsk.core.Point3D objects")
@@ -129,9 +174,11 @@ class FusionSketch(object):
             for it in item:
                 self.delete_item(it)
         else:
+            proxy_cache.invalidate()
             item.deleteMe()
 
     def clear(self):
+        proxy_cache.invalidate()
         while self._sketch.sketchCurves.count > 0:
             self._sketch.sketchCurves.item(0).deleteMe()
 
@@ -139,17 +186,18 @@ class FusionSketch(object):
         if isinstance(items, list):
             return [self.project(item) for item in items]
         else:
+            proxy_cache.invalidate()
             return self._sketch.project(items)
 
-    @property
+    @cached_property("plane")
     def plane(self):
         return self._sketch.referencePlane
 
-    @property
+    @cached_property("curves")
     def curves(self):
         return [curve for curve in self._sketch.sketchCurves]
 
-    @property
+    @cached_property("sketch_curves")
     def sketch_curves(self):
         return [FusionSketchCurve(curve) for curve in self.curves]
 
@@ -157,32 +205,50 @@ class FusionSketch(object):
     def output_sketch_curves(self):
         return [curve for curve in self.sketch_curves if not curve.is_construction]
 
-    @property
+    @cached_property("profiles")
     def profiles(self):
-        if not self._profiles:
-            self._profiles = [FusionProfile(profile) for profile in self._sketch.profiles]
-        return self._profiles
+        return [FusionProfile(profile) for profile in self._sketch.profiles]
+
+    @cached_property("transform")
+    def transform(self):
+        """4 x 4 sketch to model space matrix, read once."""
+        return np.array(self._sketch.transform.asArray(), dtype=float).reshape(4, 4)
+
+    @cached_property("inverse_transform")
+    def inverse_transform(self):
+        return np.linalg.inv(self.transform)
+
+    @staticmethod
+    def _apply(matrix, positions):
+        positions = np.asarray(positions, dtype=float).reshape(-1, 3)
+        return positions @ matrix[:3, :3].T + matrix[:3, 3]
+
+    def model_to_sketch_positions(self, positions):
+        """(n, 3) sketch space positions of model space positions, in one multiply."""
+        return self._apply(self.inverse_transform, positions)
+
+    def sketch_to_model_positions(self, positions):
+        """(n, 3) model space positions of sketch space positions, in one multiply."""
+        return self._apply(self.transform, positions)
 
     def model_to_sketch_space(self, point):
-        return FusionPoint(self._sketch.modelToSketchSpace(point.point))
+        return FusionPoint.from_position(Point(*self.model_to_sketch_positions(point.position)[0].tolist()))
 
     def sketch_to_model_space(self, point):
-        return FusionPoint(self._sketch.sketchToModelSpace(point.point))
+        return FusionPoint.from_position(Point(*self.sketch_to_model_positions(point.position)[0].tolist()))
 
-    @property
+    @cached_property("origin")
     def origin(self): 
         return FusionPoint(self._sketch.origin)
 
 class FusionProfile(object):
     def __init__(self, profile):
         self._profile = profile
-        self._loops = []
+        self._cached = {}
 
-    @property
+    @cached_property("loops")
     def loops(self):
-        if not self._loops:
-            self._loops = [FusionLoop(loop) for loop in self._profile.profileLoops]
-        return self._loops
+        return [FusionLoop(loop) for loop in self._profile.profileLoops]
 
     @property
     def outer_loop(self):
@@ -194,38 +260,31 @@ class FusionProfile(object):
 class FusionLoop(object):
     def __init__(self, loop):
         self._loop = loop
-        self._sketch_curves = []
+        self._cached = {}
 
-    @property
+    @cached_property("loop_curves")
     def sketch_curves(self):
-        if not self._sketch_curves:
-            self._sketch_curves = [FusionSketchCurve(curve.sketchEntity) for curve in self._loop.profileCurves]
-        return self._sketch_curves
+        return [FusionSketchCurve(curve.sketchEntity) for curve in self._loop.profileCurves]
 
-    @property
+    @cached_property("is_outer")
     def is_outer(self):
         return self._loop.isOuter
 
     @staticmethod
     def reorder_from_point(target_start_point, curve_list):
         new_start_curve_id = FusionLoop.closest_curve_id(target_start_point, curve_list)
-        new_curve_list = []
-        for i in range(new_start_curve_id, len(curve_list)):
-            new_curve_list.append(curve_list[i])
-        for i in range(0, new_start_curve_id):
-            new_curve_list.append(curve_list[i])
-        return new_curve_list
+        return curve_list[new_start_curve_id:] + curve_list[:new_start_curve_id]
 
     @staticmethod
     def closest_curve_id(target_point, curve_list):
-        output_curve_id = 0
-        min_distance = Point.distance(curve_list[0].start_point.position, target_point.position)
-        for i, curve in enumerate(curve_list[1:], 1):
-            check_dist = Point.distance(curve.start_point.position, target_point.position)
-            if check_dist < min_distance:
-                min_distance = check_dist
-                output_curve_id = i
-        return output_curve_id
+        return EndpointIndex.from_curves(curve_list).nearest_start(target_point.position)[0]
+
+    @staticmethod
+    def chain_curves(curve_list, tolerance=1e-6, first=0):
+        """Connected chains of (curve, reversed) from unordered curves, joining
+        endpoints within tolerance (cm); see EndpointIndex.chain."""
+        chains = EndpointIndex.from_curves(curve_list).chain(tolerance, first)
+        return [[(curve_list[i], reverse) for i, reverse in chain] for chain in chains]
 
     @staticmethod
     def compare_curve_lists(list1, list2):
@@ -237,67 +296,124 @@ class FusionLoop(object):
 class FusionSketchCurve(object):
     def __init__(self, curve):
         self._curve = curve
-        self._parametric_range=[]
+        self._cached = {}
 
-    @property
+    @cached_property("length")
     def length(self):
         return self._curve.length
 
-    @property
+    @cached_property("curve_type")
     def curve_type(self):
         return self._curve.objectType
 
-    @property
+    @cached_property("is_construction")
     def is_construction(self):
         return self._curve.isConstruction
 
+    @property
+    def is_line(self):
+        return self.curve_type == "adsk::fusion::SketchLine"
+
     def __str__(self):
         return "curve, length = " + str(self.length) + ", type = " + self.curve_type
 
-    @property
+    @cached_property("start_point")
     def start_point(self):
         return FusionPoint(self._curve.startSketchPoint.geometry)
     
-    @property
+    @cached_property("end_point")
     def end_point(self):
         return FusionPoint(self._curve.endSketchPoint.geometry)
     
     @property
     def gcode_points(self):
-        if self.curve_type == "adsk::fusion::SketchLine":
-            return [self.start_point, self.end_point]
-        else:
-            return self.parametric_points(50)
+        return self.points_at_fractions(self.sample_fractions())
+
+    @cached_property("evaluator")
+    def evaluator(self):
+        return self._curve.geometry.evaluator
+
+    @cached_property("definition")
+    def definition(self):
+        """What defines the curve's shape between its ends: a fitted spline's
+        fit points, or the data of any other non-line geometry, such as a
+        NURBS curve's control points, degree, knots and weights."""
+        if self.is_line:
+            return ()
+        if self.curve_type == "adsk::fusion::SketchFittedSpline":
+            return np.array([point.geometry.asArray() for point in self._curve.fitPoints], dtype=float)
+
+        def _plain(value):
+            if hasattr(value, "asArray"):
+                return np.array(value.asArray(), dtype=float)
+            if isinstance(value, (list, tuple)):
+                return tuple(_plain(item) for item in value)
+            return value
+        return _plain(tuple(self._curve.geometry.getData()))
+
+    @cached_property("content_hash")
+    def content_hash(self):
+        """Digest of the curve's type, ends, parameter range, length and
+        definition, which any edit to its shape changes; sampled points are
+        cached under it."""
+        return content_hash(
+            self.curve_type, self.start_point.position, self.end_point.position, self.parametric_range, self.length,
+            self.definition
+        )
+
+    def samples(self, tolerance=SAMPLE_TOLERANCE):
+        """Dense curve_sampling.CurveSamples for tolerance (cm), cached for
+        as long as the curve's content is unchanged."""
+        return proxy_cache.lookup(self, ("samples", tolerance), lambda: content_cache.lookup(
+            ("samples", self.content_hash, tolerance), lambda: sample_evaluator(self.evaluator, tolerance)
+        ))
+
+    def sample_fractions(self, tolerance=SAMPLE_TOLERANCE):
+        """Length fractions of the fewest points a polyline needs to stay
+        within tolerance (cm) of the curve; just the ends for a line."""
+        if self.is_line:
+            return np.array([0.0, 1.0])
+        return self.samples(tolerance).simplified(tolerance).fractions
+
+    def points_at_fractions(self, fractions, tolerance=SAMPLE_TOLERANCE):
+        if self.is_line:
+            start, end = self.start_point, self.end_point
+            if len(fractions) == 2:
+                return [start, end]
+            return [
+                FusionPoint.from_position(start.position + (end.position - start.position) * f)
+                for f in fractions
+            ]
+        samples = samples_at_fractions(self.evaluator, self.samples(tolerance), fractions)
+        return [FusionPoint(point) for point in samples.points]
+
+    def positions_at_fractions(self, fractions, tolerance=SAMPLE_TOLERANCE):
+        """(n, 3) sketch space positions at length fractions, without point objects."""
+        fractions = np.asarray(fractions, dtype=float)
+        if self.is_line:
+            start, end = np.array(self.start_point.position), np.array(self.end_point.position)
+            return start + np.outer(fractions, end - start)
+        return content_cache.lookup(
+            ("positions", self.content_hash, tolerance, content_hash(fractions)),
+            lambda: samples_at_fractions(self.evaluator, self.samples(tolerance), fractions).positions
+        )
 
     def parametric_points(self, npoints):
-        points = []
-        #returnValue, startPoint, endPoint = self._curve.getEndPoints()
-        
-        start_param = self.parametric_range[0]
-
-        for i in range(0, npoints):
-            new_param = self._curve.geometry.evaluator.getParameterAtLength(start_param, i * self.length / (npoints - 1))[1]
-            new_point = self.parametric_point(new_param)
-            points.append(new_point)
-        return points
+        return self.points_at_fractions(np.linspace(0, 1, npoints))
 
     def parametric_point(self, param):
-        print(param)
-        new_point3d = self._curve.geometry.evaluator.getPointAtParameter(param)
+        new_point3d = self.evaluator.getPointAtParameter(param)
         if new_point3d[0]:
             return FusionPoint(new_point3d[1])
         else:
             return None
 
-    @property
+    @cached_property("parametric_range")
     def parametric_range(self):
-        if not self._parametric_range:
-            param_range = self._curve.geometry.evaluator.getParameterExtents()
-            if not param_range[0]:
-                self._parametric_range = [0, 0]
-            else:
-                self._parametric_range = param_range[1:]
-        return self._parametric_range
+        param_range = self.evaluator.getParameterExtents()
+        if not param_range[0]:
+            return [0, 0]
+        return list(param_range[1:])
 
 
 
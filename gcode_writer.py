@@ -0,0 +1,96 @@
+import io
+import numpy as np
+
+GCODE_HEADER = (
+    "G21\n"  # millimeters
+    "G94\n"  # per minute
+    "G90\n"  # absolute movements
+)
+
+
+class GCodeWriter(object):
+    """Streams 4-axis hot wire moves to a path, a text or binary file-like
+    object, or a socket. Moves come as an array of (x, y, z, a) rows, or
+    (x, y, z, a, feed) rows for per-move feeds, formatted chunk_size rows at
+    a time with a single % operation at a fixed precision. Output collects
+    in a buffer of about buffer_size characters, so the text held in memory
+    stays bounded however long the cut file is."""
+    def __init__(self, output, precision=3, feed=200, buffer_size=1 << 20, chunk_size=4096):
+        self.precision = precision
+        self.feed = feed
+        self.buffer_size = buffer_size
+        self.chunk_size = chunk_size
+        self._owned = isinstance(output, str)
+        self._output = io.open(output, "w", newline="\n") if self._owned else output
+        if hasattr(self._output, "sendall"):
+            self._send = lambda text: self._output.sendall(text.encode("ascii"))
+        elif isinstance(self._output, io.TextIOBase):
+            self._send = self._output.write
+        else:
+            self._send = lambda text: self._output.write(text.encode("ascii"))
+        self._buffer = []
+        self._buffered = 0
+        self.lines_written = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def _number(self):
+        return "%." + str(self.precision) + "f"
+
+    def write(self, text):
+        self._buffer.append(text)
+        self._buffered += len(text)
+        self.lines_written += text.count("\n")
+        if self._buffered >= self.buffer_size:
+            self.flush()
+
+    def write_header(self):
+        self.write(GCODE_HEADER)
+
+    def write_move_array(self, moves, feed=None):
+        """Write one G01 per row of an (n, 4) or (n, 5) array in one format call."""
+        feed = self.feed if feed is None else feed
+        number = self._number()
+        if moves.shape[1] == 5:
+            line = "G01 F%g X" + number + " Y" + number + " Z" + number + " A" + number + "\n"
+            moves = moves[:, [4, 0, 1, 2, 3]]
+        else:
+            line = "G01 F" + str(feed) + " X" + number + " Y" + number + " Z" + number + " A" + number + "\n"
+        for first in range(0, len(moves), self.chunk_size):
+            chunk = moves[first:first + self.chunk_size]
+            self.write((line * len(chunk)) % tuple(chunk.ravel().tolist()))
+
+    def write_toolpath(self, toolpath, feed=None):
+        """Write a toolpath.Toolpath, with I/J arc centre offsets from each
+        arc's start point. feed may be one feed or one per move."""
+        feed = self.feed if feed is None else feed
+        feeds = np.broadcast_to(np.asarray(feed, dtype=float), toolpath.kinds.shape).tolist()
+        number = self._number()
+        axes = " X" + number + " Y" + number + " Z" + number + " A" + number
+        line = "G01 F%g" + axes + "\n"
+        arc = "G0%d F%g" + axes + " I" + number + " J" + number + "\n"
+        starts = np.vstack((toolpath.ends[:1], toolpath.ends[:-1]))
+        # rounded first so that a centre a hair off an axis does not print as -0.000
+        offsets = np.round(toolpath.centres - starts[:, :2], self.precision) + 0.0
+        for kind, move_feed, end, offset in zip(toolpath.kinds.tolist(), feeds, toolpath.ends.tolist(), offsets.tolist()):
+            if kind == 1:
+                self.write(line % ((move_feed,) + tuple(end)))
+            else:
+                self.write(arc % ((kind, move_feed) + tuple(end) + tuple(offset)))
+
+    def flush(self):
+        if self._buffer:
+            self._send("".join(self._buffer))
+            self._buffer = []
+            self._buffered = 0
+        if hasattr(self._output, "flush"):
+            self._output.flush()
+
+    def close(self):
+        self.flush()
+        if self._owned:
+            self._output.close()
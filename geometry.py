@@ -1,121 +1,106 @@
 import math
 from numbers import Number
+from operator import itemgetter
+import numpy as np
 
-class Point(object):
-    def __init__(self, x, y, z=0):
-        self._x = x
-        self._y = y
-        self._z = z
-    
-    @property
-    def x(self):
-        return self._x
-    
-    @x.setter
-    def x(self, value):
-        self.x = value
+POINT_DECIMALS = 9
 
-    @property 
-    def y(self):
-        return self._y
+class Point(tuple):
+    """Immutable 3D point. A tuple subclass without an instance dict, so
+    components are read by index and arithmetic needs no temporaries.
+    Points compare equal, and hash alike, when their coordinates round to
+    the same POINT_DECIMALS decimal places."""
+    __slots__ = ()
+    # numpy scalars on the left of an operator defer to Point's methods
+    __array_ufunc__ = None
 
-    @y.setter
-    def y(self, value):
-        self.y = value
+    def __new__(cls, x, y, z=0):
+        return tuple.__new__(cls, (x, y, z))
 
-    @property
-    def z(self):
-        return self._z
+    def __getnewargs__(self):
+        return tuple(self)
 
-    @z.setter
-    def z(self, value):
-        self.z = value
+    x = property(itemgetter(0))
+    y = property(itemgetter(1))
+    z = property(itemgetter(2))
 
     @property
     def array(self):
-        return [self._x, self._y, self._z]
+        return [self[0], self[1], self[2]]
 
     def __mul__(self, other):
         if isinstance(other, Point):
-            return Point(x=other.x * self._x, y=other.y * self._y, z=other.z * self._z)
+            return Point(other[0] * self[0], other[1] * self[1], other[2] * self[2])
         elif isinstance(other, Number):
-            return Point(x=other * self._x, y=other * self._y, z=other * self._z)
+            return Point(other * self[0], other * self[1], other * self[2])
         else:
-            raise NotImplemented
+            return NotImplemented
 
-    def __rmul__(self, other):
-        if isinstance(other, Point) or isinstance(other, Number):
-            return self.__mul__(other)
-        else:
-            raise NotImplemented
+    __rmul__ = __mul__
+
+    def _key(self):
+        return (round(self[0], POINT_DECIMALS), round(self[1], POINT_DECIMALS), round(self[2], POINT_DECIMALS))
 
     def __eq__(self, other):
-        return self._x == other.x and self._y == other._y
+        if not isinstance(other, Point):
+            return NotImplemented
+        return self._key() == other._key()
+
+    def __ne__(self, other):
+        if not isinstance(other, Point):
+            return NotImplemented
+        return self._key() != other._key()
+
+    def __hash__(self):
+        return hash(self._key())
 
     def __add__(self, other):
         if isinstance(other, Point):
-            return Point(
-                x=self.x + other.x,
-                y=self.y + other.y,
-                z=self.z + other.z
-            )
+            return Point(self[0] + other[0], self[1] + other[1], self[2] + other[2])
         elif isinstance(other, Number):
-            return Point(
-                x=self.x + other,
-                y=self.y + other,
-                z=self.z + other
-            )
+            return Point(self[0] + other, self[1] + other, self[2] + other)
         else:
             return NotImplemented
 
     def __str__(self):
         return str(self.array)
 
+    def __repr__(self):
+        return "Point(" + repr(self[0]) + ", " + repr(self[1]) + ", " + repr(self[2]) + ")"
+
     @staticmethod
     def distance(point1, point2):
-        return math.sqrt((point1.x - point2.x) ** 2 + (point1.y - point2.y) ** 2 + (point1.z - point2.z) ** 2)
+        return math.dist(point1, point2)
 
     def __abs__(self):
-        return math.sqrt(self.x ** 2 + self.y ** 2 + self.z ** 2)
-    
+        return math.hypot(self[0], self[1], self[2])
+
     def __neg__(self):
-        return Point(-self._x, -self._y, -self._z)
+        return Point(-self[0], -self[1], -self[2])
 
     @staticmethod
     def dot_product(p1, p2):
-        return sum([a * b for a, b in zip(p1.array, p2.array)])
-    
+        return p1[0] * p2[0] + p1[1] * p2[1] + p1[2] * p2[2]
+
     def __sub__(self, other):
         if isinstance(other, Point):
-            return Point(
-                x=self.x - other.x,
-                y=self.y - other.y,
-                z=self.z - other.z
-            )
+            return Point(self[0] - other[0], self[1] - other[1], self[2] - other[2])
         elif isinstance(other, Number):
-            return Point(
-                x=self.x - other,
-                y=self.y - other,
-                z=self.z - other
-            )
+            return Point(self[0] - other, self[1] - other, self[2] - other)
         else:
             return NotImplemented
 
     @staticmethod
     def cross_product(p1, p2):
         return Point(
-            x=p1.y * p2.z - p1.z * p2.y,
-            y=p1.z * p2.x - p1.x * p2.z,
-            z=p1.x * p2.y - p1.y * p2.x
+            p1[1] * p2[2] - p1[2] * p2[1],
+            p1[2] * p2[0] - p1[0] * p2[2],
+            p1[0] * p2[1] - p1[1] * p2[0]
         )
-    
+
     def set_length(self, value):
-        magnitude = self.__abs__()
-        return Point(
-            x=value * self._x / magnitude,
-            y=value * self._y / magnitude,
-            z=value * self._z / magnitude
-        )
+        factor = value / math.hypot(self[0], self[1], self[2])
+        return Point(factor * self[0], factor * self[1], factor * self[2])
 
     @property
     def unit(self):
@@ -147,8 +132,15 @@ class Line(object):
     def length(self):
         return Point.distance(self._end, self._start)  
     
+    def plane_parameter(self, plane):
+        """Position of the plane intersection along the line, 0 at start and 1 at end."""
+        s, e, o, n = self._start, self._end, plane.origin, plane.direction
+        return ((o[0] - s[0]) * n[0] + (o[1] - s[1]) * n[1] + (o[2] - s[2]) * n[2]) / \
+            ((e[0] - s[0]) * n[0] + (e[1] - s[1]) * n[1] + (e[2] - s[2]) * n[2])
+
     def distance_to_plane(self, plane):
-        return Point.dot_product(plane.origin - self.start, plane.direction.unit) / Point.dot_product(self.direction.unit, plane.direction.unit)
+        """Distance along the line from its start to the plane."""
+        return self.plane_parameter(plane) * self.length
 
 
 class Plane(object):
@@ -164,6 +156,152 @@ class Plane(object):
     def direction(self):
         return self._direction
     
-    def line_intersect(self, line) -> Point:
-        return line.start + line.distance_to_plane(self) * line.direction.unit
+    def line_intersect(self, line):
+        """Intersection with a Line as a Point, or with every line of a
+        LineArray as a PointArray."""
+        if isinstance(line, LineArray):
+            return line.start + line.direction * line.plane_parameter(self)
+        t = line.plane_parameter(self)
+        s, e = line.start, line.end
+        return Point(s[0] + t * (e[0] - s[0]), s[1] + t * (e[1] - s[1]), s[2] + t * (e[2] - s[2]))
+
+
+class PointArray(object):
+    """N x 3 array of points, the batched counterpart of Point. Arithmetic
+    works row-wise with another PointArray, or broadcasts a Point, a
+    number or an N element array."""
+    # make numpy arrays defer to the reflected operators below
+    __array_ufunc__ = None
+
+    def __init__(self, array):
+        self._array = np.asarray(array, dtype=float).reshape(-1, 3)
+
+    @staticmethod
+    def from_points(points):
+        return PointArray(list(points))
+
+    @staticmethod
+    def _operand(other):
+        if isinstance(other, PointArray):
+            return other._array
+        elif isinstance(other, Point):
+            return np.array(other, dtype=float)
+        elif isinstance(other, np.ndarray) and other.ndim == 1:
+            return other[:, None]
+        return other
+
+    @property
+    def array(self):
+        return self._array
+
+    @property
+    def x(self):
+        return self._array[:, 0]
+
+    @property
+    def y(self):
+        return self._array[:, 1]
+
+    @property
+    def z(self):
+        return self._array[:, 2]
+
+    def __len__(self):
+        return len(self._array)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return PointArray(self._array[index])
+        x, y, z = self._array[index].tolist()
+        return Point(x, y, z)
+
+    def __iter__(self):
+        for x, y, z in self._array.tolist():
+            yield Point(x, y, z)
+
+    def __add__(self, other):
+        return PointArray(self._array + PointArray._operand(other))
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        return PointArray(self._array - PointArray._operand(other))
+
+    def __rsub__(self, other):
+        return PointArray(PointArray._operand(other) - self._array)
+
+    def __mul__(self, other):
+        return PointArray(self._array * PointArray._operand(other))
+
+    __rmul__ = __mul__
+
+    def __neg__(self):
+        return PointArray(-self._array)
+
+    def __abs__(self):
+        return np.sqrt(np.einsum('ij,ij->i', self._array, self._array))
+
+    def __str__(self):
+        return str(self._array)
+
+    @staticmethod
+    def distance(points1, points2):
+        return abs(points1 - points2)
+
+    @staticmethod
+    def dot_product(p1, p2):
+        """Row-wise dot products; either side may be a single Point."""
+        a = PointArray._operand(p1)
+        b = PointArray._operand(p2)
+        return (a * b).sum(axis=-1)
+
+    @staticmethod
+    def cross_product(p1, p2):
+        return PointArray(np.cross(PointArray._operand(p1), PointArray._operand(p2)))
+
+    def set_length(self, value):
+        return PointArray(self._array * (value / abs(self))[:, None])
+
+    @property
+    def unit(self):
+        return self.set_length(1)
+
+
+class LineArray(object):
+    """N lines between corresponding rows of two PointArrays."""
+    def __init__(self, start, end):
+        self._start = start
+        self._end = end
+
+    @property
+    def start(self):
+        return self._start
+
+    @property
+    def end(self):
+        return self._end
+
+    def __len__(self):
+        return len(self._start)
+
+    def __getitem__(self, index):
+        return Line(self._start[index], self._end[index])
+
+    @property
+    def direction(self):
+        return self._end - self._start
+
+    @property
+    def length(self):
+        return PointArray.distance(self._end, self._start)
+
+    def plane_parameter(self, plane):
+        """Position of each plane intersection along its line, 0 at start and 1 at end."""
+        normal = np.array(plane.direction, dtype=float)
+        to_plane = np.array(plane.origin, dtype=float) - self._start.array
+        return (to_plane @ normal) / (self.direction.array @ normal)
+
+    def distance_to_plane(self, plane):
+        """Distance along each line from its start to the plane."""
+        return self.plane_parameter(plane) * self.length
 
@@ -1,41 +1,38 @@
 from .fusion_connection import fusion, FusionSketch, FusionLoop, FusionPoint
-from .geometry import Point, Plane, Line
-import io
+from .geometry import Point
+from .curve_sampling import SAMPLE_TOLERANCE
+from .content_cache import content_cache, content_hash
+from .wire_cut import HOTWIRE_PARAMS, xy_plane, za_plane, WireCut, GCode_Point
+import numpy as np
 
-HOTWIRE_PARAMS = {
-    "machine_span": 115.3, # cm
-    "cut_rate": 200, # mm/min
-}
 
-xy_plane = Plane(Point(0, 0, 0), Point(1, 0, 0))
-za_plane = Plane(Point(HOTWIRE_PARAMS["machine_span"], 0, 0), Point(1, 0, 0))
-
-
-class HotWireGcode(object):
+class HotWireGcode(WireCut):
     def __init__(self, component):
         self._base_component = component
-        self._edge_profile_1 = FoamEdgeProfile(FusionSketch(self._base_component.sketches["side_1"]))
-        self._edge_profile_2 = FoamEdgeProfile(FusionSketch(self._base_component.sketches["side_2"]))
-        self._gcode_points = []
-
-    def check_profiles(self):
-        return FusionLoop.compare_curve_lists(self._edge_profile_1.sorted_curves, self._edge_profile_2.sorted_curves)
+        self._base_component.sync_cache()
+        WireCut.__init__(
+            self,
+            FoamEdgeProfile(FusionSketch(self._base_component.sketches["side_1"])),
+            FoamEdgeProfile(FusionSketch(self._base_component.sketches["side_2"]))
+        )
 
     @property
     def gcode_points(self):
+        """As WireCut's, reused while neither profile's content nor the
+        machine parameters have changed. Otherwise only the changed curves
+        are resampled, as the curves cache their points by content."""
         if not self._gcode_points:
-            for point1, point2 in zip(self._edge_profile_1.edge_points, self._edge_profile_2.edge_points):
-                self._gcode_points.append(GCode_Point(point1, point2))
-        return self._gcode_points        
+            key = (
+                "gcode_points",
+                self._edge_profile_1.content_hash,
+                self._edge_profile_2.content_hash,
+                content_hash(sorted(HOTWIRE_PARAMS.items())),
+            )
+            self._gcode_points = content_cache.lookup(key, lambda: WireCut.gcode_points.fget(self))
+        return self._gcode_points
 
-    def create_gcode_file(self, file, sym = False):
-        with io.open(file, 'w') as outf:
-            outf.write('G21\n') # millimeters
-            outf.write('G94\n') # per minute
-            outf.write('G90\n') # absolute movements
-            for line in self.gcode_points:
-                line.sym = sym
-                outf.write(str(line) + '\n') 
+    def check_profiles(self):
+        return FusionLoop.compare_curve_lists(self._edge_profile_1.sorted_curves, self._edge_profile_2.sorted_curves)
 
     def create_sketches(self):
         sket1a = FusionSketch(self._base_component.create_sketch(
@@ -47,52 +44,12 @@ class HotWireGcode(object):
             self._edge_profile_2.base_sketch.plane
             ))
     
-        sketchpoints1 = []
-        sketchpoints2 = []
-
-        for gcode_point in self.gcode_points:
-            sketchpoints1.append(
-                sket1a.create_sketch_point(
-                    sket1a.model_to_sketch_space(
-                        FusionPoint.from_position(gcode_point.wire_line.start))
-                    )
-                )
-            sketchpoints2.append(
-                sket2a.create_sketch_point(
-                    sket2a.model_to_sketch_space(
-                        FusionPoint.from_position(gcode_point.wire_line.end)
-                    )))
-            
-
-
-class GCode_Point(object):
-    def __init__(self, point1, point2):
-        self._line = Line(point1, point2)
-        self._wire_line = None
-        self.sym = False
-
-    @property
-    def wire_line(self):
-        if not self._wire_line:
-            self._wire_line = Line(
-                xy_plane.line_intersect(self._line),
-                za_plane.line_intersect(self._line)
-            )
-        return self._wire_line
-
-    def __str__(self):
-        if self.sym:
-            return "G01 F" + str(HOTWIRE_PARAMS["cut_rate"]) + \
-                    " X" + str(10*self.wire_line.end.y) + \
-                    " Y" + str(10*self.wire_line.end.z) + \
-                    " Z" + str(10*self.wire_line.start.y) + \
-                    " A" + str(10*self.wire_line.start.z)
-        else:            
-            return "G01 F" + str(HOTWIRE_PARAMS["cut_rate"]) + \
-                    " X" + str(10*self.wire_line.start.y) + \
-                    " Y" + str(10*self.wire_line.start.z) + \
-                    " Z" + str(10*self.wire_line.end.y) + \
-                    " A" + str(10*self.wire_line.end.z)
+        # each sketch's points go to sketch space in one multiply
+        starts = sket1a.model_to_sketch_positions([gcode_point.wire_line.start for gcode_point in self.gcode_points])
+        ends = sket2a.model_to_sketch_positions([gcode_point.wire_line.end for gcode_point in self.gcode_points])
+        sketchpoints1 = [sket1a.create_sketch_point(FusionPoint.from_position(Point(*p))) for p in starts.tolist()]
+        sketchpoints2 = [sket2a.create_sketch_point(FusionPoint.from_position(Point(*p))) for p in ends.tolist()]
+        return sketchpoints1, sketchpoints2
 
 
 class FoamEdgeProfile(object):
@@ -100,6 +57,7 @@ class FoamEdgeProfile(object):
         self._base_sketch = sketch
         self._sorted_curves = []
         self._edge_points = []
+        self._content_hash = None
 
     @property
     def base_sketch(self):
@@ -120,13 +78,36 @@ class FoamEdgeProfile(object):
                 )
         return self._sorted_curves  # TODO potentially reorder curves too
 
+    @property
+    def content_hash(self):
+        """Digest of the sketch's placement and its sorted curves' contents."""
+        if self._content_hash is None:
+            self._content_hash = content_hash(
+                self._base_sketch.transform, [curve.content_hash for curve in self.sorted_curves]
+            )
+        return self._content_hash
+
     def __eq__(self, other):
         return FusionLoop.compare_curve_lists(self.sorted_curves, other.sorted_curves)
     
+    def curve_fractions(self, tolerance):
+        return [curve.sample_fractions(tolerance) for curve in self.sorted_curves]
+
+    def edge_points_at(self, curve_fractions, tolerance):
+        """Model space edge points with each sorted curve sampled at its fractions."""
+        positions = [
+            curve.positions_at_fractions(fractions, tolerance)
+            for curve, fractions in zip(self.sorted_curves, curve_fractions)
+        ]
+        if not positions:
+            return []
+        model = self._base_sketch.sketch_to_model_positions(np.concatenate(positions))
+        return [Point(*position) for position in model.tolist()]
+
     @property
     def edge_points(self):
         if not self._edge_points:
-            for curve in self.sorted_curves:
-                for point in curve.gcode_points:
-                    self._edge_points.append(self._base_sketch.sketch_to_model_space(point).position)
+            self._edge_points = self.edge_points_at(
+                [curve.sample_fractions() for curve in self.sorted_curves], SAMPLE_TOLERANCE
+            )
         return self._edge_points
@@ -0,0 +1,168 @@
+import numpy as np
+
+MITER = 0
+BEVEL = 1
+ROUND = 2
+
+MIN_LOOP_WINDOW = 64
+MAX_LOOP_WINDOW = 1024
+
+
+def _segment_normals(points):
+    """Unit left normals of each segment. Zero length segments, as where two
+    curves meet, take the direction of the segment before them."""
+    d = np.diff(points, axis=0)
+    length = np.hypot(d[:, 0], d[:, 1])
+    valid = length > 1e-12
+    if not valid.any():
+        return np.zeros_like(d)
+    filled = np.maximum.accumulate(np.where(valid, np.arange(len(d)), -1))
+    filled[filled < 0] = np.argmax(valid)
+    d = d[filled] / length[filled, None]
+    return np.column_stack((-d[:, 1], d[:, 0]))
+
+
+def _is_closed(points):
+    return len(points) > 2 and np.allclose(points[0], points[-1])
+
+
+def signed_area(points):
+    """Shoelace area of a closed outline, positive when counterclockwise."""
+    x, y = points[:, 0], points[:, 1]
+    return 0.5 * float(np.dot(x, np.roll(y, -1)) - np.dot(y, np.roll(x, -1)))
+
+
+class _Joins(object):
+    """Per vertex offset joins of one polyline at distance to its left."""
+    def __init__(self, points, distance, join, miter_limit, tolerance):
+        self.points = points
+        self.distance = distance
+        normals = _segment_normals(points)
+        self.closed = _is_closed(points)
+        self.n_in = np.vstack((normals[-1:] if self.closed else normals[:1], normals))
+        self.n_out = np.vstack((normals, normals[:1] if self.closed else normals[-1:]))
+        cos = (self.n_in * self.n_out).sum(axis=1).clip(-1, 1)
+        sin = self.n_in[:, 0] * self.n_out[:, 1] - self.n_in[:, 1] * self.n_out[:, 0]
+        self.turn = np.arctan2(sin, cos)
+        outer = sin * distance < 0
+        within_limit = (1 + cos) / 2 >= 1.0 / miter_limit ** 2
+        self.kinds = np.full(len(points), MITER, dtype=np.int8)
+        self.kinds[~within_limit] = BEVEL
+        if join == "round":
+            self.kinds[outer] = ROUND
+        elif join != "miter":
+            raise ValueError("join must be 'miter' or 'round'")
+        self.counts = np.ones(len(points), dtype=np.int64)
+        self.counts[self.kinds == BEVEL] = 2
+        rounds = self.kinds == ROUND
+        if rounds.any() and distance:
+            step = 2 * np.arccos(max(1 - tolerance / abs(distance), -1))
+            self.counts[rounds] = np.maximum(np.ceil(np.abs(self.turn[rounds]) / step).astype(np.int64) + 1, 2)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            self.miters = (self.n_in + self.n_out) / (1 + cos)[:, None]
+
+    def offset(self, vertex, fraction):
+        """Offset points at each vertex's join, fraction 0 to 1 along it."""
+        kinds = self.kinds[vertex]
+        n_in, n_out = self.n_in[vertex], self.n_out[vertex]
+        angle = self.turn[vertex] * fraction
+        c, s = np.cos(angle), np.sin(angle)
+        rotated = np.column_stack((n_in[:, 0] * c - n_in[:, 1] * s, n_in[:, 0] * s + n_in[:, 1] * c))
+        vectors = np.select(
+            [(kinds == MITER)[:, None], (kinds == BEVEL)[:, None]],
+            [self.miters[vertex], n_in + fraction[:, None] * (n_out - n_in)],
+            rotated
+        )
+        return self.points[vertex] + self.distance * vectors
+
+
+def _crossings(points, window):
+    """(i, j, crossing point) for segments i < j - 1 of a polyline that
+    cross, looking at most window segments ahead. Segment j touching
+    segment i with its end point counts as crossing."""
+    a, r = points[:-1], np.diff(points, axis=0)
+    found = []
+    for w in range(2, min(window, len(r) - 1) + 1):
+        # segment i against segment i + w, for every i at once
+        ai, ri, aj, rj = a[:-w], r[:-w], a[w:], r[w:]
+        denom = ri[:, 0] * rj[:, 1] - ri[:, 1] * rj[:, 0]
+        q = aj - ai
+        with np.errstate(divide="ignore", invalid="ignore"):
+            t = (q[:, 0] * rj[:, 1] - q[:, 1] * rj[:, 0]) / denom
+            u = (q[:, 0] * ri[:, 1] - q[:, 1] * ri[:, 0]) / denom
+        hit = (denom != 0) & (t > 0) & (t < 1) & (u > 0) & (u <= 1)
+        for i in np.flatnonzero(hit):
+            found.append((int(i), int(i) + w, a[i] + t[i] * r[i]))
+    return found
+
+
+def loop_window(points, distance):
+    """Segments to look ahead for the loops of an offset by distance: as
+    many as cover four times the distance along the path where it is most
+    densely sampled, within MIN_LOOP_WINDOW and MAX_LOOP_WINDOW."""
+    lengths = np.concatenate(([0.0], np.cumsum(np.linalg.norm(np.diff(points, axis=0), axis=1))))
+    reach = np.searchsorted(lengths, lengths + 4 * abs(distance), side="right") - np.arange(len(lengths))
+    return int(np.clip(reach.max(), MIN_LOOP_WINDOW, MAX_LOOP_WINDOW))
+
+
+def remove_loops(points, window):
+    """Collapse the small loops an offset leaves where it crosses itself.
+    The points of each loop move to the crossing, rather than being dropped,
+    so the count stays the same and a paired wire end stays in step; that
+    end simply waits at the corner. Loops spanning more than window
+    segments are left alone."""
+    points = points.copy()
+    end = -1
+    for i, j, crossing in sorted(_crossings(points, window), key=lambda c: (c[0], -c[1])):
+        if i < end:
+            continue
+        points[i + 1:j + 1] = crossing
+        end = j
+    return points
+
+
+def offset_paths(paths, distances, join="round", miter_limit=2.0, tolerance=0.01, return_vertices=False):
+    """Offset polylines that are traversed together, each an (n, 2) array,
+    by its distance to the left of travel. Joins are mitered, beveled past
+    miter_limit, or rounded to within tolerance on outside corners. Every
+    vertex gets as many join points on each path as the most demanding path
+    needs there, so the results still pair point for point. With
+    return_vertices, also returns the input vertex of each output point."""
+    joins = [
+        _Joins(np.asarray(points, dtype=float), distance, join, miter_limit, tolerance)
+        for points, distance in zip(paths, distances)
+    ]
+    counts = np.max([j.counts for j in joins], axis=0)
+    first = np.zeros_like(counts)
+    if all(j.closed for j in joins):
+        # the seam's join is made at the last vertex; the first keeps only its end
+        first[0] = counts[0] - 1
+    vertex = np.repeat(np.arange(len(counts)), counts - first)
+    starts = np.cumsum(counts - first) - (counts - first)
+    step = np.arange(len(vertex)) - np.repeat(starts, counts - first) + first[vertex]
+    fraction = np.where(counts[vertex] > 1, step / np.maximum(counts[vertex] - 1, 1), 1.0)
+    offsets = []
+    for j in joins:
+        offset = j.offset(vertex, fraction)
+        offsets.append(remove_loops(offset, loop_window(offset, j.distance)))
+    return (offsets, vertex) if return_vertices else offsets
+
+
+def kerf_offset(positions, kerf_xy, kerf_za, join="round", miter_limit=2.0, tolerance=0.01,
+                return_vertices=False):
+    """Compensate an (n, 4) array of (x, y, z, a) wire positions for the
+    slot the wire melts, kerf_xy and kerf_za wide at either end. Each end's
+    path moves out by half its kerf: away from the enclosed area of a
+    closed outline, or to the left of travel on an open path, where a
+    negative kerf moves it right. Returns an (m, 4) array, and with
+    return_vertices the input row of each output row."""
+    positions = np.asarray(positions, dtype=float)
+    paths = [positions[:, :2], positions[:, 2:]]
+    distances = []
+    for points, kerf in zip(paths, (kerf_xy, kerf_za)):
+        # counterclockwise outlines enclose the area on their left
+        outward = -1 if _is_closed(points) and signed_area(points) > 0 else 1
+        distances.append(outward * kerf / 2.0)
+    (xy, za), vertex = offset_paths(paths, distances, join, miter_limit, tolerance, return_vertices=True)
+    offset = np.column_stack((xy, za))
+    return (offset, vertex) if return_vertices else offset
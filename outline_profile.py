@@ -0,0 +1,180 @@
+import numpy as np
+
+try:
+    from .geometry import Point
+    from .curve_sampling import SAMPLE_TOLERANCE, sample_evaluator, samples_at_fractions
+    from .spatial_index import EndpointIndex
+except ImportError:
+    from geometry import Point
+    from curve_sampling import SAMPLE_TOLERANCE, sample_evaluator, samples_at_fractions
+    from spatial_index import EndpointIndex
+
+
+class PolylineCurve(object):
+    """Straight segments through (n, 2) points. Fractions run evenly over
+    the points rather than the length, so two polylines with as many points
+    pair point for point, as sections of one airfoil do."""
+    def __init__(self, points):
+        self.points = np.asarray(points, dtype=float)[:, :2]
+
+    @property
+    def start_point(self):
+        return tuple(self.points[0])
+
+    @property
+    def end_point(self):
+        return tuple(self.points[-1])
+
+    def sample_fractions(self, tolerance=SAMPLE_TOLERANCE):
+        return np.linspace(0, 1, len(self.points))
+
+    def positions_at_fractions(self, fractions, tolerance=SAMPLE_TOLERANCE):
+        index = np.asarray(fractions, dtype=float) * (len(self.points) - 1)
+        at = np.arange(len(self.points))
+        return np.column_stack((np.interp(index, at, self.points[:, 0]), np.interp(index, at, self.points[:, 1])))
+
+
+class NurbsCurve(object):
+    """Non-uniform rational B-spline in the plane. It serves as its own
+    evaluator, with the batched calls of a Fusion CurveEvaluator3D, so
+    curve_sampling samples it as it would a sketch curve."""
+    def __init__(self, degree, knots, control_points, weights=None):
+        self.degree = degree
+        self.knots = np.asarray(knots, dtype=float)
+        self.control_points = np.asarray(control_points, dtype=float)[:, :2]
+        self.weights = np.ones(len(self.control_points)) if weights is None else np.asarray(weights, dtype=float)
+        self._samples = {}
+
+    @staticmethod
+    def ellipse_arc(center, major_axis, ratio, start, sweep):
+        """Exact rational quadratic arc of the ellipse about center with
+        semi-major axis vector major_axis and minor to major ratio, from
+        eccentric angle start (radians) through sweep, counter-clockwise
+        when positive. A circular arc has ratio 1."""
+        spans = max(1, int(np.ceil(abs(sweep) / (np.pi / 2) - 1e-9)))
+        step = sweep / spans
+        angles = start + step / 2 * np.arange(2 * spans + 1)
+        scale = np.where(np.arange(2 * spans + 1) % 2, 1 / np.cos(step / 2), 1)
+        weights = np.where(np.arange(2 * spans + 1) % 2, np.cos(step / 2), 1)
+        major_axis = np.asarray(major_axis, dtype=float)
+        minor_axis = ratio * np.array((-major_axis[1], major_axis[0]))
+        control_points = np.asarray(center, dtype=float) + (scale * np.cos(angles))[:, None] * major_axis + \
+            (scale * np.sin(angles))[:, None] * minor_axis
+        knots = [0, 0, 0] + [k for k in range(1, spans) for _ in range(2)] + [spans] * 3
+        return NurbsCurve(2, knots, control_points, weights)
+
+    def _basis(self, params):
+        """(params, control points) matrix of B-spline basis values, by the
+        Cox-de Boor recursion over all params at once."""
+        knots, t = self.knots, np.asarray(params, dtype=float)[:, None]
+        basis = ((knots[:-1] <= t) & (t < knots[1:])).astype(float)
+        # the end of the range belongs to the last non-empty span
+        last = np.searchsorted(knots, knots[-1]) - 1
+        at_end = t[:, 0] >= knots[-1]
+        basis[at_end] = 0
+        basis[at_end, last] = 1
+        for p in range(1, self.degree + 1):
+            with np.errstate(divide="ignore", invalid="ignore"):
+                left = np.where(knots[p:-1] > knots[:-p - 1], (t - knots[:-p - 1]) / (knots[p:-1] - knots[:-p - 1]), 0)
+                right = np.where(knots[p + 1:] > knots[1:-p], (knots[p + 1:] - t) / (knots[p + 1:] - knots[1:-p]), 0)
+            basis = left * basis[:, :-1] + right * basis[:, 1:]
+        return basis
+
+    def positions(self, params):
+        basis = self._basis(params) * self.weights
+        return (basis @ self.control_points) / basis.sum(axis=1)[:, None]
+
+    def getParameterExtents(self):
+        return True, float(self.knots[self.degree]), float(self.knots[-self.degree - 1])
+
+    def getPointsAtParameters(self, params):
+        return True, [Point(u, v) for u, v in self.positions(params).tolist()]
+
+    @property
+    def start_point(self):
+        return tuple(self.positions([self.getParameterExtents()[1]])[0])
+
+    @property
+    def end_point(self):
+        return tuple(self.positions([self.getParameterExtents()[2]])[0])
+
+    def samples(self, tolerance=SAMPLE_TOLERANCE):
+        if tolerance not in self._samples:
+            self._samples[tolerance] = sample_evaluator(self, tolerance)
+        return self._samples[tolerance]
+
+    def sample_fractions(self, tolerance=SAMPLE_TOLERANCE):
+        return self.samples(tolerance).simplified(tolerance).fractions
+
+    def positions_at_fractions(self, fractions, tolerance=SAMPLE_TOLERANCE):
+        return samples_at_fractions(self, self.samples(tolerance), fractions).positions[:, :2]
+
+
+class ReversedCurve(object):
+    """A curve traversed from its end to its start."""
+    def __init__(self, curve):
+        self.curve = curve
+
+    @property
+    def start_point(self):
+        return self.curve.end_point
+
+    @property
+    def end_point(self):
+        return self.curve.start_point
+
+    def sample_fractions(self, tolerance=SAMPLE_TOLERANCE):
+        return 1 - self.curve.sample_fractions(tolerance)[::-1]
+
+    def positions_at_fractions(self, fractions, tolerance=SAMPLE_TOLERANCE):
+        return self.curve.positions_at_fractions(1 - np.asarray(fractions, dtype=float), tolerance)
+
+
+class OutlineProfile(object):
+    """Edge profile of one foam face outside Fusion: plane curves in cutting
+    order, their (u, v) coordinates in cm placed at model (side_x, u, v).
+    Gives wire_cut.WireCut the same curve_fractions and edge_points_at
+    that FoamEdgeProfile reads from a sketch."""
+    def __init__(self, curves, side_x):
+        self.curves = curves
+        self.side_x = side_x
+
+    @staticmethod
+    def from_airfoil(afpoints, side_x, scale=0.1):
+        """Profile of a placed airfoil in mm, closed across the trailing edge
+        as the Fusion sketches are, scaled to cm."""
+        points = scale * np.column_stack((afpoints.x, afpoints.y))
+        curves = [PolylineCurve(points)]
+        if not np.allclose(points[0], points[-1]):
+            curves.append(PolylineCurve(points[[-1, 0]]))
+        return OutlineProfile(curves, side_x)
+
+    @staticmethod
+    def from_curves(curves, side_x, start=(0, 0), tolerance=1e-4):
+        """Profile of unordered curves joined within tolerance into one
+        closed outline, beginning with the curve that starts nearest start,
+        the machine zero. Raises ValueError when the curves do not form a
+        single closed outline."""
+        if not curves:
+            raise ValueError("No outline curves")
+        chains = EndpointIndex.from_curves(curves).chain(tolerance)
+        if len(chains) != 1:
+            raise ValueError("Outline curves form " + str(len(chains)) + " separate chains, not one")
+        ordered = [ReversedCurve(curves[i]) if reverse else curves[i] for i, reverse in chains[0]]
+        if not np.allclose(ordered[0].start_point, ordered[-1].end_point, atol=tolerance):
+            raise ValueError(
+                "Outline is not closed: it runs from " + str(ordered[0].start_point) +
+                " to " + str(ordered[-1].end_point)
+            )
+        first = EndpointIndex.from_curves(ordered).nearest_start(start)[0]
+        return OutlineProfile(ordered[first:] + ordered[:first], side_x)
+
+    def curve_fractions(self, tolerance):
+        return [curve.sample_fractions(tolerance) for curve in self.curves]
+
+    def edge_points_at(self, curve_fractions, tolerance):
+        edge_points = []
+        for curve, fractions in zip(self.curves, curve_fractions):
+            for u, v in curve.positions_at_fractions(fractions, tolerance).tolist():
+                edge_points.append(Point(self.side_x, u, v))
+        return edge_points
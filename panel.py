@@ -1,3 +1,39 @@
+PANEL_COLUMNS = ("chord", "thickness", "te_thickness", "twist", "xoff", "yoff", "zoff")
+
+
+def read_panel_csv(path):
+    """Sections of a panel CSV, one dict of column values per row, root first."""
+    secs = []
+    with open(path) as f:
+        cols = f.readline().split(',')
+        for line in f.readlines():
+            if not line.strip():
+                continue
+            secs.append(
+                {col.strip(): float(val.strip()) for col, val in zip(cols, line.split(','))}
+            )
+    return secs
+
+
+def place_section(afpoints, sec):
+    """afpoints scaled, twisted and moved to a panel section, a mapping of
+    the PANEL_COLUMNS, all in mm and degrees; zoff, the spanwise position,
+    is not applied."""
+    return afpoints.set_chord(
+        sec['chord']
+    ).set_thickness(
+        sec['thickness']
+    ).set_te_thickness(
+        sec['te_thickness']
+    ).set_twist(
+        sec['twist']
+    ).offset_y(
+        sec['yoff']
+    ).offset_x(
+        sec['xoff']
+    )
+
+
 
 
 
@@ -0,0 +1,62 @@
+from collections import Counter
+
+
+class ProxyCache(object):
+    """Memoized lookups on the wrappers over the Fusion object model, for
+    one script run. Each wrapper keeps what it read in its own _cached dict,
+    tagged with the revision it was read at. invalidate() starts a new
+    revision, as every change made through the wrappers does, and sync()
+    starts one when an outside revision token, such as a component's
+    revisionId, has moved on. hits counts the API round trips saved and
+    misses the lookups that went to the API, by name."""
+    def __init__(self):
+        self.revision = 0
+        self.hits = Counter()
+        self.misses = Counter()
+        self._token = None
+
+    def invalidate(self):
+        self.revision += 1
+
+    def sync(self, token):
+        """Invalidate if token differs from the one last synced."""
+        if token != self._token:
+            self._token = token
+            self.invalidate()
+
+    def lookup(self, owner, key, build):
+        """owner's value for key, from build() when not read this revision."""
+        name = key[0] if isinstance(key, tuple) else key
+        entry = owner._cached.get(key)
+        if entry is not None and entry[0] == self.revision:
+            self.hits[name] += 1
+            return entry[1]
+        self.misses[name] += 1
+        value = build()
+        owner._cached[key] = (self.revision, value)
+        return value
+
+    def reset_stats(self):
+        self.hits.clear()
+        self.misses.clear()
+
+    def __str__(self):
+        lines = ["{:24s} {:>8s} {:>8s}".format("lookup", "api", "saved")]
+        for name in sorted(set(self.hits) | set(self.misses)):
+            lines.append("{:24s} {:8d} {:8d}".format(name, self.misses[name], self.hits[name]))
+        lines.append("{:24s} {:8d} {:8d}".format("total", sum(self.misses.values()), sum(self.hits.values())))
+        return "\n".join(lines)
+
+
+proxy_cache = ProxyCache()
+
+
+def cached_property(name):
+    """Property memoized in proxy_cache under name; the owner needs a
+    _cached dict."""
+    def decorator(func):
+        def getter(self):
+            return proxy_cache.lookup(self, name, lambda: func(self))
+        getter.__doc__ = func.__doc__
+        return property(getter)
+    return decorator
@@ -0,0 +1,97 @@
+import time
+from collections import OrderedDict
+from .fusion_connection import FusionSketch
+from .geometry import Point
+
+
+class QueuedSketch(object):
+    """A sketch the SketchBuilder will create, and the curves to put in it."""
+    def __init__(self, name, plane):
+        self.name = name
+        self.plane = plane
+        self.splines = []
+        self.sketch = None
+
+    def add_spline(self, locations, close=False):
+        """Fitted spline through locations (geometry.Point, mm), closed by a
+        line between its end fit points if close, as across a trailing edge."""
+        self.splines.append((list(locations), close))
+        return self
+
+    def add_airfoil(self, afpoints):
+        """Spline through a placed airfoil section (mm), closed across the trailing edge."""
+        return self.add_spline([Point(x, y, 0) for x, y in zip(afpoints.x.tolist(), afpoints.y.tolist())], True)
+
+
+class SketchBuilder(object):
+    """Queues construction planes, sketches and their curves for a
+    FusionComponent and creates them all in one pass by build(). Sketches
+    are created with their compute deferred until all of their geometry is
+    in, so each is solved once rather than after every curve, and the
+    features made are grouped in the timeline, to undo as one step.
+    timings holds the seconds spent in each phase of the last build."""
+    def __init__(self, component, name="sections"):
+        self._component = component
+        self._name = name
+        self._planes = []
+        self._sketches = []
+        self.timings = OrderedDict()
+
+    def offset_plane(self, offset, plane=None):
+        """Queue a construction plane offset (cm) from plane, the XY plane
+        by default. Returns its index, which sketch() takes as a plane."""
+        self._planes.append((offset, plane))
+        return len(self._planes) - 1
+
+    def sketch(self, name, plane):
+        """Queue a sketch on plane, a construction plane or an offset_plane index."""
+        queued = QueuedSketch(name, plane)
+        self._sketches.append(queued)
+        return queued
+
+    def _phase(self, name, start):
+        now = time.perf_counter()
+        self.timings[name] = now - start
+        return now
+
+    def build(self):
+        """Create everything queued and return the sketches, in queued order."""
+        self.timings = OrderedDict()
+        timeline = self._component.timeline
+        marker = timeline.markerPosition if timeline is not None else 0
+        start = time.perf_counter()
+
+        planes = [self._component.create_offset_plane(offset, plane) for offset, plane in self._planes]
+        start = self._phase("planes", start)
+
+        for queued in self._sketches:
+            plane = planes[queued.plane] if isinstance(queued.plane, int) else queued.plane
+            queued.sketch = self._component.create_sketch(queued.name, plane)
+            queued.sketch.isComputeDeferred = True
+        start = self._phase("sketches", start)
+
+        for queued in self._sketches:
+            sketch = FusionSketch(queued.sketch)
+            for locations, close in queued.splines:
+                spline = sketch.create_spline(locations)
+                if close:
+                    fit_points = spline.fitPoints
+                    sketch.create_line(fit_points.item(0), fit_points.item(fit_points.count - 1))
+        start = self._phase("geometry", start)
+
+        for queued in self._sketches:
+            queued.sketch.isComputeDeferred = False
+        start = self._phase("compute", start)
+
+        self._component.group_timeline(marker, self._name)
+        self._phase("timeline", start)
+
+        sketches = [queued.sketch for queued in self._sketches]
+        self._planes = []
+        self._sketches = []
+        return sketches
+
+    def __str__(self):
+        lines = ["{:12s} {:9.3f} s".format(phase, seconds) for phase, seconds in self.timings.items()]
+        lines.append("{:12s} {:9.3f} s".format("total", sum(self.timings.values())))
+        return "\n".join(lines)
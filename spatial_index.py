@@ -0,0 +1,171 @@
+from itertools import product
+import numpy as np
+
+
+class PointIndex(object):
+    """Uniform grid over a fixed set of 2D or 3D points for nearest point
+    queries. Points can be removed, which is how curve chaining consumes
+    endpoints as it goes."""
+    def __init__(self, points, cell_size=None):
+        self._points = np.asarray(points, dtype=float)
+        if self._points.ndim != 2 or not len(self._points):
+            raise ValueError("PointIndex needs a non-empty (n, dim) array of points")
+        self._active = np.ones(len(self._points), dtype=bool)
+        self._lower = self._points.min(axis=0)
+        if cell_size is None:
+            # about one point per cell on a uniformly spread set, counting
+            # only the dimensions the points actually extend in
+            extents = self._points.max(axis=0) - self._lower
+            dims = max(int((extents > 0).sum()), 1)
+            cell_size = extents.max() / max(len(self._points) ** (1.0 / dims), 1) or 1.0
+        self.cell_size = cell_size
+        cells = np.floor((self._points - self._lower) / cell_size).astype(np.int64)
+        self._max_cell = cells.max(axis=0)
+        keys, inverse = np.unique(cells, axis=0, return_inverse=True)
+        order = np.argsort(inverse.ravel(), kind='stable')
+        splits = np.cumsum(np.bincount(inverse.ravel(), minlength=len(keys)))[:-1]
+        self._keys = keys
+        self._members = np.split(order, splits)
+        self._cells = {tuple(key): members for key, members in zip(keys.tolist(), self._members)}
+
+    def __len__(self):
+        return int(self._active.sum())
+
+    def remove(self, index):
+        self._active[index] = False
+
+    def _ring(self, centre, radius):
+        """Occupied cells at Chebyshev distance radius from centre."""
+        for offset in product(range(-radius, radius + 1), repeat=len(centre)):
+            if max(abs(o) for o in offset) == radius:
+                members = self._cells.get(tuple(c + o for c, o in zip(centre, offset)))
+                if members is not None:
+                    yield members
+
+    def _rings(self, centre, last_ring):
+        """(radius, members) of the occupied cells, ring by ring out from
+        centre. Once rings have more cells than the grid has occupied ones,
+        as for a point far from a small cluster, the rest come from the
+        occupied cells sorted by ring instead."""
+        for radius in range(last_ring + 1):
+            if (2 * radius + 1) ** len(centre) > len(self._cells):
+                break
+            for members in self._ring(centre, radius):
+                yield radius, members
+        else:
+            return
+        rings = np.abs(self._keys - centre).max(axis=1)
+        for i in np.argsort(rings, kind='stable').tolist():
+            if rings[i] >= radius:
+                yield int(rings[i]), self._members[i]
+
+    def nearest(self, point, max_distance=np.inf):
+        """(index, distance) of the closest remaining point, or (None, inf)
+        when none is within max_distance."""
+        point = np.asarray(point, dtype=float)[:self._points.shape[1]]
+        centre = np.floor((point - self._lower) / self.cell_size).astype(np.int64).tolist()
+        # rings beyond this cover no cells at all
+        last_ring = int(max(max(abs(c), abs(m - c)) for c, m in zip(centre, self._max_cell.tolist())))
+        best, best_distance = None, np.inf
+        for radius, members in self._rings(centre, last_ring):
+            # everything in this ring or beyond is at least (radius - 1) cells away
+            reach = max(radius - 1, 0) * self.cell_size
+            if reach > best_distance or reach > max_distance:
+                break
+            members = members[self._active[members]]
+            if not len(members):
+                continue
+            distances = np.sqrt(((self._points[members] - point) ** 2).sum(axis=1))
+            i = int(np.argmin(distances))
+            if distances[i] < best_distance:
+                best, best_distance = int(members[i]), float(distances[i])
+        if best_distance > max_distance:
+            return None, np.inf
+        return best, best_distance
+
+
+def curve_endpoints(curves):
+    """(starts, ends) arrays for curve wrappers with start_point/end_point
+    (FusionSketchCurve or anything whose points have a position or are
+    coordinate sequences), or for an (n, 2, dim) array of endpoint pairs."""
+    if isinstance(curves, np.ndarray):
+        return curves[:, 0], curves[:, 1]
+
+    def _coordinates(point):
+        return tuple(getattr(point, "position", point))
+
+    return (
+        np.array([_coordinates(curve.start_point) for curve in curves], dtype=float),
+        np.array([_coordinates(curve.end_point) for curve in curves], dtype=float),
+    )
+
+
+class EndpointIndex(object):
+    """Spatial index over the start and end points of a set of curves."""
+    def __init__(self, starts, ends, cell_size=None):
+        self._starts = np.asarray(starts, dtype=float)
+        self._ends = np.asarray(ends, dtype=float)
+        self._count = len(self._starts)
+        self._cell_size = cell_size
+        self._start_index = None
+
+    @staticmethod
+    def from_curves(curves, cell_size=None):
+        starts, ends = curve_endpoints(curves)
+        return EndpointIndex(starts, ends, cell_size)
+
+    def __len__(self):
+        return self._count
+
+    def nearest_start(self, point):
+        """(curve index, distance) of the curve starting closest to point."""
+        if self._start_index is None:
+            self._start_index = PointIndex(self._starts, self._cell_size)
+        return self._start_index.nearest(point)
+
+    def chain(self, tolerance, first=0):
+        """Order the curves into connected chains. Each chain is a list of
+        (curve index, reversed) pairs, where reversed curves are traversed
+        from end to start. A curve joins a chain when one of its endpoints is
+        within tolerance of the chain's free end; otherwise a new chain
+        starts. A closed outline gives a single chain beginning at first."""
+        if not self._count:
+            return []
+        n = self._count
+        index = PointIndex(np.concatenate((self._starts, self._ends)), self._cell_size)
+        used = np.zeros(n, dtype=bool)
+        chains = []
+        current = first
+        while current is not None:
+            used[current] = True
+            index.remove(current)
+            index.remove(current + n)
+            chain = [(current, False)]
+            # walk forward from the tail, then backward from the head
+            tail = self._ends[current]
+            while True:
+                j, _ = index.nearest(tail, tolerance)
+                if j is None:
+                    break
+                curve, reverse = j % n, bool(j >= n)
+                used[curve] = True
+                index.remove(curve)
+                index.remove(curve + n)
+                chain.append((curve, reverse))
+                tail = self._starts[curve] if reverse else self._ends[curve]
+            head = self._starts[current]
+            head_part = []
+            while True:
+                j, _ = index.nearest(head, tolerance)
+                if j is None:
+                    break
+                curve, reverse = j % n, bool(j < n)
+                used[curve] = True
+                index.remove(curve)
+                index.remove(curve + n)
+                head_part.append((curve, reverse))
+                head = self._ends[curve] if reverse else self._starts[curve]
+            chains.append(head_part[::-1] + chain)
+            remaining = np.flatnonzero(~used)
+            current = int(remaining[0]) if len(remaining) else None
+        return chains
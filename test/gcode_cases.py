@@ -0,0 +1,42 @@
+"""Sections, a G-code reader and a core component shared by the hot wire
+cutting tests and bench/bench_fusion_pipeline.py.
+
+    from gcode_cases import TEST_AIRFOIL, ROOT, TIP, moves, core_component
+"""
+import os
+import sys
+import numpy as np
+
+TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+TEST_AIRFOIL = os.path.join(TEST_DIR, "test_airfoil.dat")
+ROOT = {"chord": 240, "thickness": 30, "te_thickness": 0.5, "twist": 0, "xoff": 0, "yoff": 0, "zoff": 0}
+TIP = {"chord": 200, "thickness": 25, "te_thickness": 0.5, "twist": -2, "xoff": 10, "yoff": 0, "zoff": 300}
+
+
+def moves(text):
+    """(n, 4) X Y Z A words of the G01 lines in G-code text."""
+    rows = [line.split()[2:6] for line in text.splitlines() if line.startswith("G01")]
+    return np.array([[float(word[1:]) for word in row] for row in rows])
+
+
+def core_component(root, tip, x_1, x_2):
+    """FusionComponent on the adsk stand-in with the side_1 and side_2
+    sketches HotWireGcode reads, on yZ planes x_1 and x_2 cm out. The
+    stand-in is only loaded here, so cases without Fusion don't need it."""
+    stubs_dir = os.path.join(TEST_DIR, "stubs")
+    if stubs_dir not in sys.path:
+        sys.path.insert(0, stubs_dir)
+    from stub_package import load_module
+    import adsk.core
+    fusion_connection = load_module("fusion_connection")
+    airfoil_spline = load_module("ParametricAirfoilSpline")
+
+    component = fusion_connection.fusion.new_document("core").design.rootComponent
+    for name, section, x in [("side_1", root, x_1), ("side_2", tip, x_2)]:
+        planeinput = component.constructionPlanes.createInput()
+        planeinput.setByOffset(component.yZConstructionPlane, adsk.core.ValueInput.createByReal(x))
+        sketch = airfoil_spline.create_new_airfoil_sketch(
+            component, component.constructionPlanes.add(planeinput), section
+        )
+        sketch.name = name
+    return fusion_connection.FusionComponent(component)
@@ -0,0 +1,4 @@
+"""In-memory stand-in for the part of the Fusion 360 adsk API this project
+uses, for running and timing the Fusion code paths without Fusion. Put
+test/stubs on sys.path first; _stub counts the calls made."""
+from . import _stub, core, fusion, cam
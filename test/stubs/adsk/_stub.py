@@ -0,0 +1,36 @@
+"""Call accounting for the adsk stand-in. Every API method call and
+property read is counted under its qualified name and, when latency is set,
+takes that many seconds longer, as a round trip into Fusion would."""
+import time
+from collections import Counter
+
+calls = Counter()
+latency = 0.0
+
+
+def reset():
+    global latency
+    calls.clear()
+    latency = 0.0
+
+
+def total():
+    return sum(calls.values())
+
+
+def api(func):
+    name = func.__qualname__
+
+    def wrapper(*args, **kwargs):
+        calls[name] += 1
+        if latency:
+            time.sleep(latency)
+        return func(*args, **kwargs)
+    wrapper.__name__ = func.__name__
+    wrapper.__qualname__ = name
+    wrapper.__doc__ = func.__doc__
+    return wrapper
+
+
+def api_property(func):
+    return property(api(func))
@@ -0,0 +1 @@
+"""Empty; imported alongside adsk.core and adsk.fusion."""
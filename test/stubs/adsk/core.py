@@ -0,0 +1,281 @@
+import numpy as np
+from ._stub import api, api_property
+
+
+class Point3D(object):
+    def __init__(self, x, y, z):
+        self._xyz = [float(x), float(y), float(z)]
+
+    @staticmethod
+    @api
+    def create(x=0.0, y=0.0, z=0.0):
+        return Point3D(x, y, z)
+
+    @api_property
+    def x(self):
+        return self._xyz[0]
+
+    @api_property
+    def y(self):
+        return self._xyz[1]
+
+    @api_property
+    def z(self):
+        return self._xyz[2]
+
+    @api
+    def asArray(self):
+        return list(self._xyz)
+
+    @api
+    def copy(self):
+        return Point3D(*self._xyz)
+
+    @api
+    def transformBy(self, matrix):
+        self._xyz = matrix._apply(np.array(self._xyz)).tolist()
+        return True
+
+    @api
+    def distanceTo(self, other):
+        return float(np.linalg.norm(np.subtract(self._xyz, other._xyz)))
+
+    def __repr__(self):
+        return "Point3D" + str(tuple(self._xyz))
+
+
+class Vector3D(object):
+    def __init__(self, x, y, z):
+        self._xyz = [float(x), float(y), float(z)]
+
+    @staticmethod
+    @api
+    def create(x=0.0, y=0.0, z=0.0):
+        return Vector3D(x, y, z)
+
+    @api_property
+    def x(self):
+        return self._xyz[0]
+
+    @api_property
+    def y(self):
+        return self._xyz[1]
+
+    @api_property
+    def z(self):
+        return self._xyz[2]
+
+    @api
+    def asArray(self):
+        return list(self._xyz)
+
+
+class Matrix3D(object):
+    """4 x 4 homogeneous transform, as adsk.core.Matrix3D."""
+    def __init__(self, array=None):
+        self._array = np.eye(4) if array is None else np.array(array, dtype=float).reshape(4, 4)
+
+    @staticmethod
+    @api
+    def create():
+        return Matrix3D()
+
+    def _apply(self, xyz):
+        return self._array[:3, :3] @ xyz + self._array[:3, 3]
+
+    @api
+    def asArray(self):
+        return self._array.ravel().tolist()
+
+    @api
+    def setWithArray(self, values):
+        self._array = np.array(values, dtype=float).reshape(4, 4)
+        return True
+
+    @api
+    def getCell(self, row, column):
+        return float(self._array[row, column])
+
+    @api
+    def copy(self):
+        return Matrix3D(self._array)
+
+    @api
+    def invert(self):
+        self._array = np.linalg.inv(self._array)
+        return True
+
+    @api
+    def transformBy(self, matrix):
+        self._array = matrix._array @ self._array
+        return True
+
+
+class ObjectCollection(object):
+    def __init__(self):
+        self._items = []
+
+    @staticmethod
+    @api
+    def create():
+        return ObjectCollection()
+
+    @api
+    def add(self, item):
+        self._items.append(item)
+        return True
+
+    @api_property
+    def count(self):
+        return len(self._items)
+
+    @api
+    def item(self, index):
+        return self._items[index]
+
+    def __iter__(self):
+        return iter(list(self._items))
+
+    def __len__(self):
+        return len(self._items)
+
+
+class ValueInput(object):
+    def __init__(self, value):
+        self.realValue = value
+
+    @staticmethod
+    @api
+    def createByReal(value):
+        return ValueInput(float(value))
+
+
+class CurveEvaluator3D(object):
+    """Evaluator over a parametric curve given as a function of an array
+    of parameters returning (n, 3) positions, over [start, end]."""
+    def __init__(self, positions, start, end, samples=2048):
+        self._positions = positions
+        self._start = start
+        self._end = end
+        params = np.linspace(start, end, samples)
+        lengths = np.linalg.norm(np.diff(positions(params), axis=0), axis=1)
+        self._table = params, np.concatenate(([0.0], np.cumsum(lengths)))
+
+    @property
+    def length(self):
+        return float(self._table[1][-1])
+
+    @api
+    def getParameterExtents(self):
+        return True, self._start, self._end
+
+    @api
+    def getPointAtParameter(self, parameter):
+        return True, Point3D(*self._positions(np.array([parameter]))[0])
+
+    @api
+    def getPointsAtParameters(self, parameters):
+        return True, [Point3D(*p) for p in self._positions(np.asarray(parameters, dtype=float)).tolist()]
+
+    @api
+    def getParameterAtLength(self, fromParameter, length):
+        params, lengths = self._table
+        at = np.interp(fromParameter, params, lengths) + length
+        return True, float(np.interp(at, lengths, params))
+
+    @api
+    def getLengthAtParameter(self, fromParameter, toParameter):
+        params, lengths = self._table
+        return True, float(np.interp(toParameter, params, lengths) - np.interp(fromParameter, params, lengths))
+
+
+class Curve3D(object):
+    def __init__(self, evaluator):
+        self._evaluator = evaluator
+
+    @api_property
+    def evaluator(self):
+        return self._evaluator
+
+
+class UserInterface(object):
+    def __init__(self):
+        self.messages = []
+
+    @api
+    def messageBox(self, text, *args):
+        self.messages.append(text)
+        return 0
+
+
+class Documents(object):
+    def __init__(self, app):
+        self._app = app
+        self._items = []
+
+    @api
+    def add(self, documentType, *args):
+        from .fusion import Design
+        document = Document(Design())
+        self._items.append(document)
+        self._app._active = document
+        return document
+
+    @api_property
+    def count(self):
+        return len(self._items)
+
+    @api
+    def item(self, index):
+        return self._items[index]
+
+    def __iter__(self):
+        return iter(list(self._items))
+
+
+class Document(object):
+    def __init__(self, design):
+        self._design = design
+        self._name = "Untitled"
+
+    @api_property
+    def design(self):
+        return self._design
+
+    @property
+    def name(self):
+        return self._name
+
+    @name.setter
+    def name(self, value):
+        self._name = value
+
+
+class Application(object):
+    _instance = None
+
+    def __init__(self):
+        self._ui = UserInterface()
+        self._documents = Documents(self)
+        self._active = None
+
+    @staticmethod
+    @api
+    def get():
+        if Application._instance is None:
+            Application._instance = Application()
+        return Application._instance
+
+    @api_property
+    def userInterface(self):
+        return self._ui
+
+    @api_property
+    def documents(self):
+        return self._documents
+
+    @api_property
+    def activeDocument(self):
+        if self._active is None:
+            self._documents.add(0)
+        return self._active
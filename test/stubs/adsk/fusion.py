@@ -0,0 +1,575 @@
+import numpy as np
+from ._stub import api, api_property
+from .core import Point3D, Matrix3D, ObjectCollection, CurveEvaluator3D, Curve3D
+
+PROFILE_TOLERANCE = 1e-6 # cm, endpoints this close join into a profile loop
+
+
+class _Collection(object):
+    def __init__(self, items=None):
+        self._items = [] if items is None else items
+
+    @api_property
+    def count(self):
+        return len(self._items)
+
+    @api
+    def item(self, index):
+        return self._items[index]
+
+    def __iter__(self):
+        return iter(list(self._items))
+
+    def __len__(self):
+        return len(self._items)
+
+
+class DesignTypes(object):
+    DirectDesignType = 0
+    ParametricDesignType = 1
+
+
+class TimelineObject(object):
+    def __init__(self, entity):
+        self._entity = entity
+        self._group = None
+
+    @api_property
+    def entity(self):
+        return self._entity
+
+
+class TimelineGroup(object):
+    def __init__(self, items):
+        self._items = items
+        self._name = "Group"
+
+    @api_property
+    def name(self):
+        return self._name
+
+    @name.setter
+    @api
+    def name(self, value):
+        self._name = value
+
+    @api_property
+    def count(self):
+        return len(self._items)
+
+
+class TimelineGroups(_Collection):
+    def __init__(self, timeline):
+        _Collection.__init__(self)
+        self._timeline = timeline
+
+    @api
+    def add(self, startIndex, endIndex):
+        items = self._timeline._items[startIndex:endIndex + 1]
+        if not items or any(item._group is not None for item in items):
+            raise RuntimeError("invalid timeline group range")
+        group = TimelineGroup(items)
+        for item in items:
+            item._group = group
+        self._items.append(group)
+        return group
+
+
+class Timeline(_Collection):
+    """Features in order of creation, the marker always at the end."""
+    def __init__(self):
+        _Collection.__init__(self)
+        self._groups = TimelineGroups(self)
+
+    def _add(self, entity):
+        self._items.append(TimelineObject(entity))
+
+    @api_property
+    def markerPosition(self):
+        return len(self._items)
+
+    @api_property
+    def timelineGroups(self):
+        return self._groups
+
+
+class Design(object):
+    def __init__(self, designType=DesignTypes.ParametricDesignType):
+        self._design_type = designType
+        self._timeline = Timeline()
+        self._root = Component(self)
+
+    @api_property
+    def designType(self):
+        return self._design_type
+
+    @api_property
+    def timeline(self):
+        if self._design_type != DesignTypes.ParametricDesignType:
+            raise RuntimeError("a direct design has no timeline")
+        return self._timeline
+
+    @api_property
+    def rootComponent(self):
+        return self._root
+
+    @api_property
+    def activeComponent(self):
+        return self._root
+
+
+class ConstructionPlane(object):
+    """Plane through origin spanned by the unit vectors u and v, in model space."""
+    def __init__(self, origin, u, v, name=""):
+        self._origin = np.array(origin, dtype=float)
+        self._u = np.array(u, dtype=float)
+        self._v = np.array(v, dtype=float)
+        self._name = name
+
+    @property
+    def _normal(self):
+        return np.cross(self._u, self._v)
+
+    @api_property
+    def name(self):
+        return self._name
+
+    def _offset(self, distance):
+        return ConstructionPlane(self._origin + distance * self._normal, self._u, self._v)
+
+
+class ConstructionPlaneInput(object):
+    def __init__(self):
+        self._plane = None
+
+    @api
+    def setByOffset(self, planarEntity, offset):
+        self._plane = planarEntity._offset(offset.realValue)
+        return True
+
+
+class ConstructionPlanes(_Collection):
+    def __init__(self, component):
+        _Collection.__init__(self)
+        self._component = component
+
+    @api
+    def createInput(self, occurrenceForCreation=None):
+        return ConstructionPlaneInput()
+
+    @api
+    def add(self, input):
+        self._items.append(input._plane)
+        self._component._changed()
+        self._component._design._timeline._add(input._plane)
+        return input._plane
+
+
+class Component(object):
+    def __init__(self, design):
+        self._design = design
+        self._revision = 0
+        self._sketches = Sketches(self)
+        self._construction_planes = ConstructionPlanes(self)
+        self._xy = ConstructionPlane((0, 0, 0), (1, 0, 0), (0, 1, 0), "XY")
+        self._xz = ConstructionPlane((0, 0, 0), (1, 0, 0), (0, 0, 1), "XZ")
+        self._yz = ConstructionPlane((0, 0, 0), (0, 1, 0), (0, 0, 1), "YZ")
+
+    def _changed(self):
+        self._revision += 1
+
+    @api_property
+    def parentDesign(self):
+        return self._design
+
+    @api_property
+    def revisionId(self):
+        return "r" + str(self._revision)
+
+    @api_property
+    def sketches(self):
+        return self._sketches
+
+    @api_property
+    def constructionPlanes(self):
+        return self._construction_planes
+
+    @api_property
+    def xYConstructionPlane(self):
+        return self._xy
+
+    @api_property
+    def xZConstructionPlane(self):
+        return self._xz
+
+    @api_property
+    def yZConstructionPlane(self):
+        return self._yz
+
+
+class Sketches(_Collection):
+    def __init__(self, component):
+        _Collection.__init__(self)
+        self._component = component
+
+    @api
+    def add(self, planarEntity, occurrenceForCreation=None):
+        sketch = Sketch(self._component, planarEntity, "Sketch" + str(len(self._items) + 1))
+        self._items.append(sketch)
+        self._component._changed()
+        self._component._design._timeline._add(sketch)
+        return sketch
+
+    @api
+    def itemByName(self, name):
+        for sketch in self._items:
+            if sketch._name == name:
+                return sketch
+        return None
+
+
+class Sketch(object):
+    """Sketch on a ConstructionPlane, its x and y along the plane's u and v.
+    Changes to its geometry recompute it, through _compute, unless its
+    compute is deferred; then it is recomputed once when no longer deferred."""
+    def __init__(self, component, plane, name):
+        self._component = component
+        self._plane = plane
+        self._name = name
+        self._transform = np.eye(4)
+        self._transform[:3, 0] = plane._u
+        self._transform[:3, 1] = plane._v
+        self._transform[:3, 2] = plane._normal
+        self._transform[:3, 3] = plane._origin
+        self._deferred = False
+        self._profiles = []
+        self._curves = []
+        self._points = []
+        self._sketch_curves = SketchCurves(self)
+        self._sketch_points = SketchPoints(self)
+        self.dxf_files = []
+
+    def _changed(self):
+        self._component._changed()
+        if not self._deferred:
+            self._compute()
+
+    @api
+    def _compute(self):
+        self._profiles = [Profile(loop) for loop in _closed_loops(
+            [curve for curve in self._curves if not curve._construction]
+        )]
+
+    def _to_model(self, xyz):
+        return self._transform[:3, :3] @ np.asarray(xyz, dtype=float) + self._transform[:3, 3]
+
+    def _to_sketch(self, xyz):
+        return self._transform[:3, :3].T @ (np.asarray(xyz, dtype=float) - self._transform[:3, 3])
+
+    def _sketch_point(self, point):
+        if isinstance(point, SketchPoint):
+            return point
+        sketch_point = SketchPoint(self, point.asArray())
+        self._points.append(sketch_point)
+        return sketch_point
+
+    @api_property
+    def name(self):
+        return self._name
+
+    @name.setter
+    @api
+    def name(self, value):
+        self._name = value
+        self._component._changed()
+
+    @api_property
+    def isComputeDeferred(self):
+        return self._deferred
+
+    @isComputeDeferred.setter
+    @api
+    def isComputeDeferred(self, value):
+        if self._deferred and not value:
+            self._compute()
+        self._deferred = bool(value)
+
+    @api_property
+    def referencePlane(self):
+        return self._plane
+
+    @api_property
+    def origin(self):
+        return Point3D(*self._transform[:3, 3])
+
+    @api_property
+    def transform(self):
+        return Matrix3D(self._transform)
+
+    @api_property
+    def sketchCurves(self):
+        return self._sketch_curves
+
+    @api_property
+    def sketchPoints(self):
+        return self._sketch_points
+
+    @api_property
+    def profiles(self):
+        return _Collection(list(self._profiles))
+
+    @api
+    def modelToSketchSpace(self, modelCoordinate):
+        return Point3D(*self._to_sketch(modelCoordinate.asArray()))
+
+    @api
+    def sketchToModelSpace(self, sketchCoordinate):
+        return Point3D(*self._to_model(sketchCoordinate.asArray()))
+
+    @api
+    def project(self, entity):
+        """Copies of a sketch curve of another sketch, as seen in this one."""
+        source = entity._sketch
+        projected = ObjectCollection()
+        points = [self._to_sketch(source._to_model(point._xyz)) for point in entity._fit_points]
+        if isinstance(entity, SketchLine):
+            curve = SketchLine(self, *[self._sketch_point(Point3D(*point)) for point in points])
+        else:
+            curve = SketchFittedSpline(self, [self._sketch_point(Point3D(*point)) for point in points])
+        self._curves.append(curve)
+        self._changed()
+        projected.add(curve)
+        return projected
+
+    @api
+    def saveAsDXF(self, fullFilename):
+        self.dxf_files.append(fullFilename)
+        return True
+
+
+class SketchPoint(object):
+    def __init__(self, sketch, xyz):
+        self._sketch = sketch
+        self._xyz = np.array(xyz, dtype=float)
+
+    @api_property
+    def geometry(self):
+        return Point3D(*self._xyz)
+
+    @api_property
+    def worldGeometry(self):
+        return Point3D(*self._sketch._to_model(self._xyz))
+
+
+class SketchPoints(_Collection):
+    def __init__(self, sketch):
+        _Collection.__init__(self, sketch._points)
+        self._sketch = sketch
+
+    @api
+    def add(self, point):
+        sketch_point = SketchPoint(self._sketch, point.asArray())
+        self._items.append(sketch_point)
+        self._sketch._changed()
+        return sketch_point
+
+
+class SketchCurve(object):
+    objectType = "adsk::fusion::SketchCurve"
+
+    def __init__(self, sketch, fit_points):
+        self._sketch = sketch
+        self._fit_points = fit_points
+        self._construction = False
+        self._evaluator = CurveEvaluator3D(self._positions, *self._extents())
+
+    @api_property
+    def length(self):
+        return self._evaluator.length
+
+    @api_property
+    def isConstruction(self):
+        return self._construction
+
+    @isConstruction.setter
+    @api
+    def isConstruction(self, value):
+        self._construction = bool(value)
+        self._sketch._changed()
+
+    @api_property
+    def startSketchPoint(self):
+        return self._fit_points[0]
+
+    @api_property
+    def endSketchPoint(self):
+        return self._fit_points[-1]
+
+    @api_property
+    def geometry(self):
+        return Curve3D(self._evaluator)
+
+    @api
+    def deleteMe(self):
+        self._sketch._curves.remove(self)
+        self._sketch._changed()
+        return True
+
+
+class SketchLine(SketchCurve):
+    objectType = "adsk::fusion::SketchLine"
+
+    def __init__(self, sketch, start, end):
+        SketchCurve.__init__(self, sketch, [start, end])
+
+    def _extents(self):
+        return 0.0, float(np.linalg.norm(self._fit_points[1]._xyz - self._fit_points[0]._xyz))
+
+    def _positions(self, params):
+        start, end = self._fit_points[0]._xyz, self._fit_points[1]._xyz
+        span = self._extents()[1] or 1.0
+        return start + np.outer(params / span, end - start)
+
+
+class SketchFittedSpline(SketchCurve):
+    """Uniform Catmull-Rom spline through the fit points, its parameter
+    running from 0 to one less than their number."""
+    objectType = "adsk::fusion::SketchFittedSpline"
+
+    def _extents(self):
+        return 0.0, float(len(self._fit_points) - 1)
+
+    def _positions(self, params):
+        points = np.array([point._xyz for point in self._fit_points])
+        padded = np.vstack((2 * points[0] - points[1], points, 2 * points[-1] - points[-2]))
+        params = np.clip(params, 0, len(points) - 1)
+        i = np.minimum(params.astype(int), len(points) - 2)
+        s = (params - i)[:, None]
+        p0, p1, p2, p3 = padded[i], padded[i + 1], padded[i + 2], padded[i + 3]
+        return 0.5 * (
+            2 * p1 + (p2 - p0) * s + (2 * p0 - 5 * p1 + 4 * p2 - p3) * s**2 + (3 * p1 - p0 - 3 * p2 + p3) * s**3
+        )
+
+    @api_property
+    def fitPoints(self):
+        return _Collection(list(self._fit_points))
+
+
+class SketchLines(_Collection):
+    def __init__(self, sketch):
+        _Collection.__init__(self)
+        self._sketch = sketch
+
+    def __iter__(self):
+        return iter([curve for curve in self._sketch._curves if isinstance(curve, SketchLine)])
+
+    @api_property
+    def count(self):
+        return len(list(iter(self)))
+
+    @api
+    def item(self, index):
+        return list(iter(self))[index]
+
+    @api
+    def addByTwoPoints(self, startPoint, endPoint):
+        line = SketchLine(self._sketch, self._sketch._sketch_point(startPoint), self._sketch._sketch_point(endPoint))
+        self._sketch._curves.append(line)
+        self._sketch._changed()
+        return line
+
+
+class SketchFittedSplines(_Collection):
+    def __init__(self, sketch):
+        _Collection.__init__(self)
+        self._sketch = sketch
+
+    def __iter__(self):
+        return iter([curve for curve in self._sketch._curves if isinstance(curve, SketchFittedSpline)])
+
+    @api_property
+    def count(self):
+        return len(list(iter(self)))
+
+    @api
+    def item(self, index):
+        return list(iter(self))[index]
+
+    @api
+    def add(self, fitPoints):
+        spline = SketchFittedSpline(self._sketch, [self._sketch._sketch_point(point) for point in fitPoints])
+        self._sketch._curves.append(spline)
+        self._sketch._changed()
+        return spline
+
+
+class SketchCurves(_Collection):
+    def __init__(self, sketch):
+        _Collection.__init__(self, sketch._curves)
+        self._sketch_lines = SketchLines(sketch)
+        self._sketch_fitted_splines = SketchFittedSplines(sketch)
+
+    @api_property
+    def sketchLines(self):
+        return self._sketch_lines
+
+    @api_property
+    def sketchFittedSplines(self):
+        return self._sketch_fitted_splines
+
+
+class ProfileCurve(object):
+    def __init__(self, curve):
+        self._curve = curve
+
+    @api_property
+    def sketchEntity(self):
+        return self._curve
+
+
+class ProfileLoop(object):
+    def __init__(self, curves):
+        self._curves = curves
+
+    @api_property
+    def isOuter(self):
+        return True
+
+    @api_property
+    def profileCurves(self):
+        return _Collection([ProfileCurve(curve) for curve in self._curves])
+
+
+class Profile(object):
+    def __init__(self, curves):
+        self._loops = [ProfileLoop(curves)]
+
+    @api_property
+    def profileLoops(self):
+        return _Collection(list(self._loops))
+
+
+def _closed_loops(curves):
+    """Curves joined end to end into closed loops, in sketch order."""
+    def joins(a, b):
+        return np.linalg.norm(a._xyz - b._xyz) <= PROFILE_TOLERANCE
+
+    loops = []
+    unused = list(curves)
+    while unused:
+        loop = [unused.pop(0)]
+        start, end = loop[0]._fit_points[0], loop[0]._fit_points[-1]
+        while not joins(start, end):
+            for curve in unused:
+                if joins(curve._fit_points[0], end) or joins(curve._fit_points[-1], end):
+                    ends = curve._fit_points[0], curve._fit_points[-1]
+                    end = ends[1] if joins(ends[0], end) else ends[0]
+                    loop.append(curve)
+                    unused.remove(curve)
+                    break
+            else:
+                loop = None
+                break
+        if loop:
+            loops.append(loop)
+    return loops
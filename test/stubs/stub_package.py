@@ -0,0 +1,32 @@
+"""Import the add-in as the package Fusion loads it as, with the adsk
+stand-in next to this file in place of the Fusion API.
+
+    package = load_package()
+    fusion_connection = load_module("fusion_connection")
+"""
+import importlib
+import importlib.util
+import os
+import sys
+
+STUBS_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(os.path.dirname(STUBS_DIR))
+PACKAGE = "ParametricAirfoilSpline"
+
+
+def load_package():
+    if STUBS_DIR not in sys.path:
+        sys.path.insert(0, STUBS_DIR)
+    if PACKAGE not in sys.modules:
+        spec = importlib.util.spec_from_file_location(
+            PACKAGE, os.path.join(ROOT_DIR, "__init__.py"), submodule_search_locations=[ROOT_DIR]
+        )
+        package = importlib.util.module_from_spec(spec)
+        sys.modules[PACKAGE] = package
+        spec.loader.exec_module(package)
+    return sys.modules[PACKAGE]
+
+
+def load_module(name):
+    load_package()
+    return importlib.import_module(PACKAGE + "." + name)
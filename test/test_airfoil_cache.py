@@ -0,0 +1,183 @@
+import json
+import os
+import unittest
+import tempfile
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+from airfoil_cache import AirfoilCache, OfflineCacheMiss, DownloadError
+from airfoil_points import AirfoilPoints, AirfoilNotFound
+
+
+class StandInAirfoilTools(BaseHTTPRequestHandler):
+    """Serves the files dict by airfoil name, with an ETag per name, and
+    redirects the names in redirects to the url they map to."""
+    protocol_version = "HTTP/1.1"
+    requests = []
+    connections = 0
+    files = {}
+    redirects = {}
+
+    def setup(self):
+        StandInAirfoilTools.connections += 1
+        BaseHTTPRequestHandler.setup(self)
+
+    def do_GET(self):
+        name = parse_qs(urlparse(self.path).query).get("airfoil", [""])[0]
+        StandInAirfoilTools.requests.append((name, self.headers.get("If-None-Match")))
+        if name in self.redirects:
+            self.send_response(301)
+            self.send_header("Location", self.redirects[name])
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        if name not in self.files:
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        etag = '"' + name + str(len(self.files[name])) + '"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("ETag", etag)
+        self.send_header("Content-Length", str(len(self.files[name])))
+        self.end_headers()
+        self.wfile.write(self.files[name])
+
+    def log_message(self, *args):
+        pass
+
+
+class TestAirfoilCache(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        with open('test//test_airfoil.dat', 'rb') as f:
+            data = f.read()
+        StandInAirfoilTools.files = {
+            "naca2411-il": data,
+            "fx63137-il": data.replace(b"NACA 2414", b"FX 63-137"),
+            "copy-il": data,
+        }
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), StandInAirfoilTools)
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+        cls.base_url = "http://127.0.0.1:" + str(cls.server.server_port) + "/airfoil/seligdatfile?airfoil="
+        StandInAirfoilTools.redirects = {
+            "moved-il": "/airfoil/seligdatfile?airfoil=naca2411-il",
+            "elsewhere-il": cls.base_url + "moved-il",
+            "loop-il": "?airfoil=loop-il",
+        }
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        StandInAirfoilTools.requests = []
+        StandInAirfoilTools.connections = 0
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def cache(self, **kwargs):
+        return AirfoilCache(self.tmp.name, base_url=self.base_url, **kwargs)
+
+    def test_hit_after_miss(self):
+        cache = self.cache()
+        first = AirfoilPoints.from_airfoiltools("naca2411-il", cache)
+        second = AirfoilPoints.from_airfoiltools("naca2411-il", cache)
+        self.assertEqual(first.name, "NACA 2414")
+        self.assertTrue((first.y == second.y).all())
+        self.assertEqual(len(StandInAirfoilTools.requests), 1)
+        self.assertEqual((cache.stats.hits, cache.stats.misses), (1, 1))
+
+    def test_persistent(self):
+        self.cache().get("naca2411-il")
+        cache = self.cache(offline=True)
+        self.assertEqual(cache.get("naca2411-il")[:9], b"NACA 2414")
+        self.assertEqual(cache.stats.hits, 1)
+        self.assertEqual(len(StandInAirfoilTools.requests), 1)
+
+    def test_redirects(self):
+        cache = self.cache()
+        self.assertEqual(cache.get("elsewhere-il"), StandInAirfoilTools.files["naca2411-il"])
+        self.assertEqual([name for name, _ in StandInAirfoilTools.requests], ["elsewhere-il", "moved-il", "naca2411-il"])
+        self.assertEqual(StandInAirfoilTools.connections, 1)
+        with self.assertRaises(DownloadError):
+            cache.get("loop-il")
+
+    def test_offline_miss(self):
+        cache = self.cache(offline=True)
+        with self.assertRaises(OfflineCacheMiss):
+            cache.get("naca2411-il")
+        self.assertEqual(StandInAirfoilTools.requests, [])
+
+    def test_not_found(self):
+        with self.assertRaises(DownloadError):
+            self.cache().get("missing")
+
+    def test_content_addressed(self):
+        cache = self.cache()
+        cache.get("naca2411-il")
+        cache.get("copy-il")
+        self.assertEqual(cache.size, len(StandInAirfoilTools.files["copy-il"]))
+
+    def test_hits_defer_index_write(self):
+        cache = self.cache()
+        cache.get("naca2411-il")
+        with open(os.path.join(self.tmp.name, "index.json")) as f:
+            stored = f.read()
+        for _ in range(3):
+            cache.get("naca2411-il")
+        with open(os.path.join(self.tmp.name, "index.json")) as f:
+            self.assertEqual(f.read(), stored)
+        cache.close()
+        with open(os.path.join(self.tmp.name, "index.json")) as f:
+            self.assertEqual(json.load(f)["entries"]["naca2411-il"]["accessed"], 4)
+
+    def test_ttl_revalidation(self):
+        cache = self.cache(ttl=0)
+        cache.get("naca2411-il")
+        data = cache.get("naca2411-il")
+        self.assertEqual(data, StandInAirfoilTools.files["naca2411-il"])
+        self.assertEqual(StandInAirfoilTools.requests[1][1], '"naca2411-il' + str(len(data)) + '"')
+        self.assertEqual((cache.stats.hits, cache.stats.revalidations), (1, 1))
+
+    def test_lru_eviction(self):
+        size = len(StandInAirfoilTools.files["naca2411-il"])
+        cache = self.cache(max_bytes=int(1.5 * size))
+        cache.get("naca2411-il")
+        cache.get("fx63137-il")
+        self.assertNotIn("naca2411-il", cache)
+        self.assertIn("fx63137-il", cache)
+        self.assertEqual(cache.stats.evictions, 1)
+
+    def test_connection_reuse(self):
+        cache = self.cache()
+        for name in StandInAirfoilTools.files:
+            cache.get(name)
+        self.assertEqual(StandInAirfoilTools.connections, 1)
+
+    def test_get_many(self):
+        names = ["naca2411-il", "fx63137-il", "naca2411-il", "missing", "fx63137-il"]
+        results = self.cache().get_many(names, max_workers=2)
+        self.assertEqual(list(results), ["naca2411-il", "fx63137-il", "missing"])
+        self.assertEqual(results["fx63137-il"], StandInAirfoilTools.files["fx63137-il"])
+        self.assertIsInstance(results["missing"], DownloadError)
+        self.assertEqual(sorted(name for name, _ in StandInAirfoilTools.requests), ["fx63137-il", "missing", "naca2411-il"])
+        self.assertLessEqual(StandInAirfoilTools.connections, 2)
+
+    def test_from_airfoiltools_many(self):
+        airfoils = AirfoilPoints.from_airfoiltools_many(["fx63137-il", "missing"], self.cache())
+        self.assertEqual(airfoils["fx63137-il"].name, "FX 63-137")
+        self.assertIsInstance(airfoils["missing"], AirfoilNotFound)
+
+
+if __name__ == "__main__":
+    unittest.main()
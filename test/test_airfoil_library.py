@@ -0,0 +1,78 @@
+import unittest
+import os
+import tempfile
+from airfoil_library import write_library, AirfoilLibrary, open_library
+from airfoil_points import AirfoilPoints, AirfoilNotFound
+
+
+class TestAirfoilLibrary(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'airfoils.lib')
+        base = AirfoilPoints.from_file('test//test_airfoil.dat')
+        self.airfoils = [
+            AirfoilPoints.from_arrays('af' + str(i), base.x * (i + 1), base.y, base.surfaces)
+            for i in range(50)
+        ] + [AirfoilPoints.from_list('short', [[1, 0], [0, 0], [1, 0]])]
+        write_library(self.path, self.airfoils)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_round_trip(self):
+        for airfoil in self.airfoils:
+            loaded = AirfoilPoints.from_library(self.path, airfoil.name)
+            self.assertEqual(loaded.name, airfoil.name)
+            self.assertTrue((loaded.x == airfoil.x).all())
+            self.assertTrue((loaded.y == airfoil.y).all())
+            self.assertTrue((loaded.surfaces == airfoil.surfaces).all())
+
+    def test_index(self):
+        library = AirfoilLibrary(self.path)
+        self.assertEqual(len(library), 51)
+        self.assertIn('af7', library)
+        self.assertNotIn('af70', library)
+        self.assertEqual(library.names, sorted(af.name for af in self.airfoils))
+
+    def test_zero_copy(self):
+        x, _, _ = open_library(self.path).arrays('af3')
+        self.assertFalse(x.flags.writeable)
+        self.assertFalse(x.flags.owndata)
+
+    def test_transform_loaded(self):
+        loaded = AirfoilPoints.from_library(self.path, 'af0').set_chord(2).offset_y(1)
+        self.assertEqual(loaded.chord, 2)
+        self.assertEqual(loaded.y[0], self.airfoils[0].y[0] + 1)
+
+    def test_missing(self):
+        with self.assertRaises(AirfoilNotFound):
+            AirfoilPoints.from_library(self.path, 'missing')
+
+    def test_rewrite_open_library(self):
+        x, _, _ = open_library(self.path).arrays('af3')
+        expected = x.copy()
+        write_library(self.path, self.airfoils[:2])
+        # arrays from the old map stay readable and the new file is opened
+        self.assertTrue((x == expected).all())
+        self.assertEqual(len(open_library(self.path)), 2)
+        self.assertEqual(sorted(os.listdir(self.tmp.name)), ['airfoils.lib'])
+
+    @unittest.skipIf(os.name == 'nt', "no POSIX permission bits")
+    def test_rewrite_keeps_mode(self):
+        umask = os.umask(0o022)
+        try:
+            write_library(self.path + '2', self.airfoils)
+        finally:
+            os.umask(umask)
+        self.assertEqual(os.stat(self.path + '2').st_mode & 0o777, 0o644)
+        os.chmod(self.path, 0o640)
+        write_library(self.path, self.airfoils[:2])
+        self.assertEqual(os.stat(self.path).st_mode & 0o777, 0o640)
+
+    def test_duplicate_names(self):
+        with self.assertRaises(ValueError):
+            write_library(self.path + '2', self.airfoils[:2] * 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,25 @@
 import unittest 
-from airfoil_points import AirfoilPoints, AirfoilPoint, Surfaces
+import os
+import tempfile
+import numpy as np
+from math import sin, cos, radians
+from airfoil_points import AirfoilPoints, AirfoilPoint, Surfaces, SectionTransform, DatFileFormats, detect_dat_format
+
+
+def naca4(m, p, t, n=201):
+    """NACA 4-digit section with cosine spacing, in Selig order."""
+    beta = np.linspace(0, np.pi, n)
+    x = 0.5 * (1 - np.cos(beta))
+    yt = 5 * t * (0.2969 * np.sqrt(x) - 0.126 * x - 0.3516 * x**2 + 0.2843 * x**3 - 0.1036 * x**4)
+    if m:
+        yc = np.where(x < p, m / p**2 * (2 * p * x - x**2), m / (1 - p)**2 * (1 - 2 * p + 2 * p * x - x**2))
+        dyc = np.where(x < p, 2 * m / p**2 * (p - x), 2 * m / (1 - p)**2 * (p - x))
+    else:
+        yc = dyc = np.zeros_like(x)
+    theta = np.arctan(dyc)
+    top = np.column_stack((x - yt * np.sin(theta), yc + yt * np.cos(theta)))
+    btm = np.column_stack((x + yt * np.sin(theta), yc - yt * np.cos(theta)))
+    return AirfoilPoints.from_list('naca', np.concatenate((top[::-1], btm[1:])))
 
 
 class TestDatFile(unittest.TestCase):
@@ -8,11 +28,43 @@ class TestDatFile(unittest.TestCase):
         self.assertEqual(dat.positions[0].surface, Surfaces.TOP)
         self.assertEqual(dat.positions[-1].surface, Surfaces.BTM)
 
+    def test_from_list_extra_columns(self):
+        dat = AirfoilPoints.from_list('test', [[1, 0.5, 9], [0.5, 0.5, 9], [0, 0, 9], [0.5, -0.5, 9]])
+        self.assertTrue((dat.x == [1, 0.5, 0, 0.5]).all())
+        self.assertTrue((dat.y == [0.5, 0.5, 0, -0.5]).all())
+        with self.assertRaises(ValueError):
+            AirfoilPoints.from_list('test', [1, 0.5, 0.5, 0.5])
+
     def test_from_file(self):
         dat = AirfoilPoints.from_file('test//test_airfoil.dat')
         self.assertEqual(dat.positions[0].surface, Surfaces.TOP)
         self.assertEqual(dat.positions[-1].surface, Surfaces.BTM)
 
+    def test_from_file_lednicer(self):
+        selig = AirfoilPoints.from_file('test//test_airfoil.dat')
+        lednicer = AirfoilPoints.from_file('test//test_airfoil_lednicer.dat')
+        self.assertEqual(lednicer.name, 'NACA 2414 LEDNICER')
+        self.assertTrue((lednicer.x == selig.x).all())
+        self.assertTrue((lednicer.y == selig.y).all())
+        self.assertTrue((lednicer.surfaces == selig.surfaces).all())
+
+    def test_detect_dat_format(self):
+        self.assertEqual(detect_dat_format(np.array([2., 2., 0., 0., 1., 0., 0., 0., 1., 0.])), DatFileFormats.LEDNICER)
+        self.assertEqual(detect_dat_format(np.array([1., 0., 0., 0., 1., 0.])), DatFileFormats.SELIG)
+
+    def test_iter_file_multiple(self):
+        with open('test//test_airfoil.dat') as f:
+            selig = f.read()
+        with open('test//test_airfoil_lednicer.dat') as f:
+            lednicer = f.read()
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'multi.dat')
+            with open(path, 'w') as f:
+                f.write('\n'.join([selig, lednicer, selig.replace('NACA 2414', 'third')]))
+            airfoils = list(AirfoilPoints.iter_file(path))
+        self.assertEqual([af.name for af in airfoils], ['NACA 2414', 'NACA 2414 LEDNICER', 'third'])
+        self.assertTrue(all(len(af) == 61 for af in airfoils))
+
     def test_measurements(self):
         dat = AirfoilPoints.from_file('test//test_airfoil.dat')
         self.assertEqual(dat.chord, 1)
@@ -31,9 +83,147 @@ class TestDatFile(unittest.TestCase):
         dat = AirfoilPoints.from_file('test//test_airfoil.dat').set_te_thickness(0.1)
         self.assertEqual(dat.te_thickness, .1)
 
+    def test_positions_view(self):
+        dat = AirfoilPoints.from_file('test//test_airfoil.dat')
+        self.assertEqual(len(dat.positions), len(dat))
+        self.assertEqual(dat.positions[3].x, dat.x[3])
+        self.assertEqual(dat.positions[-3].y, dat.y[-3])
+
+    def test_transform_chain(self):
+        dat = AirfoilPoints.from_file('test//test_airfoil.dat')
+        out = dat.set_chord(200).set_thickness(20).set_te_thickness(1).set_twist(-5).offset_y(3).offset_x(7)
+        self.assertEqual(len(out), len(dat))
+        self.assertTrue((out.surfaces == dat.surfaces).all())
+        ang = radians(-5)
+        pos = dat.positions[10]
+        x = pos.x * 200
+        y = pos.y * 20 / dat.thickness
+        y += x * 0.5 * (1 - 0.00147 * 20 / dat.thickness - 0.00147 * 20 / dat.thickness) / 200
+        self.assertAlmostEqual(out.positions[10].x, x * cos(ang) - y * sin(ang) + 7)
+        self.assertAlmostEqual(out.positions[10].y, x * sin(ang) + y * cos(ang) + 3)
+
+    def test_transforms_do_not_modify_source(self):
+        dat = AirfoilPoints.from_file('test//test_airfoil.dat')
+        x = dat.x.copy()
+        dat.set_chord(3).offset_x(1)
+        self.assertTrue((dat.x == x).all())
+
+    def test_transform_composition(self):
+        transform = SectionTransform().then_affine((2.0, 0.0, 0.0, 0.5)).then_surface_shear(0.1) \
+            .then_affine((0.8, -0.6, 0.6, 0.8), (1.0, -2.0)).then_surface_shear(-0.05)
+        for x, y, sign in [(0.3, 0.2, 1.0), (0.7, -0.1, -1.0)]:
+            xs, ys = 2.0 * x, 0.5 * y
+            ys += sign * 0.1 * xs
+            xs, ys = 0.8 * xs - 0.6 * ys + 1.0, 0.6 * xs + 0.8 * ys - 2.0
+            ys += sign * -0.05 * xs
+            xt, yt = transform.apply(x, y, sign)
+            self.assertAlmostEqual(xt, xs)
+            self.assertAlmostEqual(yt, ys)
+
+    def test_lazy_chain(self):
+        dat = AirfoilPoints.from_file('test//test_airfoil.dat')
+        out = dat.set_chord(100).set_thickness(12).set_te_thickness(1).set_twist(3).offset_x(5)
+        self.assertAlmostEqual(dat.set_chord(100).set_thickness(12).thickness, 12)
+        self.assertFalse(out.transform.is_identity)
+        self.assertTrue(dat.transform.is_identity)
+        self.assertAlmostEqual(out.chord, out.x[0])
+        self.assertAlmostEqual(out.te_thickness, out.y[0] - out.y[-1])
+
     def test_from_airfoiltools(self):
         dat = AirfoilPoints.from_airfoiltools('naca2411-il')
         self.assertEqual(dat.chord, 1)
 
+class TestSectionMetrics(unittest.TestCase):
+    def test_symmetric(self):
+        dat = naca4(0, 0, 0.12)
+        self.assertAlmostEqual(dat.true_chord, 1, places=6)
+        self.assertAlmostEqual(dat.max_thickness, 0.12, places=3)
+        self.assertAlmostEqual(dat.max_thickness_position, 0.3, delta=0.01)
+        self.assertAlmostEqual(dat.max_camber, 0, places=6)
+        self.assertAlmostEqual(dat.le_radius, 1.1019 * 0.12**2, delta=0.0005)
+        self.assertAlmostEqual(dat.area, 0.685 * 0.12, delta=0.001)
+
+    def test_cambered(self):
+        dat = naca4(0.04, 0.4, 0.12)
+        self.assertAlmostEqual(dat.max_camber, 0.04, delta=0.002)
+        self.assertAlmostEqual(dat.max_camber_position, 0.4, delta=0.02)
+
+    def test_invariant_to_placement(self):
+        dat = naca4(0.02, 0.4, 0.14)
+        moved = dat.set_twist(12).offset_x(3).offset_y(-2)
+        for key in ['true_chord', 'max_thickness', 'max_thickness_position', 'max_camber', 'le_radius', 'area']:
+            self.assertAlmostEqual(getattr(moved, key), getattr(dat, key), msg=key)
+
+    def test_carried_through_transforms(self):
+        dat = naca4(0.02, 0.4, 0.14)
+        reference = (dat.true_chord, dat.max_thickness, dat.area)
+        moved = dat.set_twist(5).offset_x(1)
+        self.assertEqual(moved._cache['true_chord'], reference[0])
+        self.assertEqual(moved._cache['max_thickness'], reference[1])
+        stretched = dat.set_chord(3)
+        self.assertNotIn('true_chord', stretched._cache)
+        self.assertAlmostEqual(stretched.area, 3 * reference[2])
+
+    def test_test_file(self):
+        dat = AirfoilPoints.from_file('test//test_airfoil.dat')
+        self.assertAlmostEqual(dat.true_chord, 1)
+        self.assertAlmostEqual(dat.max_thickness, 0.14, delta=0.002)
+        self.assertAlmostEqual(dat.max_camber, 0.02, delta=0.001)
+
+
+class TestRepanel(unittest.TestCase):
+    def test_point_count(self):
+        dat = naca4(0.02, 0.4, 0.12, n=401)
+        for spacing in ['cosine', 'arc', 'curvature']:
+            out = dat.repanel(60, spacing)
+            self.assertEqual(len(out), 60)
+            self.assertEqual((out.x[0], out.y[0]), (dat.x[0], dat.y[0]))
+            self.assertEqual((out.x[-1], out.y[-1]), (dat.x[-1], dat.y[-1]))
+            self.assertEqual(out.surfaces[0], Surfaces.TOP.value)
+            self.assertEqual(out.surfaces[-1], Surfaces.BTM.value)
+            self.assertLess(out.source_deviation, 0.005)
+
+    def test_deviation_falls_with_points(self):
+        dat = naca4(0.02, 0.4, 0.12, n=401)
+        self.assertGreater(dat.repanel(20).source_deviation, dat.repanel(80).source_deviation)
+        self.assertIsNone(dat.source_deviation)
+
+    def test_tolerance(self):
+        dat = naca4(0.02, 0.4, 0.12, n=401)
+        out = dat.repanel(tolerance=1e-4)
+        self.assertLessEqual(out.source_deviation, 1e-4)
+        self.assertGreater(dat.repanel(len(out) - 1).source_deviation, 1e-4)
+        self.assertLess(len(out), 100)
+
+    def test_deviation_scales(self):
+        out = AirfoilPoints.from_file('test//test_airfoil.dat').repanel(30)
+        self.assertAlmostEqual(out.set_twist(4).offset_x(2).source_deviation, out.source_deviation)
+        self.assertIsNone(out.set_chord(200).source_deviation)
+
+    def test_bad_spacing(self):
+        with self.assertRaises(ValueError):
+            naca4(0, 0, 0.12).repanel(20, 'uniform')
+
+
+class TestMorph(unittest.TestCase):
+    def test_sections(self):
+        root = naca4(0.04, 0.4, 0.15, n=151)
+        tip = AirfoilPoints.from_file('test//test_airfoil.dat')
+        sections = AirfoilPoints.morph(root, tip, 5, n_points=81)
+        self.assertEqual(len(sections), 5)
+        self.assertTrue(all(len(sec) == 81 for sec in sections))
+        self.assertAlmostEqual(sections[0].max_thickness, root.max_thickness, delta=0.002)
+        self.assertAlmostEqual(sections[-1].max_thickness, tip.max_thickness, delta=0.002)
+        thickness = [sec.max_thickness for sec in sections]
+        self.assertTrue(all(a > b for a, b in zip(thickness, thickness[1:])))
+        self.assertAlmostEqual(sections[2].max_thickness, 0.5 * (thickness[0] + thickness[-1]), delta=0.002)
+
+    def test_fractions(self):
+        root = naca4(0, 0, 0.12)
+        sections = AirfoilPoints.morph(root, root.set_thickness(2 * root.thickness), [0.25])
+        self.assertEqual(len(sections), 1)
+        self.assertAlmostEqual(sections[0].max_thickness, 1.25 * root.max_thickness, delta=0.001)
+
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
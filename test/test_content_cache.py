@@ -0,0 +1,43 @@
+import unittest
+import numpy as np
+from content_cache import ContentCache, content_hash
+
+
+class TestContentHash(unittest.TestCase):
+    def test_equal_content(self):
+        parts = ("adsk::fusion::SketchLine", (0.0, 1.0, 0.0), [0, 2.5], np.eye(4))
+        self.assertEqual(content_hash(*parts), content_hash(*parts))
+        self.assertEqual(content_hash(np.arange(3)), content_hash(np.arange(3.0)))
+
+    def test_changed_content(self):
+        base = content_hash("spline", (0.0, 1.0), 3.0)
+        self.assertNotEqual(base, content_hash("spline", (0.0, 1.0), 3.0 + 1e-12))
+        self.assertNotEqual(base, content_hash("line", (0.0, 1.0), 3.0))
+        # nesting is part of the content
+        self.assertNotEqual(content_hash((1, 2), 3), content_hash(1, (2, 3)))
+        self.assertNotEqual(content_hash(np.zeros((2, 3))), content_hash(np.zeros((3, 2))))
+
+
+class TestContentCache(unittest.TestCase):
+    def test_lookup(self):
+        cache = ContentCache()
+        builds = []
+        for _ in range(3):
+            self.assertEqual(cache.lookup(("samples", "abc", 1e-3), lambda: builds.append(1) or "value"), "value")
+        self.assertEqual(len(builds), 1)
+        self.assertEqual((cache.misses["samples"], cache.hits["samples"]), (1, 2))
+        self.assertIn("samples", str(cache))
+
+    def test_least_recently_used_dropped(self):
+        cache = ContentCache(max_entries=2)
+        cache.lookup(("a",), lambda: 1)
+        cache.lookup(("b",), lambda: 2)
+        cache.lookup(("a",), lambda: 1)
+        cache.lookup(("c",), lambda: 3)
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.lookup(("a",), lambda: -1), 1)
+        self.assertEqual(cache.lookup(("b",), lambda: -2), -2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,115 @@
+import unittest
+import numpy as np
+from geometry import Point
+from curve_sampling import (
+    sample_evaluator, samples_at_fractions, chordal_simplify, merge_fractions
+)
+
+
+class ArcEvaluator(object):
+    """Stand-in for a Fusion CurveEvaluator3D over a circular arc of radius r
+    through angle sweep, counting the calls it receives."""
+    def __init__(self, r, sweep):
+        self.r = r
+        self.sweep = sweep
+        self.calls = 0
+
+    def getParameterExtents(self):
+        return True, 0.0, 1.0
+
+    def getPointsAtParameters(self, params):
+        self.calls += 1
+        return True, [Point(self.r * np.cos(self.sweep * t), self.r * np.sin(self.sweep * t), 0) for t in params]
+
+
+class EllipseEvaluator(ArcEvaluator):
+    """Stand-in evaluator over a whole ellipse with semi-axes a and b."""
+    def __init__(self, a, b):
+        ArcEvaluator.__init__(self, 1, 2 * np.pi)
+        self.a = a
+        self.b = b
+
+    def positions(self, params):
+        t = self.sweep * np.asarray(params)
+        return np.column_stack((self.a * np.cos(t), self.b * np.sin(t), np.zeros_like(t)))
+
+    def getPointsAtParameters(self, params):
+        self.calls += 1
+        return True, [Point(*p) for p in self.positions(params).tolist()]
+
+
+def polyline_error(evaluator, samples):
+    """Largest gap between a curve and the polyline through its samples,
+    found by evaluating the curve densely within each segment."""
+    error = 0
+    for t_0, t_1, p_0, p_1 in zip(samples.params[:-1], samples.params[1:], samples.positions[:-1], samples.positions[1:]):
+        offsets = evaluator.positions(np.linspace(t_0, t_1, 17)) - p_0
+        chord = p_1 - p_0
+        f = np.clip(offsets @ chord / (chord @ chord), 0, 1)
+        error = max(error, np.linalg.norm(offsets - f[:, None] * chord, axis=1).max())
+    return error
+
+
+def chordal_error(positions, r):
+    """Largest gap between the circle and the polyline through positions."""
+    chords = np.linalg.norm(np.diff(positions, axis=0), axis=1)
+    return (r - np.sqrt(r ** 2 - (chords / 2) ** 2)).max()
+
+
+class TestSampling(unittest.TestCase):
+    def test_gentle_curve_one_call(self):
+        evaluator = ArcEvaluator(100, 0.1)
+        samples = sample_evaluator(evaluator, 1e-3)
+        self.assertEqual(evaluator.calls, 1)
+        simplified = samples.simplified(1e-3)
+        self.assertLess(len(simplified), 20)
+        self.assertLessEqual(chordal_error(simplified.positions, 100), 1e-3 * 1.01)
+
+    def test_tight_curve_refines(self):
+        evaluator = ArcEvaluator(1, 2 * np.pi * 0.9)
+        samples = sample_evaluator(evaluator, 1e-4)
+        self.assertGreater(evaluator.calls, 1)
+        self.assertLessEqual(chordal_error(samples.positions, 1), 1e-4 / 2)
+        simplified = samples.simplified(1e-4)
+        self.assertLessEqual(chordal_error(simplified.positions, 1), 1e-4 * 1.01)
+        # evenly spread round a circle
+        chords = np.linalg.norm(np.diff(simplified.positions, axis=0), axis=1)
+        self.assertLess(chords.max() / chords.min(), 1.5)
+        self.assertEqual(simplified.fractions[0], 0)
+        self.assertEqual(simplified.fractions[-1], 1)
+
+    def test_varying_curvature_converges(self):
+        # curvature from 0.01 to 10: halving a segment quarters its deviation,
+        # so each tenfold tighter tolerance costs at most two more calls
+        for tolerance, calls in [(1e-2, 2), (1e-3, 3), (1e-4, 5)]:
+            evaluator = EllipseEvaluator(10, 1)
+            samples = sample_evaluator(evaluator, tolerance)
+            self.assertLessEqual(evaluator.calls, calls)
+            self.assertLessEqual(polyline_error(evaluator, samples), tolerance)
+            self.assertLess(len(samples), 129 + 10 / np.sqrt(tolerance))
+
+    def test_samples_at_fractions(self):
+        evaluator = ArcEvaluator(10, np.pi)
+        samples = sample_evaluator(evaluator, 1e-3)
+        calls = evaluator.calls
+        again = samples_at_fractions(evaluator, samples, samples.fractions[::7])
+        self.assertEqual(evaluator.calls, calls)
+        self.assertTrue(np.array_equal(again.positions, samples.positions[::7]))
+        halves = samples_at_fractions(evaluator, samples, [0, 0.3, 0.55, 1])
+        self.assertEqual(evaluator.calls, calls + 1)
+        angles = np.arctan2(halves.positions[:, 1], halves.positions[:, 0])
+        self.assertTrue(np.allclose(angles, [0, 0.3 * np.pi, 0.55 * np.pi, np.pi], atol=1e-4))
+
+    def test_chordal_simplify(self):
+        x = np.linspace(0, 10, 101)
+        positions = np.column_stack((x, np.where(x < 5, 0, x - 5), np.zeros_like(x)))
+        self.assertEqual(list(chordal_simplify(positions, 1e-6)), [0, 50, 100])
+        self.assertEqual(list(chordal_simplify(positions[:2], 1e-6)), [0, 1])
+
+    def test_merge_fractions(self):
+        merged = merge_fractions(np.array([0, 0.5, 1]), np.array([0, 0.25, 0.5 + 1e-12, 1]))
+        self.assertEqual(list(merged), [0, 0.25, 0.5, 1])
+
+
+if __name__ == "__main__":
+    unittest.main()
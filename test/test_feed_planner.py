@@ -0,0 +1,67 @@
+import unittest
+import numpy as np
+from feed_planner import plan_motion, plan_toolpath, _reachable
+from toolpath import simplify_toolpath
+
+
+def trapezoid_time(length, speed, acceleration):
+    return 2 * speed / acceleration + (length - speed ** 2 / acceleration) / speed
+
+
+class TestPlanMotion(unittest.TestCase):
+    def test_tapered_feed(self):
+        # the root end travels twice as far as the tip end
+        plan = plan_motion([[0, 0, 0, 0], [100, 0, 50, 0]], 200, 50)
+        self.assertAlmostEqual(plan.feeds[0], 200 * np.hypot(100, 50) / 100)
+        self.assertEqual(list(plan.controlling_side), [0])
+        self.assertAlmostEqual(plan.total_time, trapezoid_time(100, 200 / 60, 50))
+        plan = plan_motion([[0, 0, 0, 0], [10, 0, 40, 0]], 200, 50)
+        self.assertEqual(list(plan.controlling_side), [1])
+        self.assertAlmostEqual(plan.peak_speeds[0], 200 / 60)
+
+    def test_straight_moves_join(self):
+        f = np.linspace(0, 1, 11)[:, None]
+        positions = f * np.array([100, 20, 60, 10])
+        plan = plan_motion(positions, 200, 50)
+        single = plan_motion(positions[[0, -1]], 200, 50)
+        self.assertAlmostEqual(plan.total_time, single.total_time)
+        self.assertTrue(np.allclose(plan.feeds, single.feeds[0]))
+
+    def test_short_move_and_reversal(self):
+        # too short to reach the cut rate, then straight back
+        plan = plan_motion([[0, 0, 0, 0], [0.05, 0, 0.05, 0], [0, 0, 0, 0]], 200, 50)
+        self.assertEqual(plan.exit_speeds[0], 0)
+        peak = np.sqrt(50 * 0.05)
+        self.assertTrue(np.allclose(plan.peak_speeds, peak))
+        self.assertAlmostEqual(plan.total_time, 4 * peak / 50)
+        self.assertTrue(np.allclose(plan.feeds, 60 * peak * np.sqrt(2)))
+
+    def test_no_moves(self):
+        for positions in (np.zeros((0, 4)), np.array([[1.0, 2.0, 3.0, 4.0]])):
+            plan = plan_motion(positions, 200, 50)
+            self.assertEqual(len(plan), 0)
+            self.assertEqual(plan.total_time, 0.0)
+            self.assertEqual(len(plan.controlling_side), 0)
+            self.assertEqual(len(plan.positions), len(positions))
+
+    def test_reachable_matches_loop(self):
+        rng = np.random.default_rng(5)
+        limits = np.concatenate(([0], rng.uniform(0, 4, 50), [0]))
+        distances = np.concatenate(([0], rng.uniform(0, 0.2, 51)))
+        speeds = [0.0]
+        for limit, distance in zip(limits[1:], distances[1:]):
+            speeds.append(min(limit, np.sqrt(speeds[-1] ** 2 + 2 * 3 * distance)))
+        self.assertTrue(np.allclose(_reachable(limits, distances, 3), speeds))
+
+    def test_toolpath_arcs(self):
+        t = np.linspace(0, np.pi, 181)
+        positions = np.column_stack((30 * np.cos(t), 30 * np.sin(t), np.linspace(0, 5, 181), np.zeros(181)))
+        toolpath = simplify_toolpath(positions, 0.001)
+        plan = plan_toolpath(toolpath, 200, 50)
+        self.assertEqual(len(plan), 1)
+        self.assertAlmostEqual(plan.lengths[0, 0], 30 * np.pi)
+        self.assertAlmostEqual(plan.total_time, trapezoid_time(30 * np.pi, 200 / 60, 50))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,129 @@
+import os
+import sys
+import unittest
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "stubs"))
+from stub_package import load_module
+import adsk.core
+import adsk.fusion
+from adsk import _stub
+
+fusion_connection = load_module("fusion_connection")
+proxy_cache = load_module("proxy_cache").proxy_cache
+content_cache = load_module("content_cache").content_cache
+FusionComponent = fusion_connection.FusionComponent
+FusionSketch = fusion_connection.FusionSketch
+FusionLoop = fusion_connection.FusionLoop
+
+
+def square_sketch(component, name, plane, size=2.0):
+    sketch = component.sketches.add(plane)
+    sketch.name = name
+    corners = [adsk.core.Point3D.create(x, y, 0) for x, y in [(0, 0), (size, 0), (size, size), (0, size)]]
+    points = [sketch.sketchPoints.add(corner) for corner in corners]
+    for start, end in zip(points, points[1:] + points[:1]):
+        sketch.sketchCurves.sketchLines.addByTwoPoints(start, end)
+    return sketch
+
+
+class TestFusionConnection(unittest.TestCase):
+    def setUp(self):
+        _stub.reset()
+        proxy_cache.invalidate()
+        proxy_cache.reset_stats()
+        content_cache.clear()
+        doc = fusion_connection.fusion.new_document("test")
+        self.component = FusionComponent(doc.design.rootComponent)
+
+    def test_profile_loop(self):
+        square_sketch(self.component.component, "side_1", self.component.yz_plane)
+        sketch = FusionSketch(self.component.sketches["side_1"])
+        curves = sketch.profiles[0].outer_loop.sketch_curves
+        self.assertEqual(len(curves), 4)
+        self.assertTrue(all(curve.is_line for curve in curves))
+        self.assertEqual([curve.length for curve in curves], [2.0] * 4)
+        chains = FusionLoop.chain_curves(curves)
+        self.assertEqual(len(chains), 1)
+
+    def test_sketch_space(self):
+        planes = self.component.component.constructionPlanes
+        planeinput = planes.createInput()
+        planeinput.setByOffset(self.component.yz_plane, adsk.core.ValueInput.createByReal(5.0))
+        sketch = FusionSketch(square_sketch(self.component.component, "side_2", planes.add(planeinput)))
+        self.assertEqual(sketch.origin.position.x, 5.0)
+        corner = sketch.sketch_curves[1].start_point
+        model = sketch.sketch_to_model_space(corner)
+        self.assertTrue(np.allclose([model.position.x, model.position.y, model.position.z], [5, 2, 0]))
+        back = sketch.model_to_sketch_space(model)
+        self.assertTrue(np.allclose([back.position.x, back.position.y, back.position.z], [2, 0, 0]))
+
+    def test_transform_positions(self):
+        plane = self.component.create_offset_plane(3.0, self.component.yz_plane)
+        sketch = FusionSketch(square_sketch(self.component.component, "side_1", plane))
+        api_sketch = sketch._sketch
+        positions = np.random.default_rng(1).uniform(-10, 10, size=(20, 3))
+        model = sketch.sketch_to_model_positions(positions)
+        for position, expected in zip(positions, model):
+            point = api_sketch.sketchToModelSpace(adsk.core.Point3D.create(*position))
+            self.assertTrue(np.allclose([point.x, point.y, point.z], expected))
+        self.assertTrue(np.allclose(sketch.model_to_sketch_positions(model), positions))
+        _stub.calls.clear()
+        sketch.model_to_sketch_positions(model)
+        sketch.sketch_to_model_positions(positions)
+        self.assertEqual(_stub.total(), 0)
+
+    def test_lookups_cached_until_changed(self):
+        square_sketch(self.component.component, "side_1", self.component.yz_plane)
+        self.component.sync_cache()
+        sketch = FusionSketch(self.component.sketches["side_1"])
+        sketch.curves
+        calls = _stub.total()
+        for _ in range(5):
+            self.assertEqual(len(self.component.sketches), 1)
+            self.assertEqual(len(sketch.curves), 4)
+        self.assertEqual(_stub.total(), calls)
+        sketch.delete_item(sketch.curves[0])
+        self.assertEqual(len(sketch.curves), 3)
+        # an edit made outside the wrappers shows once the component is synced
+        self.component.component.sketches.item(0).sketchCurves.item(0).deleteMe()
+        self.assertEqual(len(sketch.curves), 3)
+        self.component.sync_cache()
+        self.assertEqual(len(sketch.curves), 2)
+
+    def test_spline_sampling(self):
+        sketch = FusionSketch(self.component.create_sketch("spline", self.component.xy_plane))
+        angles = np.linspace(0, np.pi, 17)
+        fit = [adsk.core.Point3D.create(np.cos(a), np.sin(a), 0) for a in angles]
+        sketch._sketch.sketchCurves.sketchFittedSplines.add(fusion_connection.fusion.object_collection_from_list(fit))
+        curve = sketch.sketch_curves[0]
+        self.assertEqual(curve.curve_type, "adsk::fusion::SketchFittedSpline")
+        self.assertAlmostEqual(curve.length, np.pi, places=3)
+        fractions = curve.sample_fractions(1e-3)
+        points = curve.points_at_fractions(fractions)
+        self.assertEqual(len(points), len(fractions))
+        radii = [np.hypot(point.position.x, point.position.y) for point in points]
+        self.assertTrue(np.allclose(radii, 1.0, atol=2e-3))
+        # every point of a sampling comes from one batched evaluator call
+        _stub.calls.clear()
+        curve.points_at_fractions(np.linspace(0, 1, 50))
+        self.assertEqual(_stub.calls["CurveEvaluator3D.getPointsAtParameters"], 1)
+        self.assertEqual(_stub.calls["CurveEvaluator3D.getPointAtParameter"], 0)
+
+    def test_content_hash_follows_shape(self):
+        # mirroring the middle fit point keeps the ends, parameter range and length
+        sketch = FusionSketch(self.component.create_sketch("splines", self.component.xy_plane))
+        splines = sketch._sketch.sketchCurves.sketchFittedSplines
+        for y in (10, -10):
+            fit = [adsk.core.Point3D.create(x, v, 0) for x, v in [(0, 0), (10, y), (20, 0)]]
+            splines.add(fusion_connection.fusion.object_collection_from_list(fit))
+        up, down = sketch.sketch_curves
+        self.assertAlmostEqual(up.length, down.length)
+        self.assertEqual(up.parametric_range, down.parametric_range)
+        self.assertNotEqual(up.content_hash, down.content_hash)
+        self.assertTrue(np.allclose(up.positions_at_fractions([0.5]), [[10, 10, 0]]))
+        self.assertTrue(np.allclose(down.positions_at_fractions([0.5]), [[10, -10, 0]]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+import unittest
+import io
+import os
+import socket
+import tempfile
+import threading
+import numpy as np
+from gcode_writer import GCodeWriter, GCODE_HEADER
+
+
+def moves(n):
+    i = np.arange(n)
+    return np.column_stack((i * 0.1, -i * 0.25, np.full(n, 1.0 / 3), 2.0 / 3 + i))
+
+
+class TestGCodeWriter(unittest.TestCase):
+    def test_text_output(self):
+        out = io.StringIO()
+        with GCodeWriter(out, precision=2, feed=150) as writer:
+            writer.write_header()
+            writer.write_move_array(moves(3))
+        lines = out.getvalue().splitlines()
+        self.assertEqual(out.getvalue()[:len(GCODE_HEADER)], GCODE_HEADER)
+        self.assertEqual(lines[3], "G01 F150 X0.00 Y0.00 Z0.33 A0.67")
+        self.assertEqual(lines[5], "G01 F150 X0.20 Y-0.50 Z0.33 A2.67")
+        self.assertEqual(len(lines), 6)
+
+    def test_chunks_and_buffer(self):
+        out = io.StringIO()
+        writer = GCodeWriter(out, precision=3, buffer_size=100, chunk_size=7)
+        writer.write_move_array(moves(100))
+        writer.close()
+        lines = out.getvalue().splitlines()
+        self.assertEqual(len(lines), 100)
+        self.assertEqual(writer.lines_written, 100)
+        self.assertEqual(lines[57], "G01 F200 X5.700 Y-14.250 Z0.333 A57.667")
+
+    def test_per_move_feed(self):
+        out = io.StringIO()
+        with GCodeWriter(out, precision=1) as writer:
+            writer.write_move_array(np.array([[1, 2, 3, 4, 250.5], [5, 6, 7, 8, 90]]))
+        self.assertEqual(out.getvalue(), "G01 F250.5 X1.0 Y2.0 Z3.0 A4.0\nG01 F90 X5.0 Y6.0 Z7.0 A8.0\n")
+
+    def test_binary_and_path(self):
+        out = io.BytesIO()
+        with GCodeWriter(out) as writer:
+            writer.write_move_array(moves(2))
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'cut.nc')
+            with GCodeWriter(path) as writer:
+                writer.write_move_array(moves(2))
+            with open(path, 'rb') as f:
+                self.assertEqual(f.read(), out.getvalue())
+
+    def test_socket(self):
+        server, client = socket.socketpair()
+        received = []
+        reader = threading.Thread(target=lambda: received.append(b"".join(iter(lambda: server.recv(4096), b""))))
+        reader.start()
+        with GCodeWriter(client, buffer_size=64) as writer:
+            writer.write_move_array(moves(50))
+        client.close()
+        reader.join()
+        server.close()
+        self.assertEqual(len(received[0].splitlines()), 50)
+
+
+if __name__ == "__main__":
+    unittest.main()
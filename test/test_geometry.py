@@ -0,0 +1,85 @@
+import unittest
+import numpy as np
+from geometry import Point, Line, Plane, PointArray, LineArray
+
+
+class TestPoint(unittest.TestCase):
+    def test_immutable(self):
+        point = Point(1, 2, 3)
+        with self.assertRaises(AttributeError):
+            point.x = 5
+        with self.assertRaises(AttributeError):
+            point.w = 5
+        self.assertEqual((point.x, point.y, point.z), (1, 2, 3))
+        self.assertEqual(Point(1, 2).z, 0)
+
+    def test_tolerant_equality(self):
+        self.assertEqual(Point(1, 2, 3), Point(1 + 1e-12, 2, 3 - 1e-12))
+        self.assertNotEqual(Point(1, 2, 3), Point(1, 2, 3.001))
+        self.assertNotEqual(Point(1, 2, 3), Point(1, 2, 4))
+        self.assertEqual(len({Point(0.1 + 0.2, 0, 0), Point(0.3, 0, 0)}), 1)
+
+    def test_arithmetic(self):
+        p1 = Point(1, 2, 3)
+        p2 = Point(-2, 0.5, 4)
+        self.assertEqual(p1 + p2, Point(-1, 2.5, 7))
+        self.assertEqual(p1 - p2, Point(3, 1.5, -1))
+        self.assertEqual(2 * p1, Point(2, 4, 6))
+        self.assertEqual(np.float64(2) * p1, Point(2, 4, 6))
+        self.assertIsInstance(np.float64(2) * p1, Point)
+        self.assertEqual(-p1, Point(-1, -2, -3))
+        self.assertEqual(Point.dot_product(p1, p2), 11)
+        self.assertEqual(Point.cross_product(p1, p2), Point(6.5, -10, 4.5))
+        self.assertAlmostEqual(abs(Point(3, 4, 12)), 13)
+        self.assertAlmostEqual(Point.distance(p1, p2), abs(p1 - p2))
+        self.assertAlmostEqual(abs(p2.unit), 1)
+
+
+class TestPointArray(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(1)
+        self.a = PointArray(rng.normal(size=(20, 3)))
+        self.b = PointArray(rng.normal(size=(20, 3)))
+
+    def test_round_trip(self):
+        points = list(self.a)
+        self.assertEqual(len(points), 20)
+        self.assertTrue(np.array_equal(PointArray.from_points(points).array, self.a.array))
+        self.assertEqual(self.a[3].x, self.a.x[3])
+
+    def test_products(self):
+        dots = PointArray.dot_product(self.a, self.b)
+        crosses = PointArray.cross_product(self.a, self.b)
+        for i in range(20):
+            self.assertAlmostEqual(dots[i], Point.dot_product(self.a[i], self.b[i]))
+            self.assertAlmostEqual(crosses[i].y, Point.cross_product(self.a[i], self.b[i]).y)
+
+    def test_unit(self):
+        self.assertTrue(np.allclose(abs(self.a.unit), 1))
+        self.assertTrue(np.allclose(abs(self.a.set_length(3)), 3))
+        self.assertAlmostEqual(PointArray.distance(self.a, self.b)[5], Point.distance(self.a[5], self.b[5]))
+
+    def test_broadcast(self):
+        moved = self.a + Point(1, 2, 3)
+        self.assertAlmostEqual(moved[0].z, self.a[0].z + 3)
+        scaled = self.a * np.arange(20)
+        self.assertAlmostEqual(scaled[4].x, 4 * self.a[4].x)
+
+
+class TestLineArray(unittest.TestCase):
+    def test_plane_intersect(self):
+        rng = np.random.default_rng(2)
+        start = PointArray(rng.normal(size=(50, 3)) + [-5, 0, 0])
+        end = PointArray(rng.normal(size=(50, 3)) + [5, 0, 0])
+        lines = LineArray(start, end)
+        for plane in [Plane(Point(0, 0, 0), Point(1, 0, 0)), Plane(Point(115.3, 0, 0), Point(2, 0.1, 0))]:
+            batched = plane.line_intersect(lines)
+            distances = lines.distance_to_plane(plane)
+            for i in range(50):
+                single = plane.line_intersect(Line(start[i], end[i]))
+                self.assertTrue(np.allclose(batched.array[i], single.array))
+                self.assertAlmostEqual(distances[i], Line(start[i], end[i]).distance_to_plane(plane))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,118 @@
+import io
+import os
+import sys
+import unittest
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "stubs"))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from stub_package import load_module
+from adsk import _stub
+from gcode_cases import TEST_AIRFOIL, ROOT, TIP, moves, core_component
+
+from airfoil_points import AirfoilPoints
+from panel import place_section
+
+fusion_connection = load_module("fusion_connection")
+hot_wire_gcode = load_module("hot_wire_gcode")
+content_cache = load_module("content_cache").content_cache
+Point = load_module("geometry").Point
+
+
+class TestHotWireGcode(unittest.TestCase):
+    def setUp(self):
+        _stub.reset()
+        content_cache.clear()
+        content_cache.reset_stats()
+        self.afpoints = AirfoilPoints.from_file(TEST_AIRFOIL)
+
+    def test_prism(self):
+        section = place_section(self.afpoints, ROOT)
+        hw = hot_wire_gcode.HotWireGcode(core_component(section, section, 40.0, 70.0))
+        self.assertTrue(hw.check_profiles())
+        out = io.StringIO()
+        hw.create_gcode_file(out)
+        positions = moves(out.getvalue())
+        self.assertGreater(len(positions), len(section) // 2)
+        self.assertTrue(np.allclose(positions[:, :2], positions[:, 2:], atol=1e-3))
+        # the cut follows the fit points, the spline's ends at the trailing edge
+        self.assertTrue(np.allclose(positions[0, :2], [section.x[0], section.y[0]], atol=1e-3))
+        self.assertLess(positions[:, 0].max(), section.x.max() + 0.5)
+        self.assertGreater(positions[:, 0].min(), section.x.min() - 0.5)
+
+    def test_taper_projects_to_machine_planes(self):
+        root, tip = place_section(self.afpoints, ROOT), place_section(self.afpoints, TIP)
+        hw = hot_wire_gcode.HotWireGcode(core_component(root, tip, 40.0, 70.0))
+        out = io.StringIO()
+        hw.create_gcode_file(out)
+        positions = moves(out.getvalue())
+        # projected 40 cm out from side_1 and 45.3 cm out from side_2
+        chord_1 = positions[:, 0].max() - positions[:, 0].min()
+        chord_2 = positions[:, 2].max() - positions[:, 2].min()
+        self.assertAlmostEqual(chord_1, 240 + 40 * (240 - 200) / 30.0, delta=2.0)
+        self.assertAlmostEqual(chord_2, 200 - 45.3 * (240 - 200) / 30.0, delta=2.0)
+
+    def test_api_calls(self):
+        section = place_section(self.afpoints, ROOT)
+        component = core_component(section, section, 40.0, 70.0)
+        _stub.calls.clear()
+        hw = hot_wire_gcode.HotWireGcode(component)
+        hw.create_gcode_file(io.StringIO())
+        # curves are sampled in batches, not a round trip per point
+        self.assertLess(_stub.calls["CurveEvaluator3D.getPointsAtParameters"], 4 * 2 * 2 * 8)
+        self.assertEqual(_stub.calls["CurveEvaluator3D.getPointAtParameter"], 0)
+        # and moved to model space by each sketch's transform, read once
+        self.assertEqual(_stub.calls["Sketch.transform"], 2)
+        self.assertEqual(_stub.calls["Sketch.sketchToModelSpace"], 0)
+
+    def test_create_sketches(self):
+        root, tip = place_section(self.afpoints, ROOT), place_section(self.afpoints, TIP)
+        component = core_component(root, tip, 40.0, 70.0)
+        hw = hot_wire_gcode.HotWireGcode(component)
+        points_1, points_2 = hw.create_sketches()
+        self.assertEqual(len(points_1), len(hw.gcode_points))
+        self.assertEqual(_stub.calls["Sketch.modelToSketchSpace"], 0)
+        # the wire ends lie on the sketches' planes, where the API agrees they are
+        for sketch_point, gcode_point in zip(points_2[::17], hw.gcode_points[::17]):
+            world = sketch_point.worldGeometry
+            self.assertTrue(np.allclose([world.x, world.y, world.z], gcode_point.wire_line.end))
+
+    def gcode(self, component):
+        out = io.StringIO()
+        hot_wire_gcode.HotWireGcode(component).create_gcode_file(out)
+        return out.getvalue()
+
+    def test_regenerate_unchanged(self):
+        section = place_section(self.afpoints, ROOT)
+        component = core_component(section, section, 40.0, 70.0)
+        first = self.gcode(component)
+        _stub.calls.clear()
+        self.assertEqual(self.gcode(component), first)
+        self.assertEqual(_stub.calls["CurveEvaluator3D.getPointsAtParameters"], 0)
+        self.assertEqual(content_cache.hits["gcode_points"], 1)
+
+    def test_regenerate_one_side_changed(self):
+        root, tip = place_section(self.afpoints, ROOT), place_section(self.afpoints, TIP)
+        component = core_component(root, root, 40.0, 70.0)
+        self.gcode(component)
+        # redraw side_2 with the tip section, leaving side_1 as it was
+        side_2 = fusion_connection.FusionSketch(component.sketches["side_2"])
+        side_2.clear()
+        spline = side_2.create_spline([Point(x, y, 0) for x, y in zip(tip.x.tolist(), tip.y.tolist())])
+        side_2.create_line(spline.fitPoints.item(0), spline.fitPoints.item(spline.fitPoints.count - 1))
+        content_cache.reset_stats()
+        _stub.calls.clear()
+        regenerated = self.gcode(component)
+        # only the new spline is sampled densely; side_1's is evaluated just
+        # at the fractions the new one adds
+        self.assertEqual(content_cache.misses["samples"], 1)
+        self.assertEqual(content_cache.hits["samples"], 1)
+        evaluations = _stub.calls["CurveEvaluator3D.getPointsAtParameters"]
+        content_cache.clear()
+        _stub.calls.clear()
+        self.assertEqual(regenerated, self.gcode(component))
+        self.assertLess(evaluations, _stub.calls["CurveEvaluator3D.getPointsAtParameters"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+import unittest
+import numpy as np
+from kerf_offset import kerf_offset, offset_paths, remove_loops, _crossings
+
+SQUARE = np.array([[0, 0], [10, 0], [10, 10], [0, 10], [0, 0]], dtype=float)
+
+
+def distance_to_polyline(points, polyline):
+    a, d = polyline[:-1], np.diff(polyline, axis=0)
+    p = points[:, None, :] - a[None]
+    t = np.clip((p * d).sum(axis=2) / (d * d).sum(axis=1), 0, 1)
+    return np.linalg.norm(p - t[..., None] * d, axis=2).min(axis=1)
+
+
+class TestOffset(unittest.TestCase):
+    def test_miter_square(self):
+        out = offset_paths([SQUARE], [-1], join="miter")[0]
+        self.assertTrue(np.allclose(out, [[-1, -1], [11, -1], [11, 11], [-1, 11], [-1, -1]]))
+
+    def test_round_square(self):
+        out = offset_paths([SQUARE], [-1], join="round", tolerance=0.001)[0]
+        self.assertGreater(len(out), 5 * 10)
+        self.assertTrue(np.allclose(out[0], out[-1]))
+        self.assertTrue(np.allclose(distance_to_polyline(out, SQUARE), 1))
+
+    def test_concave_and_miter_limit(self):
+        ell = np.array([[0, 0], [10, 0], [10, 5], [5, 5], [5, 10], [0, 10], [0, 0]], dtype=float)
+        out = offset_paths([ell], [-1], join="miter")[0]
+        self.assertTrue(np.allclose(out[3], [6, 6]))
+        # a 170 degree hairpin is beveled instead of mitered far out
+        spike = np.array([[0, 0], [10, 0.9], [0, 1.8]], dtype=float)
+        out = offset_paths([spike], [-0.5], join="miter")[0]
+        self.assertEqual(len(out), 4)
+        self.assertLess(np.linalg.norm(out - [10, 0.9], axis=1).max(), 11)
+
+    def test_kerf_direction(self):
+        for outline in (SQUARE, SQUARE[::-1]):
+            positions = np.column_stack((outline, outline / 2))
+            out = kerf_offset(positions, 2, 1, join="miter")
+            self.assertTrue(np.allclose(np.abs(out[:, :2] - 5), 6))
+            self.assertTrue(np.allclose(np.abs(out[:, 2:] - 2.5), 3))
+
+    def test_loops_collapse(self):
+        # a notch narrower than the offset closes up into a loop
+        notched = np.array([
+            [0, 0], [4.8, 0], [4.8, 3], [5.2, 3], [5.2, 0], [10, 0], [10, 10], [0, 10], [0, 0]
+        ], dtype=float)
+        out = offset_paths([notched], [-1], join="miter")[0]
+        self.assertEqual(len(out), len(notched))
+        self.assertEqual(_crossings(out, 64), [])
+        self.assertTrue(np.allclose(out[1:5], [4.2, -1]))
+
+    def test_sides_in_step(self):
+        t = np.linspace(0, 2 * np.pi, 2001)
+        root = np.column_stack((100 * np.cos(t), 12 * np.sin(t) + 1.5 * np.sin(3 * t)))
+        positions = np.column_stack((root, 0.6 * root + [10, 2]))
+        out, vertex = kerf_offset(positions, 1.0, 0.6, return_vertices=True)
+        self.assertEqual(out.shape[1], 4)
+        self.assertEqual(len(out), len(vertex))
+        self.assertTrue((np.diff(vertex) >= 0).all())
+        sample = slice(None, None, 7)
+        self.assertTrue(np.allclose(distance_to_polyline(out[sample, :2], root), 0.5, atol=0.02))
+
+    def test_remove_loops_keeps_count(self):
+        bow = np.array([[0, 0], [4, 0], [4, 1], [3, -1], [6, -1]], dtype=float)
+        out = remove_loops(bow, 8)
+        self.assertEqual(len(out), len(bow))
+        self.assertTrue(np.allclose(out[1:3], [3.5, 0]))
+        self.assertTrue(np.allclose(out[3:], bow[3:]))
+
+
+if __name__ == "__main__":
+    unittest.main()
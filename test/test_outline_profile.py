@@ -0,0 +1,135 @@
+import io
+import unittest
+import numpy as np
+from outline_profile import PolylineCurve, NurbsCurve, ReversedCurve, OutlineProfile
+from dxf import read_dxf_curves, read_dxf_profile
+
+QUARTER_CIRCLE = NurbsCurve(2, [0, 0, 0, 1, 1, 1], [(1, 0), (1, 1), (0, 1)], [1, np.sqrt(0.5), 1])
+
+
+def dxf_text(units, entities):
+    lines = ["0", "SECTION", "2", "HEADER", "9", "$INSUNITS", "70", str(units), "0", "ENDSEC",
+             "0", "SECTION", "2", "ENTITIES"]
+    for kind, codes in entities:
+        lines += ["0", kind]
+        for code, value in codes:
+            lines += [str(code), str(value)]
+    lines += ["0", "ENDSEC", "0", "EOF"]
+    return io.StringIO("\n".join(lines) + "\n")
+
+
+# a 10 mm radius quarter circle closed by two lines, the lines reversed and
+# out of order as a DXF export may leave them
+QUARTER_DXF = [
+    ("LINE", [(8, 0), (10, 10), (20, 0), (30, 0), (11, 0), (21, 0), (31, 0)]),
+    ("SPLINE", [(71, 2), (72, 6), (73, 3)] + [(40, k) for k in (0, 0, 0, 1, 1, 1)] +
+        [(10, 10), (20, 0), (30, 0), (10, 10), (20, 10), (30, 0), (10, 0), (20, 10), (30, 0)] +
+        [(41, 1), (41, np.sqrt(0.5)), (41, 1)]),
+    ("LINE", [(10, 0), (20, 0), (30, 0), (11, 0), (21, 10), (31, 0)]),
+]
+
+
+class TestCurves(unittest.TestCase):
+    def test_nurbs_circle(self):
+        t = np.linspace(0, 1, 50)
+        self.assertTrue(np.allclose(np.hypot(*QUARTER_CIRCLE.positions(t).T), 1))
+        self.assertTrue(np.allclose(QUARTER_CIRCLE.start_point, (1, 0)))
+        self.assertTrue(np.allclose(QUARTER_CIRCLE.end_point, (0, 1)))
+        fractions = QUARTER_CIRCLE.sample_fractions(1e-4)
+        positions = QUARTER_CIRCLE.positions_at_fractions(fractions, 1e-4)
+        chords = np.linalg.norm(np.diff(positions, axis=0), axis=1)
+        self.assertLessEqual((1 - np.sqrt(1 - (chords / 2) ** 2)).max(), 1.01e-4)
+        halfway = QUARTER_CIRCLE.positions_at_fractions([0.5], 1e-4)[0]
+        self.assertTrue(np.allclose(halfway, np.sqrt(0.5), atol=1e-4))
+
+    def test_polyline_pairs_by_index(self):
+        curve = PolylineCurve([(0, 0), (1, 0), (5, 0)])
+        self.assertEqual(list(curve.sample_fractions()), [0, 0.5, 1])
+        self.assertTrue(np.allclose(curve.positions_at_fractions([0.25, 0.5, 0.75]), [(0.5, 0), (1, 0), (3, 0)]))
+        reverse = ReversedCurve(curve)
+        self.assertEqual(reverse.start_point, (5, 0))
+        self.assertTrue(np.allclose(reverse.positions_at_fractions([0, 0.75]), [(5, 0), (0.5, 0)]))
+
+    def test_from_airfoil(self):
+        class Section(object):
+            x = np.array([100.0, 0, 100])
+            y = np.array([1.0, 0, -1])
+        profile = OutlineProfile.from_airfoil(Section(), 5)
+        self.assertEqual(len(profile.curves), 2)
+        points = profile.edge_points_at(profile.curve_fractions(1e-3), 1e-3)
+        self.assertEqual([tuple(p) for p in points],
+                         [(5, 10, 0.1), (5, 0, 0), (5, 10, -0.1), (5, 10, -0.1), (5, 10, 0.1)])
+
+
+class TestDxf(unittest.TestCase):
+    def test_read_and_chain(self):
+        curves = read_dxf_curves(dxf_text(4, QUARTER_DXF))
+        self.assertEqual([type(c) for c in curves], [PolylineCurve, NurbsCurve, PolylineCurve])
+        profile = read_dxf_profile(dxf_text(4, QUARTER_DXF), 3, start=(0, 0))
+        self.assertEqual(len(profile.curves), 3)
+        # closed, beginning at the curve starting at the origin
+        self.assertEqual(profile.curves[0].start_point, (0, 0))
+        points = profile.edge_points_at(profile.curve_fractions(1e-3), 1e-3)
+        self.assertTrue(all(p.x == 3 for p in points))
+        self.assertEqual(points[0], points[-1])
+        yz = np.array([(p.y, p.z) for p in points])
+        self.assertLessEqual(np.abs(yz).max(), 1 + 1e-9)
+
+    def test_units_and_polylines(self):
+        text = dxf_text(5, [
+            ("LWPOLYLINE", [(90, 3), (70, 1), (10, 0), (20, 0), (10, 2), (20, 0), (10, 2), (20, 1)]),
+            ("POLYLINE", [(66, 1), (70, 0)]),
+            ("VERTEX", [(10, 0), (20, 0)]),
+            ("VERTEX", [(10, 4), (20, 4)]),
+            ("SEQEND", []),
+        ])
+        lwpolyline, polyline = read_dxf_curves(text)
+        self.assertEqual(len(lwpolyline.points), 4)
+        self.assertEqual(lwpolyline.end_point, (0, 0))
+        self.assertEqual(polyline.end_point, (4, 4))
+
+    def test_arc_nose(self):
+        # a D shaped outline, its 10 mm radius nose an ARC at the origin
+        entities = [
+            ("LINE", [(10, 10), (20, -10), (11, 30), (21, -10)]),
+            ("LINE", [(10, 30), (20, -10), (11, 30), (21, 10)]),
+            ("ARC", [(10, 10), (20, 0), (40, 10), (50, 90), (51, 270)]),
+            ("LINE", [(10, 30), (20, 10), (11, 10), (21, 10)]),
+        ]
+        profile = read_dxf_profile(dxf_text(4, entities), 3, start=(0, 0))
+        self.assertEqual(len(profile.curves), 4)
+        points = profile.edge_points_at(profile.curve_fractions(1e-4), 1e-4)
+        self.assertEqual(points[0], points[-1])
+        yz = np.array([(p.y, p.z) for p in points])
+        self.assertAlmostEqual(yz[:, 0].min(), 0)
+        nose = yz[yz[:, 0] < 1 - 1e-9]
+        self.assertTrue(np.allclose(np.hypot(nose[:, 0] - 1, nose[:, 1]), 1))
+
+    def test_circle_and_bulges(self):
+        circle, = read_dxf_curves(dxf_text(4, [("CIRCLE", [(10, 5), (20, 5), (40, 5)])]))
+        self.assertTrue(np.allclose(circle.start_point, circle.end_point))
+        # a closed LWPOLYLINE slot: two straight sides and two semicircular ends
+        slot = [("LWPOLYLINE", [
+            (90, 4), (70, 1), (10, 0), (20, 0), (10, 2), (20, 0), (42, 1), (10, 2), (20, 1), (10, 0), (20, 1), (42, 1)
+        ])]
+        curves = read_dxf_curves(dxf_text(5, slot))
+        self.assertEqual([type(c) for c in curves], [PolylineCurve, NurbsCurve, PolylineCurve, NurbsCurve])
+        t = np.linspace(*curves[1].getParameterExtents()[1:], 21)
+        self.assertTrue(np.allclose(np.hypot(*(curves[1].positions(t) - (2, 0.5)).T), 0.5))
+        # counter-clockwise, so the right hand end bulges out to x = 2.5
+        self.assertAlmostEqual(curves[1].positions(t)[:, 0].max(), 2.5)
+        self.assertEqual(len(read_dxf_profile(dxf_text(5, slot), 0).curves), 4)
+
+    def test_incomplete_outlines(self):
+        open_outline = QUARTER_DXF[:2]
+        with self.assertRaises(ValueError):
+            read_dxf_profile(dxf_text(4, open_outline), 3)
+        apart = QUARTER_DXF + [("LINE", [(10, 50), (20, 50), (11, 60), (21, 50)])]
+        with self.assertRaises(ValueError):
+            read_dxf_profile(dxf_text(4, apart), 3)
+        with self.assertRaises(ValueError):
+            read_dxf_curves(dxf_text(4, QUARTER_DXF + [("3DFACE", [(10, 0), (20, 0)])]))
+
+
+if __name__ == "__main__":
+    unittest.main()
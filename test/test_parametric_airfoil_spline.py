@@ -0,0 +1,53 @@
+import os
+import sys
+import tempfile
+import unittest
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "stubs"))
+from stub_package import load_module
+from adsk import _stub
+
+airfoil_spline = load_module("ParametricAirfoilSpline")
+
+TEST_AIRFOIL = "test//test_airfoil.dat"
+PANEL_CSV = """chord,thickness,te_thickness,twist,xoff,yoff,zoff
+240,30,0.5,0,0,0,0
+220,27,0.5,-1,5,0,150
+200,25,0.5,-2,10,0,300
+"""
+
+
+class TestPanelDoc(unittest.TestCase):
+    def setUp(self):
+        _stub.reset()
+        handle, self.panelcsv = tempfile.mkstemp(suffix=".csv")
+        with os.fdopen(handle, "w") as f:
+            f.write(PANEL_CSV)
+
+    def tearDown(self):
+        os.remove(self.panelcsv)
+
+    def test_create_new_panel_doc(self):
+        builder = airfoil_spline.create_new_panel_doc(self.panelcsv, TEST_AIRFOIL, fit_points=41)
+        self.assertEqual(list(builder.timings), ["planes", "sketches", "geometry", "compute", "timeline"])
+        component = airfoil_spline.app.activeDocument.design.rootComponent
+        groups = component.parentDesign.timeline.timelineGroups
+        self.assertEqual((groups.count, groups.item(0).count), (1, 6))
+        self.assertEqual(component.sketches.count, 3)
+        for sketch, zoff in zip(component.sketches, [0, 15, 30]):
+            self.assertEqual(sketch.name, "base_section")
+            self.assertEqual(sketch.origin.z, zoff)
+            self.assertEqual(len(sketch.dxf_files), 1)
+            spline = sketch.sketchCurves.sketchFittedSplines.item(0)
+            self.assertEqual(spline.fitPoints.count, 41)
+            profile = sketch.profiles.item(0)
+            self.assertEqual(profile.profileLoops.item(0).profileCurves.count, 2)
+        tip = component.sketches.item(2).sketchCurves.sketchFittedSplines.item(0)
+        x = [point.geometry.x for point in tip.fitPoints]
+        self.assertAlmostEqual(max(x) - min(x), 20.0, delta=0.1)
+        self.assertTrue(np.isclose(tip.startSketchPoint.worldGeometry.z, 30))
+
+
+if __name__ == "__main__":
+    unittest.main()
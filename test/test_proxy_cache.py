@@ -0,0 +1,53 @@
+import unittest
+from proxy_cache import ProxyCache, proxy_cache, cached_property
+
+
+class Wrapper(object):
+    def __init__(self, api):
+        self._api = api
+        self._cached = {}
+
+    @cached_property("names")
+    def names(self):
+        """Names read from the API."""
+        self._api["calls"] += 1
+        return list(self._api["names"])
+
+
+class TestProxyCache(unittest.TestCase):
+    def setUp(self):
+        proxy_cache.invalidate()
+        proxy_cache.reset_stats()
+
+    def test_memoized_until_invalidated(self):
+        api = {"calls": 0, "names": ["side_1", "side_2"]}
+        wrapper = Wrapper(api)
+        for _ in range(5):
+            self.assertEqual(wrapper.names, ["side_1", "side_2"])
+        self.assertEqual(api["calls"], 1)
+        self.assertEqual((proxy_cache.misses["names"], proxy_cache.hits["names"]), (1, 4))
+        api["names"].append("points1")
+        proxy_cache.invalidate()
+        self.assertEqual(wrapper.names, ["side_1", "side_2", "points1"])
+        self.assertEqual(api["calls"], 2)
+        self.assertEqual(Wrapper.names.__doc__, "Names read from the API.")
+
+    def test_sync(self):
+        cache = ProxyCache()
+        owner = Wrapper(None)
+        builds = []
+        build = lambda: builds.append(1) or len(builds)
+        cache.sync("rev-a")
+        self.assertEqual(cache.lookup(owner, ("samples", 0.01), build), 1)
+        cache.sync("rev-a")
+        self.assertEqual(cache.lookup(owner, ("samples", 0.01), build), 1)
+        self.assertEqual(cache.lookup(owner, ("samples", 0.02), build), 2)
+        cache.sync("rev-b")
+        self.assertEqual(cache.lookup(owner, ("samples", 0.01), build), 3)
+        self.assertEqual(cache.misses["samples"], 3)
+        self.assertEqual(cache.hits["samples"], 1)
+        self.assertIn("samples", str(cache))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "stubs"))
+from stub_package import load_module
+import adsk.core
+import adsk.fusion
+from adsk import _stub
+
+from airfoil_points import AirfoilPoints
+
+fusion_connection = load_module("fusion_connection")
+sketch_builder = load_module("sketch_builder")
+airfoil_spline = load_module("ParametricAirfoilSpline")
+
+TEST_AIRFOIL = "test//test_airfoil.dat"
+
+
+class TestSketchBuilder(unittest.TestCase):
+    def setUp(self):
+        _stub.reset()
+        self.afpoints = AirfoilPoints.from_file(TEST_AIRFOIL).repanel(41)
+
+    def component(self, design_type=adsk.fusion.DesignTypes.ParametricDesignType):
+        return fusion_connection.FusionComponent(adsk.fusion.Design(design_type).rootComponent)
+
+    def build(self, component, sections):
+        builder = sketch_builder.SketchBuilder(component)
+        for i in range(sections):
+            builder.sketch("section_" + str(i), builder.offset_plane(2.0 * i)).add_airfoil(self.afpoints)
+        return builder, builder.build()
+
+    def test_build(self):
+        component = self.component()
+        builder, sketches = self.build(component, 3)
+        self.assertEqual([sketch.name for sketch in sketches], ["section_0", "section_1", "section_2"])
+        self.assertEqual(list(builder.timings), ["planes", "sketches", "geometry", "compute", "timeline"])
+        for i, sketch in enumerate(sketches):
+            self.assertEqual(sketch.origin.z, 2.0 * i)
+            self.assertFalse(sketch.isComputeDeferred)
+            self.assertEqual(sketch.profiles.count, 1)
+            self.assertEqual(sketch.profiles.item(0).profileLoops.item(0).profileCurves.count, 2)
+        # each sketch is solved once, with all of its geometry in
+        self.assertEqual(_stub.calls["Sketch._compute"], 3)
+        # and the planes and sketches undo as one timeline group
+        timeline = component.timeline
+        self.assertEqual(timeline.timelineGroups.count, 1)
+        group = timeline.timelineGroups.item(0)
+        self.assertEqual((group.name, group.count), ("sections", 6))
+        self.assertEqual(sorted(component.sketches), ["section_0", "section_1", "section_2"])
+
+    def test_fewer_computes_than_one_by_one(self):
+        component = self.component()
+        for i in range(3):
+            airfoil_spline.create_new_airfoil_sketch(
+                component.component, component.create_offset_plane(2.0 * i), self.afpoints
+            )
+        one_by_one = _stub.calls["Sketch._compute"]
+        _stub.calls.clear()
+        self.build(self.component(), 3)
+        self.assertEqual(one_by_one, 6)
+        self.assertEqual(_stub.calls["Sketch._compute"], 3)
+
+    def test_calls_linear_in_sections(self):
+        calls = {}
+        for sections in (10, 20, 50):
+            _stub.calls.clear()
+            self.build(self.component(), sections)
+            calls[sections] = _stub.total()
+        # the same number of API calls for every section added
+        self.assertEqual(calls[50] - calls[20], 3 * (calls[20] - calls[10]))
+
+    def test_direct_design(self):
+        component = self.component(adsk.fusion.DesignTypes.DirectDesignType)
+        builder, sketches = self.build(component, 2)
+        self.assertIsNone(component.timeline)
+        self.assertEqual(len(sketches), 2)
+        self.assertEqual(sketches[1].profiles.count, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
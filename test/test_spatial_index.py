@@ -0,0 +1,87 @@
+import unittest
+import numpy as np
+from geometry import Point
+from spatial_index import PointIndex, EndpointIndex
+
+
+class Curve(object):
+    def __init__(self, start, end):
+        self.start_point = start
+        self.end_point = end
+
+
+class TestPointIndex(unittest.TestCase):
+    def test_nearest_matches_brute_force(self):
+        rng = np.random.default_rng(3)
+        for dim in (2, 3):
+            points = rng.uniform(-50, 50, size=(500, dim))
+            index = PointIndex(points)
+            for query in rng.uniform(-80, 80, size=(100, dim)):
+                distances = np.sqrt(((points - query) ** 2).sum(axis=1))
+                i, d = index.nearest(query)
+                self.assertEqual(i, int(np.argmin(distances)))
+                self.assertAlmostEqual(d, distances.min())
+
+    def test_far_from_small_cluster(self):
+        # a tight cluster makes for tiny cells, so the query is thousands of rings out
+        points = np.array([[24.0, 0.02, 0.0], [24.0, -0.02, 0.0], [24.01, 0.0, 0.0]])
+        index = PointIndex(points)
+        i, d = index.nearest([0, 0.01, 0])
+        distances = np.sqrt(((points - [0, 0.01, 0]) ** 2).sum(axis=1))
+        self.assertEqual(i, int(np.argmin(distances)))
+        self.assertAlmostEqual(d, distances.min())
+
+    def test_remove_and_max_distance(self):
+        index = PointIndex([[0, 0], [1, 0], [5, 0]])
+        self.assertEqual(index.nearest([0.2, 0])[0], 0)
+        index.remove(0)
+        self.assertEqual(index.nearest([0.2, 0])[0], 1)
+        self.assertEqual(index.nearest([3.2, 0], max_distance=1)[0], None)
+        self.assertEqual(len(index), 2)
+
+
+class TestEndpointIndex(unittest.TestCase):
+    def outline(self, n=400):
+        angle = np.linspace(0, 2 * np.pi, n + 1)
+        points = np.column_stack((30 * np.cos(angle), 10 * np.sin(angle)))
+        points[-1] = points[0]
+        return np.stack((points[:-1], points[1:]), axis=1)
+
+    def test_chain_shuffled_loop(self):
+        segments = self.outline()
+        rng = np.random.default_rng(4)
+        order = rng.permutation(len(segments))
+        flipped = rng.random(len(segments)) < 0.5
+        shuffled = segments[order].copy()
+        shuffled[flipped] = shuffled[flipped][:, ::-1]
+        shuffled += rng.normal(scale=1e-4, size=shuffled.shape)
+        chains = EndpointIndex(shuffled[:, 0], shuffled[:, 1]).chain(tolerance=1e-3)
+        self.assertEqual(len(chains), 1)
+        self.assertEqual(len(chains[0]), len(segments))
+        # consecutive curves join end to start
+        for (a, ra), (b, rb) in zip(chains[0], chains[0][1:]):
+            end = shuffled[a, 0 if ra else 1]
+            start = shuffled[b, 1 if rb else 0]
+            self.assertLess(np.abs(end - start).max(), 1e-3)
+
+    def test_chain_gaps(self):
+        segments = self.outline(20)
+        chains = EndpointIndex(segments[:, 0], segments[:, 1]).chain(tolerance=1e-6, first=5)
+        self.assertEqual(len(chains), 1)
+        self.assertEqual(chains[0][0], (5, False))
+        open_segments = np.delete(segments, 10, axis=0)
+        chains = EndpointIndex(open_segments[:, 0], open_segments[:, 1]).chain(tolerance=1e-6, first=3)
+        self.assertEqual(len(chains), 1)
+        self.assertEqual(chains[0][0], (10, False))
+        far = np.concatenate((segments, segments + 1000))
+        self.assertEqual(len(EndpointIndex(far[:, 0], far[:, 1]).chain(tolerance=1e-6)), 2)
+
+    def test_curve_objects(self):
+        curves = [Curve(Point(0, 0, 0), Point(1, 0, 0)), Curve(Point(5, 5, 0), Point(6, 5, 0)), Curve(Point(2, 0, 0), Point(3, 0, 0))]
+        index = EndpointIndex.from_curves(curves)
+        self.assertEqual(index.nearest_start(Point(4.5, 4, 0))[0], 1)
+        self.assertEqual(index.nearest_start(Point(1.9, 0, 0))[0], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
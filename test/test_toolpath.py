@@ -0,0 +1,89 @@
+import unittest
+import io
+import numpy as np
+from toolpath import simplify_toolpath, G01, G02, G03
+from gcode_writer import GCodeWriter
+
+
+def taper_core(n=400):
+    """Dense root (x, y) and smaller tip (z, a) outlines of a tapered core."""
+    t = np.linspace(0, 2 * np.pi, n)
+    root = np.column_stack((100 * (1 - np.cos(t)) / 2, 12 * np.sin(t)))
+    return np.column_stack((root, 0.6 * root + [20, 3]))
+
+
+def pose_deviation(toolpath, positions, samples=2000):
+    """Largest distance from each original pose to the densely sampled output path, per side."""
+    dense = [toolpath.ends[0]]
+    for kind, start, end, centre in zip(toolpath.kinds[1:], toolpath.ends[:-1], toolpath.ends[1:], toolpath.centres[1:]):
+        f = np.linspace(0, 1, samples)[1:, None]
+        if kind == G01:
+            dense.extend(start + f * (end - start))
+        else:
+            a0 = np.arctan2(*(start[:2] - centre)[::-1])
+            a1 = np.arctan2(*(end[:2] - centre)[::-1])
+            sweep = (a1 - a0) % (2 * np.pi)
+            if kind == G02:
+                sweep -= 2 * np.pi
+            r = np.hypot(*(start[:2] - centre))
+            angle = a0 + f[:, 0] * sweep
+            xy = centre + r * np.column_stack((np.cos(angle), np.sin(angle)))
+            dense.extend(np.column_stack((xy, start[2:] + f * (end[2:] - start[2:]))))
+    dense = np.array(dense)
+    worst = 0
+    for pose in positions:
+        d = np.maximum(np.hypot(*(dense[:, :2] - pose[:2]).T), np.hypot(*(dense[:, 2:] - pose[2:]).T))
+        worst = max(worst, d.min())
+    return worst
+
+
+class TestSimplify(unittest.TestCase):
+    def test_collinear(self):
+        f = np.linspace(0, 1, 101)[:, None]
+        positions = np.array([0, 0, 5, 5]) + f * np.array([10, 20, 4, 8])
+        toolpath = simplify_toolpath(positions, 0.01)
+        self.assertEqual(len(toolpath), 2)
+        self.assertEqual(toolpath.points_removed, 99)
+        self.assertTrue(np.array_equal(toolpath.ends[-1], positions[-1]))
+
+    def test_synchronized(self):
+        # the tip side pauses half way while the root side runs straight on,
+        # so the poses cannot be merged even though each side is a line
+        f = np.linspace(0, 1, 21)
+        root = np.column_stack((10 * f, np.zeros_like(f)))
+        tip = np.column_stack((np.minimum(f, 0.5) * 10, np.zeros_like(f)))
+        toolpath = simplify_toolpath(np.column_stack((root, tip)), 0.1, arcs=False)
+        self.assertGreater(len(toolpath), 2)
+
+    def test_tolerance_respected(self):
+        positions = taper_core()
+        for arcs in (False, True):
+            toolpath = simplify_toolpath(positions, 0.02, arcs)
+            self.assertLess(len(toolpath), len(positions) / 3)
+            self.assertLessEqual(toolpath.max_deviation, 0.02)
+            self.assertLessEqual(pose_deviation(toolpath, positions), 0.02 + 1e-9)
+
+    def test_arcs(self):
+        t = np.linspace(0, np.pi, 181)
+        xy = np.column_stack((50 + 30 * np.cos(t), 30 * np.sin(t)))
+        za = np.column_stack((np.linspace(0, 5, 181), np.full(181, 2.0)))
+        toolpath = simplify_toolpath(np.column_stack((xy, za)), 0.001)
+        self.assertEqual(list(toolpath.kinds), [G01, G03])
+        self.assertTrue(np.allclose(toolpath.centres[1], [50, 0]))
+        reverse = simplify_toolpath(np.column_stack((xy, za))[::-1], 0.001)
+        self.assertEqual(list(reverse.kinds), [G01, G02])
+
+    def test_write(self):
+        t = np.linspace(0, np.pi / 2, 91)
+        positions = np.column_stack((10 * np.cos(t), 10 * np.sin(t), np.zeros((91, 2))))
+        out = io.StringIO()
+        with GCodeWriter(out, precision=3) as writer:
+            writer.write_toolpath(simplify_toolpath(positions, 0.001))
+        self.assertEqual(out.getvalue().splitlines(), [
+            "G01 F200 X10.000 Y0.000 Z0.000 A0.000",
+            "G03 F200 X0.000 Y10.000 Z0.000 A0.000 I-10.000 J0.000",
+        ])
+
+
+if __name__ == "__main__":
+    unittest.main()
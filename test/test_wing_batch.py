@@ -0,0 +1,55 @@
+import json
+import os
+import tempfile
+import unittest
+from panel import read_panel_csv
+from wing_batch import generate_wing, MANIFEST_NAME
+
+PANEL_CSV = """chord, thickness, te_thickness, twist, xoff, yoff, zoff
+240, 30, 0.5, 0, 0, 0, 0
+240, 30, 0.5, 0, 0, 0, 0
+230, 28, 0.5, -1, 5, 0, 150
+200, 24, 0.5, -2, 15, 2, 400
+150, 18, 0.4, -4, 40, 5, 650
+"""
+
+
+class TestWingBatch(unittest.TestCase):
+    def test_read_panel_csv(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "panels.csv")
+            with open(path, "w") as f:
+                f.write(PANEL_CSV + "\n")
+            sections = read_panel_csv(path)
+        self.assertEqual(len(sections), 5)
+        self.assertEqual(sections[3], {
+            "chord": 200, "thickness": 24, "te_thickness": 0.5, "twist": -2, "xoff": 15, "yoff": 2, "zoff": 400
+        })
+
+    def test_independent_of_workers(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "panels.csv")
+            with open(path, "w") as f:
+                f.write(PANEL_CSV)
+            outputs = []
+            for workers in (1, 3):
+                out_dir = os.path.join(tmp, "out" + str(workers))
+                manifest = generate_wing(path, "test//test_airfoil.dat", out_dir, workers, tolerance=0.01)
+                files = {}
+                for name in sorted(os.listdir(out_dir)):
+                    with open(os.path.join(out_dir, name), "rb") as f:
+                        files[name] = f.read()
+                outputs.append((manifest, files))
+        (manifest, files), (manifest_3, files_3) = outputs
+        self.assertEqual(files, files_3)
+        self.assertEqual(manifest, manifest_3)
+        # the zero width pair at the root is not a core
+        self.assertEqual([core["index"] for core in manifest["cores"]], [1, 2, 3])
+        self.assertEqual([core["width"] for core in manifest["cores"]], [150, 250, 250])
+        self.assertEqual(sorted(files), ["core_001.gcode", "core_002.gcode", "core_003.gcode", MANIFEST_NAME])
+        self.assertEqual(json.loads(files[MANIFEST_NAME].decode()), manifest)
+        self.assertAlmostEqual(manifest["total_cut_time"], sum(core["cut_time"] for core in manifest["cores"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
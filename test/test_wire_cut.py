@@ -0,0 +1,72 @@
+import io
+import os
+import sys
+import tempfile
+import unittest
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from gcode_cases import TEST_AIRFOIL, ROOT, TIP, moves
+
+from airfoil_points import AirfoilPoints
+from panel import place_section
+from outline_profile import OutlineProfile
+from wire_cut import WireCut, HOTWIRE_PARAMS
+import cut_gcode
+
+
+class TestWireCut(unittest.TestCase):
+    def setUp(self):
+        self.afpoints = AirfoilPoints.from_file(TEST_AIRFOIL)
+
+    def test_prism(self):
+        # the same section on both faces cuts with a wire parallel to the span
+        section = place_section(self.afpoints, ROOT)
+        cut = WireCut.from_airfoils(section, section, 30)
+        out = io.StringIO()
+        cut.create_gcode_file(out)
+        positions = moves(out.getvalue())
+        self.assertEqual(len(positions), len(section) + 2)
+        self.assertTrue(np.allclose(positions[:, :2], positions[:, 2:]))
+        self.assertTrue(np.allclose(positions[:len(section), 0], section.x, atol=1e-3))
+        self.assertTrue(np.allclose(positions[:len(section), 1], section.y, atol=1e-3))
+
+    def test_taper_projects_to_machine_planes(self):
+        root, tip = place_section(self.afpoints, ROOT), place_section(self.afpoints, TIP)
+        width = 30.0
+        x_1, x_2 = WireCut.side_positions(width)
+        positions = np.array(list(WireCut.from_airfoils(root, tip, width).wire_positions()))
+        # straight lines through the faces, extended out to either plane
+        span = HOTWIRE_PARAMS["machine_span"]
+        f_1, f_2 = x_1 / span, x_2 / span
+        face_1 = positions[:, :2] + f_1 * (positions[:, 2:] - positions[:, :2])
+        face_2 = positions[:, :2] + f_2 * (positions[:, 2:] - positions[:, :2])
+        self.assertTrue(np.allclose(face_1[:len(root)], np.column_stack((root.x, root.y))))
+        self.assertTrue(np.allclose(face_2[:len(tip)], np.column_stack((tip.x, tip.y))))
+
+    def test_curve_count_mismatch(self):
+        # an open outline on one face and the same outline closed on the other
+        section = place_section(self.afpoints, ROOT)
+        profile_1 = OutlineProfile.from_airfoil(section, WireCut.side_positions(30)[0])
+        profile_2 = OutlineProfile(profile_1.curves[:1], WireCut.side_positions(30)[1])
+        self.assertEqual(len(profile_1.curves), 2)
+        cut = WireCut(profile_1, profile_2)
+        with self.assertRaises(ValueError):
+            cut.gcode_points
+
+    def test_cli(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "core.gcode")
+            status = cut_gcode.main([
+                path, "--airfoil", TEST_AIRFOIL, "--root", "240,30,0.5,0,0,0", "--tip", "200,25,0.5,-2,10,0",
+                "--width", "300", "--tolerance", "0.01"
+            ])
+            self.assertEqual(status, 0)
+            with open(path) as f:
+                text = f.read()
+        self.assertTrue(text.startswith("G21\n"))
+        self.assertGreater(len(moves(text)), 10)
+
+
+if __name__ == "__main__":
+    unittest.main()
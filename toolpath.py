@@ -0,0 +1,155 @@
+import numpy as np
+
+G01 = 1
+G02 = 2
+G03 = 3
+
+
+class Toolpath(object):
+    """Simplified hot wire path. Move i runs to ends[i] as kinds[i]; for
+    G02/G03 moves centres[i] is the XY arc centre, and Z and A follow the
+    arc progress linearly as a 4-axis controller interpolates them. The
+    first move is a G01 to the start of the path."""
+    def __init__(self, kinds, ends, centres, points_in, max_deviation):
+        self.kinds = kinds
+        self.ends = ends
+        self.centres = centres
+        self.points_in = points_in
+        self.max_deviation = max_deviation
+
+    def __len__(self):
+        return len(self.kinds)
+
+    @property
+    def points_removed(self):
+        return self.points_in - len(self)
+
+    @property
+    def arc_count(self):
+        return int((self.kinds != G01).sum())
+
+    def side_lengths(self):
+        """(n, 2) XY and ZA path lengths of each move, along the arc for
+        G02/G03; the first move, to the start, has none."""
+        vectors = np.diff(self.ends, axis=0, prepend=self.ends[:1])
+        lengths = np.column_stack((
+            np.hypot(vectors[:, 0], vectors[:, 1]), np.hypot(vectors[:, 2], vectors[:, 3])
+        ))
+        for i in np.flatnonzero(self.kinds != G01):
+            start = self.ends[i - 1, :2] - self.centres[i]
+            end = self.ends[i, :2] - self.centres[i]
+            sweep = np.arctan2(start[0] * end[1] - start[1] * end[0], start @ end) % (2 * np.pi)
+            if self.kinds[i] == G02:
+                sweep = 2 * np.pi - sweep
+            lengths[i, 0] = np.hypot(*start) * sweep
+        return lengths
+
+    def __str__(self):
+        return "toolpath " + str(self.points_in) + " points -> " + str(len(self)) + " moves (" + \
+            str(self.arc_count) + " arcs), max deviation " + str(self.max_deviation)
+
+
+def _line_deviation(positions, i, k):
+    """Largest distance of the poses strictly between i and k from the 4-axis
+    straight move i -> k. Each pose is compared with the move at its own
+    fraction along it, taken on both wire ends, so the two sides stay in step."""
+    if k - i < 2:
+        return 0.0
+    a = positions[i]
+    d = positions[k] - a
+    p = positions[i + 1:k] - a
+    length2 = d @ d
+    f = np.clip(p @ d / length2, 0, 1) if length2 > 0 else np.zeros(len(p))
+    error = p - f[:, None] * d
+    return max(np.hypot(error[:, 0], error[:, 1]).max(), np.hypot(error[:, 2], error[:, 3]).max())
+
+
+def _arc_fit(positions, i, k, max_radius):
+    """(deviation, centre, clockwise) of an XY arc i -> k through the middle
+    pose with Z/A moving linearly in the arc angle, or None when the XY
+    points do not progress around one circle."""
+    if k - i < 2:
+        return None
+    xy = positions[i:k + 1, :2]
+    za = positions[i:k + 1, 2:]
+    p1, p2, p3 = xy[0], xy[(k - i) // 2], xy[-1]
+    b = p2 - p1
+    c = p3 - p1
+    det = 2 * (b[0] * c[1] - b[1] * c[0])
+    if abs(det) < 1e-12:
+        return None
+    centre = p1 + np.array([
+        c[1] * (b @ b) - b[1] * (c @ c),
+        b[0] * (c @ c) - c[0] * (b @ b)
+    ]) / det
+    radius = np.hypot(*(p1 - centre))
+    if radius > max_radius:
+        return None
+    clockwise = det < 0
+    angles = np.arctan2(xy[:, 1] - centre[1], xy[:, 0] - centre[0])
+    sweep = np.unwrap(angles - angles[0])
+    if clockwise:
+        sweep = -sweep
+    # the points must run one way round, less than a full turn
+    if (np.diff(sweep) < 0).any() or sweep[-1] <= 0 or sweep[-1] >= 2 * np.pi:
+        return None
+    fraction = sweep / sweep[-1]
+    xy_error = np.abs(np.hypot(xy[:, 0] - centre[0], xy[:, 1] - centre[1]) - radius)
+    za_error = np.hypot(*(za - (za[0] + fraction[:, None] * (za[-1] - za[0]))).T)
+    return max(xy_error.max(), za_error.max()), centre, clockwise
+
+
+def _furthest(fits, i, n):
+    """Largest k > i with fits(k), assuming fits holds up to some k and then
+    fails, found by doubling then bisecting."""
+    good, step = i + 1, 1
+    while good + step < n and fits(good + step):
+        good += step
+        step *= 2
+    bad = min(good + step, n)
+    while bad - good > 1:
+        mid = (good + bad) // 2
+        if fits(mid):
+            good = mid
+        else:
+            bad = mid
+    return good
+
+
+def simplify_toolpath(positions, tolerance, arcs=True, max_radius=1e4):
+    """Reduce an (n, 4) array of synchronized (x, y, z, a) wire positions to
+    the fewest moves that keep every pose within tolerance on both wire
+    ends. Runs of poses that fit a straight 4-axis move become one G01;
+    with arcs, runs whose XY side lies on a circle while Z/A advance in
+    step with it become one G02/G03 when that covers more poses."""
+    positions = np.asarray(positions, dtype=float)
+    n = len(positions)
+    kinds = [G01]
+    ends = [positions[0]]
+    centres = [(np.nan, np.nan)]
+    max_deviation = 0.0
+    i = 0
+    while i < n - 1:
+        k_line = _furthest(lambda k: _line_deviation(positions, i, k) <= tolerance, i, n)
+        k_arc = None
+        if arcs:
+            def _arc_fits(k):
+                fit = _arc_fit(positions, i, k, max_radius)
+                return fit is not None and fit[0] <= tolerance
+            k_arc = _furthest(_arc_fits, i, n)
+        if k_arc is not None and k_arc > k_line + 1:
+            deviation, centre, clockwise = _arc_fit(positions, i, k_arc, max_radius)
+            kinds.append(G02 if clockwise else G03)
+            centres.append(tuple(centre))
+            k = k_arc
+        else:
+            deviation = _line_deviation(positions, i, k_line)
+            kinds.append(G01)
+            centres.append((np.nan, np.nan))
+            k = k_line
+        ends.append(positions[k])
+        max_deviation = max(max_deviation, deviation)
+        i = k
+    return Toolpath(
+        np.array(kinds, dtype=np.int8), np.array(ends), np.array(centres, dtype=float), n, max_deviation
+    )
@@ -0,0 +1,132 @@
+"""G-code for every core of a wing, from the panel CSV, across processes.
+
+    python wing_batch.py birdwingpanels.csv pw075.dat out/ --workers 8
+
+Consecutive sections of the panel CSV bound one foam core, its width the
+difference of their zoff. Each core is cut to its own file in out/, and
+out/manifest.json lists them with their estimated cut times. Cores are
+computed independently, each from the same inputs, so the files and the
+manifest are the same whatever the number of workers.
+"""
+import argparse
+import concurrent.futures
+import functools
+import hashlib
+import json
+import os
+import sys
+
+try:
+    from .airfoil_points import AirfoilPoints
+    from .panel import read_panel_csv, place_section
+    from .wire_cut import HOTWIRE_PARAMS, WireCut
+except ImportError:
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    from airfoil_points import AirfoilPoints
+    from panel import read_panel_csv, place_section
+    from wire_cut import HOTWIRE_PARAMS, WireCut
+
+MANIFEST_NAME = "manifest.json"
+
+
+def core_name(index):
+    return "core_{:03d}.gcode".format(index)
+
+
+def core_jobs(sections, affile, out_dir, sym=False, tolerance=None, arcs=True, precision=3):
+    """One job per pair of consecutive sections with some width between them.
+    Jobs carry the machine parameters, so workers need no shared state."""
+    params = dict(HOTWIRE_PARAMS)
+    jobs = []
+    for index, (root, tip) in enumerate(zip(sections[:-1], sections[1:])):
+        width = tip["zoff"] - root["zoff"]
+        if width <= 0:
+            continue
+        jobs.append({
+            "index": index,
+            "file": os.path.join(out_dir, core_name(index)),
+            "affile": affile,
+            "root": root,
+            "tip": tip,
+            "width": width,
+            "sym": sym,
+            "tolerance": tolerance,
+            "arcs": arcs,
+            "precision": precision,
+            "params": params,
+        })
+    return jobs
+
+
+@functools.lru_cache(maxsize=None)
+def _load_airfoil(affile):
+    return AirfoilPoints.from_file(affile)
+
+
+def cut_core(job):
+    """Write one core's G-code and return its manifest entry."""
+    HOTWIRE_PARAMS.update(job["params"])
+    afpoints = _load_airfoil(job["affile"])
+    cut = WireCut.from_airfoils(
+        place_section(afpoints, job["root"]), place_section(afpoints, job["tip"]), 0.1 * job["width"]
+    )
+    plan = cut.create_gcode_file(job["file"], job["sym"], job["precision"], job["tolerance"], job["arcs"])
+    with open(job["file"], "rb") as f:
+        digest = hashlib.sha256(f.read()).hexdigest()
+    return {
+        "index": job["index"],
+        "file": os.path.basename(job["file"]),
+        "root_zoff": job["root"]["zoff"],
+        "tip_zoff": job["tip"]["zoff"],
+        "width": job["width"],
+        "moves": len(plan),
+        "cut_time": round(plan.total_time, 3),
+        "sha256": digest,
+    }
+
+
+def generate_wing(panelcsv, affile, out_dir, max_workers=None, sym=False, tolerance=None, arcs=True, precision=3):
+    """Cut every core of the panel CSV into out_dir across max_workers
+    processes (one per CPU by default) and write the manifest. Returns it."""
+    os.makedirs(out_dir, exist_ok=True)
+    jobs = core_jobs(read_panel_csv(panelcsv), os.path.abspath(affile), out_dir, sym, tolerance, arcs, precision)
+    with concurrent.futures.ProcessPoolExecutor(max_workers) as executor:
+        # map keeps the job order, so the manifest does not depend on scheduling
+        cores = list(executor.map(cut_core, jobs))
+    manifest = {
+        "panel": os.path.basename(panelcsv),
+        "airfoil": os.path.basename(affile),
+        "sym": sym,
+        "tolerance": tolerance,
+        "cores": cores,
+        "total_cut_time": round(sum(core["cut_time"] for core in cores), 3),
+    }
+    with open(os.path.join(out_dir, MANIFEST_NAME), "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+        f.write("\n")
+    return manifest
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Write hot wire G-code for every core of a wing")
+    parser.add_argument("panelcsv")
+    parser.add_argument("airfoil", help="airfoil .dat file")
+    parser.add_argument("out_dir")
+    parser.add_argument("--workers", type=int, help="processes, one per CPU by default")
+    parser.add_argument("--sym", action="store_true", help="swap the wire ends for the other wing")
+    parser.add_argument("--tolerance", type=float, help="simplify to this deviation, mm")
+    parser.add_argument("--no-arcs", dest="arcs", action="store_false", help="simplify to G01 moves only")
+    parser.add_argument("--precision", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    manifest = generate_wing(
+        args.panelcsv, args.airfoil, args.out_dir, args.workers, args.sym, args.tolerance, args.arcs, args.precision
+    )
+    for core in manifest["cores"]:
+        print("{file}  {width:8.1f} mm  {moves:6d} moves  {cut_time:8.1f} s".format(**core))
+    print("total cut time {:.1f} s".format(manifest["total_cut_time"]))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,187 @@
+try:
+    from .geometry import Point, Plane, Line, PointArray, LineArray
+    from .gcode_writer import GCodeWriter
+    from .toolpath import simplify_toolpath
+    from .curve_sampling import merge_fractions
+    from .feed_planner import plan_motion, plan_toolpath
+    from .kerf_offset import kerf_offset
+    from .outline_profile import OutlineProfile
+    from .dxf import read_dxf_profile
+except ImportError:
+    from geometry import Point, Plane, Line, PointArray, LineArray
+    from gcode_writer import GCodeWriter
+    from toolpath import simplify_toolpath
+    from curve_sampling import merge_fractions
+    from feed_planner import plan_motion, plan_toolpath
+    from kerf_offset import kerf_offset
+    from outline_profile import OutlineProfile
+    from dxf import read_dxf_profile
+import numpy as np
+
+HOTWIRE_PARAMS = {
+    "machine_span": 115.3, # cm
+    "cut_rate": 200, # mm/min, of the further travelling wire end
+    "acceleration": 50, # mm/s^2
+    "junction_deviation": 0.01, # mm
+    "kerf": (0.0, 0.0), # mm, slot width the wire melts at side_1 and side_2
+    "kerf_join": "round", # or "miter"
+    "sample_tolerance": 1e-3, # cm, chordal deviation of sampled curves
+}
+
+xy_plane = Plane(Point(0, 0, 0), Point(1, 0, 0))
+za_plane = Plane(Point(HOTWIRE_PARAMS["machine_span"], 0, 0), Point(1, 0, 0))
+
+
+class WireCut(object):
+    """Cut between two edge profiles, one on each foam face, in model space
+    cm. A profile gives, for its curves in cutting order, the fractions they
+    need sampling at (curve_fractions) and model space points at given
+    fractions (edge_points_at); HotWireGcode's profiles read these from
+    Fusion sketches and outline_profile's from airfoils or DXF files."""
+    def __init__(self, edge_profile_1, edge_profile_2):
+        self._edge_profile_1 = edge_profile_1
+        self._edge_profile_2 = edge_profile_2
+        self._gcode_points = []
+
+    @staticmethod
+    def side_positions(width, offset=None):
+        """Model x (cm) of the two foam faces of a core width cm wide, offset
+        from the XY machine plane, or centred between the planes."""
+        if width > HOTWIRE_PARAMS["machine_span"]:
+            raise ValueError("Core is wider than the machine: " + str(width) + " cm")
+        if offset is None:
+            offset = (HOTWIRE_PARAMS["machine_span"] - width) / 2.0
+        return offset, offset + width
+
+    @staticmethod
+    def from_airfoils(afpoints_1, afpoints_2, width, offset=None):
+        """Cut between two placed airfoil sections (mm) on faces width cm apart."""
+        x_1, x_2 = WireCut.side_positions(width, offset)
+        return WireCut(OutlineProfile.from_airfoil(afpoints_1, x_1), OutlineProfile.from_airfoil(afpoints_2, x_2))
+
+    @staticmethod
+    def from_dxf(file_1, file_2, width, offset=None):
+        """Cut between the outlines of two DXF files on faces width cm apart."""
+        x_1, x_2 = WireCut.side_positions(width, offset)
+        return WireCut(read_dxf_profile(file_1, x_1), read_dxf_profile(file_2, x_2))
+
+    @property
+    def gcode_points(self):
+        if not self._gcode_points:
+            # both sides are sampled at the union of their curves' fractions
+            # so that points pair up along the wire
+            tolerance = HOTWIRE_PARAMS["sample_tolerance"]
+            curve_fractions_1 = self._edge_profile_1.curve_fractions(tolerance)
+            curve_fractions_2 = self._edge_profile_2.curve_fractions(tolerance)
+            if len(curve_fractions_1) != len(curve_fractions_2):
+                raise ValueError(
+                    "Edge profiles have different numbers of curves: " +
+                    str(len(curve_fractions_1)) + " and " + str(len(curve_fractions_2))
+                )
+            curve_fractions = [
+                merge_fractions(fractions_1, fractions_2)
+                for fractions_1, fractions_2 in zip(curve_fractions_1, curve_fractions_2)
+            ]
+            edge_points_1 = self._edge_profile_1.edge_points_at(curve_fractions, tolerance)
+            edge_points_2 = self._edge_profile_2.edge_points_at(curve_fractions, tolerance)
+            edge_points_1, edge_points_2 = self.kerf_compensated(edge_points_1, edge_points_2)
+            n = min(len(edge_points_1), len(edge_points_2))
+            edge_lines = LineArray(
+                PointArray.from_points(edge_points_1[:n]),
+                PointArray.from_points(edge_points_2[:n])
+            )
+            # project every edge line onto both machine planes in one call each
+            wire_starts = xy_plane.line_intersect(edge_lines)
+            wire_ends = za_plane.line_intersect(edge_lines)
+            for i, (start, end) in enumerate(zip(wire_starts, wire_ends)):
+                self._gcode_points.append(GCode_Point(
+                    edge_points_1[i],
+                    edge_points_2[i],
+                    Line(start, end)
+                ))
+        return self._gcode_points        
+
+    @staticmethod
+    def kerf_compensated(edge_points_1, edge_points_2):
+        """Edge points of both sides moved out by half of HOTWIRE_PARAMS["kerf"]
+        within their side planes, which are parallel to the machine planes."""
+        kerf_1, kerf_2 = HOTWIRE_PARAMS["kerf"]
+        if not (kerf_1 or kerf_2):
+            return edge_points_1, edge_points_2
+        n = min(len(edge_points_1), len(edge_points_2))
+        side_1 = PointArray.from_points(edge_points_1[:n]).array
+        side_2 = PointArray.from_points(edge_points_2[:n]).array
+        offset, vertex = kerf_offset(
+            np.column_stack((side_1[:, 1:], side_2[:, 1:])), 0.1 * kerf_1, 0.1 * kerf_2,
+            HOTWIRE_PARAMS["kerf_join"], return_vertices=True
+        )
+        return (
+            [Point(x, y, z) for x, (y, z) in zip(side_1[vertex, 0].tolist(), offset[:, :2].tolist())],
+            [Point(x, y, z) for x, (y, z) in zip(side_2[vertex, 0].tolist(), offset[:, 2:].tolist())],
+        )
+
+    def wire_positions(self, sym = False):
+        """(x, y, z, a) machine positions in mm for each G-code point."""
+        for gcode_point in self.gcode_points:
+            start, end = gcode_point.wire_line.start, gcode_point.wire_line.end
+            if sym:
+                yield (10 * end.y, 10 * end.z, 10 * start.y, 10 * start.z)
+            else:
+                yield (10 * start.y, 10 * start.z, 10 * end.y, 10 * end.z)
+
+    def plan(self, sym = False, tolerance = None, arcs = True):
+        """feed_planner.MotionPlan for the cut, over the path simplified by
+        toolpath.simplify_toolpath when a tolerance (mm) is given."""
+        positions = np.array(list(self.wire_positions(sym)))
+        params = (HOTWIRE_PARAMS["cut_rate"], HOTWIRE_PARAMS["acceleration"], HOTWIRE_PARAMS["junction_deviation"])
+        if tolerance is None:
+            return plan_motion(positions, *params)
+        return plan_toolpath(simplify_toolpath(positions, tolerance, arcs), *params)
+
+    def create_gcode_file(self, file, sym = False, precision = 3, tolerance = None, arcs = True):
+        """Write the cut to file, which may be a path, a file-like object or a
+        socket, and return its MotionPlan. Each move's feed keeps the further
+        travelling wire end at the cut rate; the plan's total_time estimates
+        the cut. With a tolerance (mm) the path is first reduced by
+        toolpath.simplify_toolpath, and the plan's toolpath holds the point
+        and deviation counts."""
+        plan = self.plan(sym, tolerance, arcs)
+        # the move to the start runs at the plain cut rate
+        feeds = np.concatenate(([HOTWIRE_PARAMS["cut_rate"]], np.round(plan.feeds, 1)))
+        with GCodeWriter(file, precision, HOTWIRE_PARAMS["cut_rate"]) as writer:
+            writer.write_header()
+            if plan.toolpath is None:
+                writer.write_move_array(np.column_stack((plan.positions, feeds)))
+            else:
+                writer.write_toolpath(plan.toolpath, feeds)
+        return plan
+
+
+class GCode_Point(object):
+    def __init__(self, point1, point2, wire_line=None):
+        self._line = Line(point1, point2)
+        self._wire_line = wire_line
+        self.sym = False
+
+    @property
+    def wire_line(self):
+        if not self._wire_line:
+            self._wire_line = Line(
+                xy_plane.line_intersect(self._line),
+                za_plane.line_intersect(self._line)
+            )
+        return self._wire_line
+
+    def __str__(self):
+        if self.sym:
+            return "G01 F" + str(HOTWIRE_PARAMS["cut_rate"]) + \
+                    " X" + str(10*self.wire_line.end.y) + \
+                    " Y" + str(10*self.wire_line.end.z) + \
+                    " Z" + str(10*self.wire_line.start.y) + \
+                    " A" + str(10*self.wire_line.start.z)
+        else:            
+            return "G01 F" + str(HOTWIRE_PARAMS["cut_rate"]) + \
+                    " X" + str(10*self.wire_line.start.y) + \
+                    " Y" + str(10*self.wire_line.start.z) + \
+                    " Z" + str(10*self.wire_line.end.y) + \
+                    " A" + str(10*self.wire_line.end.z)